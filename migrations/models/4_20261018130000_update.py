@@ -0,0 +1,82 @@
+"""
+软删除字段与部分索引
+
+索引构建方式取决于迁移是否在事务中执行:
+- aerich upgrade --in-transaction False: 使用 CREATE INDEX CONCURRENTLY 逐个构建, 构建期间不阻塞 users 表的写入;
+  上次并发构建失败遗留的无效索引会先删除再重建
+- 默认(在事务中执行): 使用普通 CREATE INDEX, 构建期间 users 表的写入被阻塞, 数据量大时需安排停机窗口
+
+迁移 3 删除了账号唯一索引, 之后可能存在重复的未删除账号, 此时唯一索引无法创建;
+迁移在建索引前检查重复账号, 存在时中止并列出账号, 需先逻辑删除多余的记录再重新执行
+"""
+from tortoise import BaseDBAsyncClient
+from tortoise.backends.base.client import TransactionalDBClient
+
+# 索引名 -> 建索引语句, {concurrently} 在事务外执行时替换为 CONCURRENTLY
+_INDEXES = {
+    "uidx_users_user_account_active": (
+        'CREATE UNIQUE INDEX {concurrently} IF NOT EXISTS "uidx_users_user_account_active" '
+        'ON "users" ("user_account") WHERE is_deleted = false'
+    ),
+    "idx_users_active_id": (
+        'CREATE INDEX {concurrently} IF NOT EXISTS "idx_users_active_id" ON "users" ("id") WHERE is_deleted = false'
+    ),
+    "idx_users_deleted_time": (
+        'CREATE INDEX {concurrently} IF NOT EXISTS "idx_users_deleted_time" '
+        'ON "users" ("delete_time") WHERE is_deleted = true'
+    ),
+}
+
+_DUPLICATE_ACCOUNTS_SQL = """
+SELECT "user_account", COUNT(*) AS "count"
+FROM "users"
+WHERE is_deleted = false AND "user_account" IS NOT NULL
+GROUP BY "user_account"
+HAVING COUNT(*) > 1
+ORDER BY "user_account"
+LIMIT 20
+"""
+
+_INVALID_INDEXES_SQL = """
+SELECT c.relname
+FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid
+WHERE c.relname = ANY($1::text[]) AND NOT i.indisvalid
+"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    await db.execute_script("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns WHERE table_name = 'users' AND column_name = 'deleted_at'
+            ) THEN
+                ALTER TABLE "users" RENAME COLUMN "deleted_at" TO "delete_time";
+            END IF;
+        END $$;
+        ALTER TABLE "users" ADD COLUMN IF NOT EXISTS "delete_time" TIMESTAMPTZ;
+        COMMENT ON COLUMN "users"."delete_time" IS '删除时间';
+        ALTER TABLE "users" ADD COLUMN IF NOT EXISTS "user_role" INT NOT NULL DEFAULT 0;
+        COMMENT ON COLUMN "users"."user_role" IS '用户角色 0 - 普通用户; 1 - 管理员';""")
+
+    duplicates = await db.execute_query_dict(_DUPLICATE_ACCOUNTS_SQL)
+    if duplicates:
+        accounts = ", ".join(f"{row['user_account']}({row['count']})" for row in duplicates)
+        raise RuntimeError(f"存在重复的未删除账号, 请先逻辑删除多余的记录再执行迁移: {accounts}")
+
+    # CONCURRENTLY 不能在事务中执行, 且每条语句需单独提交
+    concurrently = "" if isinstance(db, TransactionalDBClient) else "CONCURRENTLY"
+    for row in await db.execute_query_dict(_INVALID_INDEXES_SQL, [list(_INDEXES)]):
+        await db.execute_script(f'DROP INDEX {concurrently} IF EXISTS "{row["relname"]}"')
+    for statement in _INDEXES.values():
+        await db.execute_script(statement.format(concurrently=concurrently))
+
+    return """
+        ANALYZE "users";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_deleted_time";
+        DROP INDEX IF EXISTS "idx_users_active_id";
+        DROP INDEX IF EXISTS "uidx_users_user_account_active";"""
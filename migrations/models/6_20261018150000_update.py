@@ -0,0 +1,30 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "audit_log" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "event" VARCHAR(32) NOT NULL,
+    "user_id" INT,
+    "user_account" VARCHAR(256),
+    "operator_id" INT,
+    "ip" VARCHAR(64),
+    "detail" VARCHAR(256),
+    "create_time" TIMESTAMPTZ NOT NULL
+);
+        CREATE INDEX IF NOT EXISTS "idx_audit_log_user_time" ON "audit_log" ("user_id", "create_time");
+        CREATE INDEX IF NOT EXISTS "idx_audit_log_create_time" ON "audit_log" ("create_time");
+        COMMENT ON COLUMN "audit_log"."event" IS '事件类型';
+        COMMENT ON COLUMN "audit_log"."user_id" IS '用户ID';
+        COMMENT ON COLUMN "audit_log"."user_account" IS '用户账号';
+        COMMENT ON COLUMN "audit_log"."operator_id" IS '操作人ID';
+        COMMENT ON COLUMN "audit_log"."ip" IS '客户端IP';
+        COMMENT ON COLUMN "audit_log"."detail" IS '事件详情';
+        COMMENT ON COLUMN "audit_log"."create_time" IS '事件时间';
+        COMMENT ON TABLE "audit_log" IS '审计日志';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "audit_log";"""
@@ -0,0 +1,226 @@
+"""
+用户接口端到端基准测试: 通过 httpx.ASGITransport 在进程内驱动应用(SQLite 内存库)
+
+依次压测 register / login / current / search / delete, 输出每个场景的吞吐(req/s)与
+p50/p95/p99 延迟, 并写入 JSON 结果文件; 指定基线文件时与基线对比, 吞吐下降或 p95 上升超过
+容差即以非零状态码退出, 可用于性能回归门禁
+
+用法:
+    python -m scripts.benchmarks.api_load [--users 1000] [--requests 500] [--concurrency 16] [--warmup 50]
+        [--scenarios register,login,current,search,delete] [--output benchmark-results.json]
+        [--baseline benchmark-baseline.json] [--tolerance 0.15]
+
+密码哈希参数可通过环境变量调整, 如 PASSWORD_SCRYPT_N=1024 可缩短 register/login 场景的耗时
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from pathlib import Path
+
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient, Response
+
+from src.app.auth import get_auth_rate_limiter
+from src.app.core import settings
+from src.app.main import create_app
+from src.app.services import get_account_filter, get_username_index
+from .seed import ADMIN_ACCOUNT, SEED_PASSWORD, seed_account, seed_users
+
+SCENARIOS = ("register", "login", "current", "search", "delete")
+BASE_URL = "https://bench/api/v1"
+
+type Request = Callable[[AsyncClient, int], Awaitable[Response]]
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """
+    最近秩法计算百分位数
+    """
+
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+async def run_scenario(client: AsyncClient, request: Request, requests: int, concurrency: int) -> dict[str, float]:
+    """
+    以固定并发执行 requests 次请求, 第 i 次请求调用 request(client, i)
+
+    Returns:
+        dict[str, float]: 请求数、错误数、吞吐与延迟百分位(毫秒)
+    """
+
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            start = time.perf_counter()
+            response = await request(client, index)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200 or response.json().get("code") != 0:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p95_ms": percentile(latencies, 95) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """
+    启动应用、生成数据并执行各场景
+    """
+
+    # 压测的是接口本身, 关闭登录/注册限流
+    settings.rate_limit_enabled = False
+    get_auth_rate_limiter.cache_clear()
+
+    app = create_app()
+    app.state.testing = True
+    results: dict = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "users": args.users,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "scrypt_n": settings.password_scrypt_n,
+        },
+        "scenarios": {},
+    }
+
+    async with LifespanManager(app):
+        user_ids = await seed_users(args.users)
+        await get_account_filter().build()
+        get_username_index().reset()
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE_URL) as admin:
+            response = await admin.post("/user/login", json={"user_account": ADMIN_ACCOUNT, "user_password": SEED_PASSWORD})
+            assert response.json()["code"] == 0, response.text
+
+            requests: dict[str, tuple[Request, int]] = {
+                "register": (
+                    lambda client, i: client.post("/user/register", json={
+                        "user_account": f"benchnew{i}",
+                        "user_password": SEED_PASSWORD,
+                        "confirm_password": SEED_PASSWORD,
+                    }),
+                    args.requests,
+                ),
+                "login": (
+                    lambda client, i: client.post("/user/login", json={
+                        "user_account": seed_account(i % max(1, args.users)),
+                        "user_password": SEED_PASSWORD,
+                    }),
+                    args.requests,
+                ),
+                "current": (lambda client, i: client.get("/user/current"), args.requests),
+                "search": (
+                    lambda client, i: client.get("/user/search", params={"username": f"user {i % 10}", "limit": 20}),
+                    args.requests,
+                ),
+                # 每次删除不同的用户, 请求数不超过用户数
+                "delete": (
+                    lambda client, i: client.post("/user/delete", params={"user_id": user_ids[i]}),
+                    min(args.requests, len(user_ids)),
+                ),
+            }
+
+            # 预热只读场景(首次请求的路由与查询初始化不计入结果)
+            for name in ("current", "search"):
+                await run_scenario(admin, requests[name][0], args.warmup, args.concurrency)
+
+            for name in args.scenarios:
+                request, count = requests[name]
+                # 登录与注册使用独立客户端, 避免覆盖管理员会话
+                if name in ("register", "login"):
+                    async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE_URL) as client:
+                        stats = await run_scenario(client, request, count, args.concurrency)
+                else:
+                    stats = await run_scenario(admin, request, count, args.concurrency)
+                results["scenarios"][name] = stats
+                print(
+                    f"{name:<9} {stats['requests']:>6} req  {stats['errors']:>4} err  {stats['rps']:>9.1f} req/s  "
+                    f"p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms"
+                )
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    与基线对比, 返回超出容差的回归项
+    """
+
+    regressions = []
+    for name, stats in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        rps_change = stats["rps"] / base["rps"] - 1 if base["rps"] else 0.0
+        p95_change = stats["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        print(f"{name:<9} req/s {rps_change:+7.1%}  p95 {p95_change:+7.1%}")
+        if rps_change < -tolerance:
+            regressions.append(f"{name}: req/s {base['rps']:.1f} -> {stats['rps']:.1f}")
+        if p95_change > tolerance:
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f} ms -> {stats['p95_ms']:.2f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="预置用户数量")
+    parser.add_argument("--requests", type=int, default=500, help="每个场景的请求数")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发数")
+    parser.add_argument("--warmup", type=int, default=50, help="只读场景的预热请求数")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: [name for name in value.split(",") if name],
+        default=list(SCENARIOS),
+        help="逗号分隔的场景, 可选 " + ",".join(SCENARIOS),
+    )
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"), help="结果文件")
+    parser.add_argument("--baseline", type=Path, help="基线结果文件, 指定时进行对比")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="允许的相对退化比例")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"未知场景: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run(args))
+    args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"results written to {args.output}")
+
+    if args.baseline is not None:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print("performance regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+响应编码基准测试: 对比 FastAPI 默认的响应校验 + jsonable_encoder 路径与直接序列化路径,
+以及逐次缩进编码与预编码的错误响应
+
+用法:
+    python -m scripts.benchmarks.response_encoding [--requests 20000]
+"""
+import argparse
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+from fastapi.responses import JSONResponse, Response
+from fastapi.utils import create_cloned_field, create_model_field
+
+from src.app.common import BaseHTTPResponse, BaseResponse, HTTPResponseUtils, ResultUtils, StatusCode
+from src.app.schemas import SafetyUser
+
+USER = SafetyUser(
+    id=1,
+    username="benchmark",
+    user_account="benchmark",
+    avatar_url="https://example.com/avatar.png",
+    gender=0,
+    user_role=0,
+    phone="13800000000",
+    email="benchmark@example.com",
+    user_status=0,
+    create_time=datetime(2025, 1, 1),
+)
+
+
+def bench(func: Callable[[], object], requests: int) -> float:
+    """
+    重复执行, 返回每次的平均微秒数
+    """
+
+    for _ in range(min(requests, 1000)):
+        func()
+    start = time.perf_counter()
+    for _ in range(requests):
+        func()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="模拟响应数")
+    args = parser.parse_args()
+
+    field = create_cloned_field(create_model_field(name="Response", type_=BaseResponse[SafetyUser], mode="serialization"))
+
+    def success_before() -> Response:
+        # FastAPI 默认路径(serialize_response): 按返回值注解校验, 转换为可 JSON 化对象, 再由 JSONResponse 编码
+        value, _ = field.validate(ResultUtils.success(USER), {}, loc=("response",))
+        return JSONResponse(field.serialize(value, by_alias=True))
+
+    def success_after() -> Response:
+        return BaseHTTPResponse(ResultUtils.success(USER))
+
+    def error_before() -> Response:
+        content = BaseResponse(
+            code=StatusCode.NOT_LOGIN.value.code,
+            data=None,
+            message=StatusCode.NOT_LOGIN.value.message,
+            description="用户未登录",
+        )
+        return Response(headers={"Content-Type": "application/json"}, content=content.model_dump_json(indent=2))
+
+    def error_after() -> Response:
+        return HTTPResponseUtils.error(StatusCode.NOT_LOGIN.value.code, StatusCode.NOT_LOGIN.value.message, "用户未登录")
+
+    print(f"requests={args.requests}")
+    for name, before, after in (
+            ("success /current", success_before, success_after),
+            ("error NOT_LOGIN ", error_before, error_after),
+    ):
+        before_us = bench(before, args.requests)
+        after_us = bench(after, args.requests)
+        before_size = len(before().body)
+        after_size = len(after().body)
+        print(
+            f"{name}: before {before_us:7.2f} us/op ({before_size} B)  "
+            f"after {after_us:7.2f} us/op ({after_size} B)  {before_us / after_us:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+SafetyUser 构造基准测试: 对比 ORM 实例 + model_validate 与 values_list + SafetyUser.from_row
+
+在内存 SQLite 中写入指定数量的用户, 分别测量纯转换耗时与"查询 + 转换"的总耗时
+
+用法:
+    python -m scripts.benchmarks.safety_user [--users 10000] [--rounds 5]
+"""
+import argparse
+import asyncio
+import time
+
+from tortoise import Tortoise
+
+from src.app.models import Users
+from src.app.schemas import SAFETY_USER_FIELDS, SafetyUser
+
+
+def best_of(rounds: int, func) -> float:
+    """
+    重复执行, 返回最短耗时(毫秒)
+    """
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+async def best_of_async(rounds: int, func) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+async def run(users: int, rounds: int) -> None:
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.app.models.users"]})
+    await Tortoise.generate_schemas()
+    await Users.bulk_create(
+        [
+            Users(
+                user_account=f"user{i}",
+                username=f"user {i}",
+                user_password="x",
+                avatar_url=f"https://example.com/avatar/{i}.png" if i % 2 else None,
+                email=f"user{i}@example.com",
+            )
+            for i in range(users)
+        ],
+        batch_size=1000,
+    )
+
+    instances = await Users.all()
+    rows = await Users.all().values_list(*SAFETY_USER_FIELDS)
+    assert [SafetyUser.model_validate(user) for user in instances] == [SafetyUser.from_row(row) for row in rows]
+
+    validate_ms = best_of(rounds, lambda: [SafetyUser.model_validate(user) for user in instances])
+    trusted_ms = best_of(rounds, lambda: [SafetyUser.from_row(row) for row in rows])
+
+    async def orm_path() -> None:
+        [SafetyUser.model_validate(user) for user in await Users.all()]
+
+    async def values_path() -> None:
+        [SafetyUser.from_row(row) for row in await Users.all().values_list(*SAFETY_USER_FIELDS)]
+
+    orm_ms = await best_of_async(rounds, orm_path)
+    values_ms = await best_of_async(rounds, values_path)
+
+    print(f"users={users} rounds={rounds} (best of)")
+    print(f"convert  model_validate(orm)   : {validate_ms:8.2f} ms")
+    print(f"convert  from_row(values_list) : {trusted_ms:8.2f} ms  ({validate_ms / trusted_ms:.1f}x)")
+    print(f"query + convert, ORM instances : {orm_ms:8.2f} ms")
+    print(f"query + convert, values_list   : {values_ms:8.2f} ms  ({orm_ms / values_ms:.1f}x)")
+
+    await Tortoise.close_connections()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000, help="用户数量")
+    parser.add_argument("--rounds", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.users, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
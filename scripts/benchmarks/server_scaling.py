@@ -0,0 +1,189 @@
+"""
+多进程扩展性基准测试: 依次以不同工作进程数启动 src.app.server, 使用 api_load 的场景执行器通过 HTTP 压测,
+输出各工作进程数下每个场景的吞吐(req/s)与延迟, 以及相对单进程的加速比
+
+服务使用测试模式的应用(每个工作进程各自的 SQLite 内存库), 因此只压测不依赖共享数据的场景:
+- exists: 账号可用性检查(一次唯一索引查询, 以路由、中间件与序列化开销为主)
+- register: 注册(scrypt 哈希在各工作进程的进程池中计算, 以及一次插入)
+
+压测客户端本身会占用 CPU, 使用 --client-processes 个进程发压; 工作进程数超过空闲 CPU 核数后吞吐不再提升,
+在单核机器上各工作进程数的吞吐基本相同, 结果只反映进程切换开销
+
+用法:
+    python -m scripts.benchmarks.server_scaling [--workers 1,2,4] [--requests 2000] [--concurrency 32]
+        [--client-processes 2] [--scenarios exists,register] [--port 8765]
+
+密码哈希参数可通过环境变量调整, 如 PASSWORD_SCRYPT_N=1024 可缩短 register 场景的耗时, 环境变量同样传递给服务进程
+"""
+import argparse
+import asyncio
+import functools
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import FastAPI
+from httpx import AsyncClient, HTTPError
+
+from src.app.main import create_app
+from .api_load import run_scenario
+
+SCENARIOS = ("exists", "register")
+
+
+def create_testing_app() -> FastAPI:
+    """
+    测试模式的应用工厂, 供 src.app.server --app 使用
+    """
+
+    app = create_app()
+    app.state.testing = True
+    return app
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    """
+    启动服务并等待可以接受请求
+    """
+
+    env = {
+        **os.environ,
+        "SERVER_WORKERS": str(workers),
+        "SERVER_PORT": str(port),
+        "SERVER_HOST": "127.0.0.1",
+        # 关闭限流; 关闭账号布隆过滤器, exists 每次查询数据库
+        "RATE_LIMIT_ENABLED": "false",
+        # 压测场景不使用会话, 允许内存会话后端
+        "SERVER_REQUIRE_SHARED_STATE": "false",
+        "ACCOUNT_FILTER_ENABLED": "false",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.app.server", "--app", "scripts.benchmarks.server_scaling:create_testing_app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            asyncio.run(ping(port))
+            return process
+        except HTTPError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError("server did not start in time")
+
+
+async def ping(port: int) -> None:
+    async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        (await client.get("/api/v1/user/exists", params={"user_account": "ping"})).raise_for_status()
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def drive(port: int, scenario: str, requests: int, concurrency: int, prefix: str) -> dict[str, float]:
+    """
+    在客户端进程中执行一个场景
+    """
+
+    def request(client: AsyncClient, i: int):
+        if scenario == "exists":
+            return client.get("/user/exists", params={"user_account": f"{prefix}x{i}"})
+        return client.post("/user/register", json={
+            "user_account": f"{prefix}x{i}",
+            "user_password": "12345678",
+            "confirm_password": "12345678",
+        })
+
+    async def run() -> dict[str, float]:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}/api/v1", timeout=60) as client:
+            return await run_scenario(client, request, requests, concurrency)
+
+    return asyncio.run(run())
+
+
+def run_load(
+        pool: ProcessPoolExecutor,
+        processes: int,
+        port: int,
+        scenario: str,
+        requests: int,
+        concurrency: int,
+        prefix: str,
+) -> dict[str, float]:
+    """
+    由 processes 个客户端进程同时发压, 合并结果; 吞吐为各进程之和, 延迟取各进程中的最大值
+    """
+
+    futures = [
+        pool.submit(drive, port, scenario, requests // processes, max(1, concurrency // processes), f"{prefix}c{index}")
+        for index in range(processes)
+    ]
+    results = [future.result() for future in futures]
+    return {
+        "requests": sum(result["requests"] for result in results),
+        "errors": sum(result["errors"] for result in results),
+        "rps": sum(result["rps"] for result in results),
+        "p50_ms": max(result["p50_ms"] for result in results),
+        "p95_ms": max(result["p95_ms"] for result in results),
+        "p99_ms": max(result["p99_ms"] for result in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=lambda value: [int(item) for item in value.split(",")], default=[1, 2, 4],
+                        help="逗号分隔的工作进程数")
+    parser.add_argument("--requests", type=int, default=2000, help="每个场景的请求数")
+    parser.add_argument("--concurrency", type=int, default=32, help="总并发数")
+    parser.add_argument("--client-processes", type=int, default=2, help="压测客户端进程数")
+    parser.add_argument("--warmup", type=int, default=200, help="每次启动服务后的预热请求数")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: [name for name in value.split(",") if name],
+        default=list(SCENARIOS),
+        help="逗号分隔的场景, 可选 " + ",".join(SCENARIOS),
+    )
+    parser.add_argument("--port", type=int, default=8765, help="服务端口")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"未知场景: {', '.join(sorted(unknown))}")
+
+    print(f"cpus={os.cpu_count()} requests={args.requests} concurrency={args.concurrency} "
+          f"client_processes={args.client_processes}")
+    baseline: dict[str, float] = {}
+    with ProcessPoolExecutor(args.client_processes) as pool:
+        for workers in args.workers:
+            server = start_server(workers, args.port)
+            try:
+                load = functools.partial(run_load, pool, args.client_processes, args.port)
+                load("exists", args.warmup, args.concurrency, f"warm{workers}")
+                for name in args.scenarios:
+                    stats = load(name, args.requests, args.concurrency, f"w{workers}")
+                    speedup = stats["rps"] / baseline.setdefault(name, stats["rps"]) if stats["rps"] else 0.0
+                    print(
+                        f"workers={workers:<3} {name:<9} {stats['requests']:>6} req  {stats['errors']:>4} err  "
+                        f"{stats['rps']:>9.1f} req/s  x{speedup:4.2f}  "
+                        f"p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms"
+                    )
+            finally:
+                stop_server(server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+冷启动耗时测量: 每轮启动一个新的解释器进程, 分阶段记录导入应用模块、create_app 与 lifespan 启动
+(连接数据库、构建索引与布隆过滤器、启动后台任务)的耗时, 以及从启动进程到完成 lifespan 的总耗时,
+多轮后输出各阶段的最小值与中位数
+
+默认使用测试模式(SQLite 内存库, 始终生成数据表); --database postgres 时按当前配置连接数据库,
+可对比 DATABASE_GENERATE_SCHEMAS=true / false 的启动耗时
+
+用法:
+    python -m scripts.benchmarks.startup_time [--rounds 5] [--database sqlite|postgres]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ("import", "create_app", "lifespan", "in_process", "total")
+
+
+async def measure_child(database: str) -> dict[str, float]:
+    """
+    在当前进程中完成一次启动, 返回各阶段秒数
+    """
+
+    start = time.perf_counter()
+    from src.app.main import create_app
+    from asgi_lifespan import LifespanManager
+    imported = time.perf_counter()
+
+    app = create_app()
+    app.state.testing = database == "sqlite"
+    created = time.perf_counter()
+
+    async with LifespanManager(app, startup_timeout=60):
+        started = time.perf_counter()
+
+    return {
+        "import": imported - start,
+        "create_app": created - imported,
+        "lifespan": started - created,
+        "in_process": started - start,
+    }
+
+
+def run_round(database: str) -> dict[str, float]:
+    """
+    启动子进程测量一轮, total 包含解释器启动
+    """
+
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-m", "scripts.benchmarks.startup_time", "--child", "--database", database],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    total = time.perf_counter() - start
+    # lifespan 结束前的日志也会输出到标准输出, 结果位于最后一行
+    result = json.loads(output.strip().splitlines()[-1])
+    result["total"] = total
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="测量轮数")
+    parser.add_argument("--database", choices=("sqlite", "postgres"), default="sqlite", help="数据库")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure_child(args.database))), flush=True)
+        return
+
+    rounds = [run_round(args.database) for _ in range(args.rounds)]
+    print(f"rounds={args.rounds} database={args.database}")
+    print(f"{'phase':<12}{'min ms':>10}{'median ms':>12}")
+    for phase in PHASES:
+        values = [result[phase] * 1000 for result in rounds]
+        print(f"{phase:<12}{min(values):>10.1f}{statistics.median(values):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+ES256 令牌验签基准测试: 对比每次请求验签与已验签缓存路径
+
+用法:
+    python -m scripts.benchmarks.token_verify [--requests 20000] [--tokens 100]
+"""
+import argparse
+import random
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from src.app.auth import Principal, TokenService
+
+
+def bench(service: TokenService, tokens: list[str], requests: int) -> float:
+    """
+    模拟请求流量, 返回每次校验的平均微秒数
+    """
+
+    rng = random.Random(0)
+    workload = [rng.choice(tokens) for _ in range(requests)]
+    start = time.perf_counter()
+    for token in workload:
+        service.verify(token)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="模拟请求数")
+    parser.add_argument("--tokens", type=int, default=100, help="活跃令牌数(热点集合大小)")
+    args = parser.parse_args()
+
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    uncached = TokenService(private_key, private_key.public_key(), 3600, 3600, cache_size=0)
+    cached = TokenService(private_key, private_key.public_key(), 3600, 3600, cache_size=10_000)
+    tokens = [uncached.issue_token_pair(Principal(i, 0, 0)).access_token for i in range(args.tokens)]
+
+    uncached_us = bench(uncached, tokens, args.requests)
+    cached_us = bench(cached, tokens, args.requests)
+    print(f"requests={args.requests} hot_tokens={args.tokens}")
+    print(f"verify per request : {uncached_us:8.2f} us/op")
+    print(f"verified-token LRU : {cached_us:8.2f} us/op  ({uncached_us / cached_us:.0f}x, {cached.stats()})")
+
+
+if __name__ == "__main__":
+    main()
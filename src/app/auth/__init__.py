@@ -0,0 +1,40 @@
+from .dependencies import get_principal, require_login, require_admin
+from .password_hasher import PasswordHasher, get_password_hasher
+from .principal import Principal
+from .rate_limiter import (
+    RateLimitBackend,
+    MemoryRateLimitBackend,
+    RedisRateLimitBackend,
+    AuthRateLimiter,
+    get_auth_rate_limiter,
+)
+from .token_service import TokenService, get_optional_token_service, get_token_service
+from .session_store import (
+    SessionStore,
+    MemorySessionStore,
+    RedisSessionStore,
+    SessionManager,
+    get_session_store,
+)
+
+__all__ = [
+    "Principal",
+    "get_principal",
+    "require_login",
+    "require_admin",
+    "SessionStore",
+    "MemorySessionStore",
+    "RedisSessionStore",
+    "SessionManager",
+    "get_session_store",
+    "TokenService",
+    "get_token_service",
+    "get_optional_token_service",
+    "PasswordHasher",
+    "get_password_hasher",
+    "RateLimitBackend",
+    "MemoryRateLimitBackend",
+    "RedisRateLimitBackend",
+    "AuthRateLimiter",
+    "get_auth_rate_limiter",
+]
@@ -0,0 +1,88 @@
+from fastapi import Depends
+from fastapi.requests import Request
+
+from src.app.common import StatusCode
+from src.app.core import set_consistency_key
+from src.app.exceptions import BusinessException
+from .principal import Principal
+from .session_store import SessionManager
+from .token_service import get_optional_token_service
+
+_BEARER_PREFIX = "bearer "
+
+
+async def get_principal(request: Request) -> Principal | None:
+    """
+    解析当前请求的用户主体, 每个请求仅解析一次并缓存在 request.state 上
+
+    携带 Authorization: Bearer 访问令牌时按令牌认证, 否则按会话认证; 未配置令牌密钥时令牌视为未登录
+
+    Args:
+        request (Request): 请求实例
+
+    Returns:
+        Principal | None: 用户主体, 未登录时返回 None
+
+    Raises:
+        BusinessException: 令牌无效 | 令牌已过期 | 令牌类型不匹配 | 令牌认证未启用
+    """
+
+    try:
+        return request.state.principal
+    except AttributeError:
+        pass
+
+    authorization = request.headers.get("authorization")
+    if authorization and authorization[:len(_BEARER_PREFIX)].lower() == _BEARER_PREFIX:
+        token_service = get_optional_token_service()
+        if token_service is None:
+            raise BusinessException(StatusCode.NOT_LOGIN, "令牌认证未启用")
+        principal = token_service.verify(authorization[len(_BEARER_PREFIX):].strip())
+    else:
+        data = await SessionManager.get(request)
+        principal = None if data is None else Principal.loads(data)
+    request.state.principal = principal
+    # 登录用户的写入使其随后的读取在窗口期内走主库
+    set_consistency_key(None if principal is None else f"user:{principal.id}")
+
+    return principal
+
+
+async def require_login(principal: Principal | None = Depends(get_principal)) -> Principal:
+    """
+    要求用户已登录
+
+    Args:
+        principal (Principal | None): 用户主体
+
+    Returns:
+        Principal: 用户主体
+
+    Raises:
+        BusinessException: 用户未登录
+    """
+
+    if principal is None:
+        raise BusinessException(StatusCode.NOT_LOGIN, "用户未登录")
+
+    return principal
+
+
+async def require_admin(principal: Principal | None = Depends(get_principal)) -> Principal:
+    """
+    要求用户为管理员
+
+    Args:
+        principal (Principal | None): 用户主体
+
+    Returns:
+        Principal: 用户主体
+
+    Raises:
+        BusinessException: 用户非管理员
+    """
+
+    if principal is None or not principal.is_admin:
+        raise BusinessException(StatusCode.NO_AUTH, "用户非管理员")
+
+    return principal
@@ -0,0 +1,172 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache, partial
+
+from src.app.common import StatusCode
+from src.app.core.config import settings
+from src.app.exceptions import BusinessException
+from src.app.utils import PasswordUtils
+
+# 批量哈希时每次进程间调用处理的密码数量, 过大会使登录请求在进程池队列中等待过久
+_HASH_MANY_CHUNK_SIZE = 32
+
+
+class PasswordHasher:
+    """
+    密码哈希引擎
+
+    scrypt 计算在有界进程池中执行, 不阻塞事件循环; 同时在途的计算数受信号量限制,
+    超过上限的请求排队等待, 等待超时则直接拒绝, 避免登录风暴时排队无限增长
+
+    Attributes:
+        workers (int): 进程数, 0 表示使用事件循环默认线程池(hashlib.scrypt 计算时释放 GIL)
+        max_pending (int): 同时在途的计算数上限
+        timeout (float): 排队等待上限秒数
+        rejected (int): 因排队超时被拒绝的次数
+    """
+
+    def __init__(
+            self,
+            workers: int,
+            max_pending: int,
+            timeout: float,
+            n: int,
+            r: int,
+            p: int,
+            legacy_salt: str,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.rejected = 0
+        self._n = n
+        self._r = r
+        self._p = p
+        self._legacy_salt = legacy_salt
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_executor(self) -> Executor | None:
+        if self.workers > 0 and self._executor is None:
+            # spawn 启动的子进程不继承事件循环及数据库连接等父进程状态
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # 信号量绑定事件循环, 循环变化(如测试中)时重新创建
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _submit[T](self, func: Callable[..., T], *args) -> T:
+        semaphore = self._get_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.timeout)
+        except TimeoutError:
+            self.rejected += 1
+            raise BusinessException(StatusCode.SYSTEM_ERROR, "系统繁忙, 请稍后重试")
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+        finally:
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        计算密码哈希
+
+        Args:
+            password (str): 明文密码
+
+        Returns:
+            str: 带算法标签的密码哈希
+
+        Raises:
+            BusinessException: 系统繁忙
+        """
+
+        return await self._submit(PasswordUtils.hash_scrypt, password, self._n, self._r, self._p)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        并行计算一批密码哈希, 按块分发到各进程, 每块只占用一个在途名额
+
+        Args:
+            passwords (list[str]): 明文密码列表
+
+        Returns:
+            list[str]: 与输入顺序一致的密码哈希列表
+
+        Raises:
+            BusinessException: 系统繁忙
+        """
+
+        if not passwords:
+            return []
+
+        chunk_size = min(_HASH_MANY_CHUNK_SIZE, -(-len(passwords) // max(1, self.workers)))
+        chunks = await asyncio.gather(*(
+            self._submit(PasswordUtils.hash_scrypt_many, passwords[i:i + chunk_size], self._n, self._r, self._p)
+            for i in range(0, len(passwords), chunk_size)
+        ))
+        return [hashed for chunk in chunks for hashed in chunk]
+
+    async def verify(self, password: str, stored: str) -> tuple[bool, str | None]:
+        """
+        校验密码, 校验通过且哈希过时时返回需要回写的新哈希
+
+        Args:
+            password (str): 明文密码
+            stored (str): 已存储的密码哈希
+
+        Returns:
+            tuple[bool, str | None]: 密码是否正确, 需要回写的新哈希(无需升级时为 None)
+
+        Raises:
+            BusinessException: 系统繁忙
+        """
+
+        return await self._submit(
+            PasswordUtils.verify_and_upgrade,
+            password,
+            stored,
+            self._legacy_salt,
+            self._n,
+            self._r,
+            self._p,
+        )
+
+    def shutdown(self) -> None:
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache()
+def get_password_hasher() -> PasswordHasher:
+    """
+    按配置创建密码哈希引擎(进程内单例)
+
+    Returns:
+        PasswordHasher: 密码哈希引擎
+    """
+
+    return PasswordHasher(
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+        timeout=settings.password_hash_timeout_seconds,
+        n=settings.password_scrypt_n,
+        r=settings.password_scrypt_r,
+        p=settings.password_scrypt_p,
+        legacy_salt=settings.salt,
+    )
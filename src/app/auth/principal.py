@@ -0,0 +1,59 @@
+import json
+
+from src.app.constants.user_constants import ADMIN_ROLE
+
+
+class Principal:
+    """
+    已认证用户主体, 仅包含鉴权所需的最小字段
+
+    Attributes:
+        id (int): 用户ID
+        role (int): 用户角色
+        status (int): 用户状态
+    """
+
+    __slots__ = ("id", "role", "status")
+
+    def __init__(self, id: int, role: int, status: int) -> None:
+        self.id = id
+        self.role = role
+        self.status = status
+
+    @property
+    def is_admin(self) -> bool:
+        """用户是否为管理员"""
+        return self.role == ADMIN_ROLE
+
+    def dumps(self) -> str:
+        """
+        序列化为紧凑的会话数据
+
+        Returns:
+            str: 会话数据
+        """
+
+        return json.dumps([self.id, self.role, self.status], separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, data: str) -> "Principal":
+        """
+        从会话数据反序列化
+
+        Args:
+            data (str): 会话数据
+
+        Returns:
+            Principal: 用户主体
+        """
+
+        user_id, role, status = json.loads(data)
+        return cls(user_id, role, status)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Principal):
+            return NotImplemented
+        return (self.id, self.role, self.status) == (other.id, other.role, other.status)
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id}, role={self.role}, status={self.status})"
@@ -0,0 +1,152 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from src.app.common import StatusCode
+from src.app.core.config import settings
+from src.app.core.redis import RedisClient, get_redis_client
+from src.app.exceptions import BusinessException
+from src.app.utils import TTLLRUCache
+
+
+class RateLimitBackend(ABC):
+    """
+    限流存储后端
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> bool:
+        """
+        从指定键的令牌桶中取出一个令牌
+
+        Args:
+            key (str): 限流键
+            capacity (int): 桶容量(突发上限)
+            refill_per_second (float): 每秒补充的令牌数
+
+        Returns:
+            bool: 是否取得令牌
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    进程内令牌桶, 限流键数量有上限, 防止伪造大量来源耗尽内存
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        # 桶状态为 [剩余令牌数, 上次更新时间]
+        self._buckets: TTLLRUCache[str, list[float]] = TTLLRUCache(max_keys)
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> bool:
+        now = time.monotonic()
+        # 桶补满后的状态与新桶相同, 可随之过期
+        full_after = capacity / refill_per_second
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets.set(key, [capacity - 1, now], full_after)
+            return True
+
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            return False
+
+        bucket[0] = tokens - 1
+        self._buckets.set(key, bucket, full_after)
+        return True
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Redis 限流后端, 供多进程/多节点共享限流状态
+
+    以 INCR + EXPIRE 实现固定窗口计数, 窗口长度为令牌桶补满所需时间, 窗口内最多放行 capacity 次,
+    长期速率与令牌桶一致
+    """
+
+    def __init__(self, client: RedisClient, key_prefix: str = "user_center:rate_limit:") -> None:
+        self._client = client
+        self._key_prefix = key_prefix
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> bool:
+        window = max(1, math.ceil(capacity / refill_per_second))
+        redis_key = f"{self._key_prefix}{key}:{int(time.time()) // window}"
+
+        count = await self._client.incr(redis_key)
+        if count == 1:
+            await self._client.expire(redis_key, window)
+
+        return count <= capacity
+
+
+class AuthRateLimiter:
+    """
+    登录/注册限流器, 分别按客户端IP与账号限流
+
+    Attributes:
+        shed (dict[str, int]): 按限流维度统计的拒绝次数
+    """
+
+    def __init__(
+            self,
+            backend: RateLimitBackend,
+            ip_capacity: int,
+            ip_refill_per_second: float,
+            account_capacity: int,
+            account_refill_per_second: float,
+    ) -> None:
+        self._backend = backend
+        self._ip_rule = (ip_capacity, ip_refill_per_second)
+        self._account_rule = (account_capacity, account_refill_per_second)
+        self.shed: dict[str, int] = {"ip": 0, "account": 0}
+
+    async def check(self, action: str, client_ip: str | None, user_account: str | None) -> None:
+        """
+        校验请求是否超出频率限制
+
+        Args:
+            action (str): 操作名称, 不同操作分别计数
+            client_ip (str | None): 客户端IP
+            user_account (str | None): 账号
+
+        Raises:
+            BusinessException: 请求过于频繁
+        """
+
+        if client_ip and not await self._backend.acquire(f"{action}:ip:{client_ip}", *self._ip_rule):
+            self.shed["ip"] += 1
+            raise BusinessException(StatusCode.TOO_MANY_REQUESTS, "请求过于频繁, 请稍后重试")
+
+        if user_account and not await self._backend.acquire(f"{action}:account:{user_account}", *self._account_rule):
+            self.shed["account"] += 1
+            raise BusinessException(StatusCode.TOO_MANY_REQUESTS, "该账号请求过于频繁, 请稍后重试")
+
+
+@lru_cache()
+def get_auth_rate_limiter() -> AuthRateLimiter | None:
+    """
+    按配置创建登录/注册限流器(进程内单例)
+
+    Returns:
+        AuthRateLimiter | None: 限流器, 未启用限流时返回 None
+    """
+
+    if not settings.rate_limit_enabled:
+        return None
+
+    if settings.rate_limit_backend == "redis":
+        backend = RedisRateLimitBackend(get_redis_client())
+    else:
+        backend = MemoryRateLimitBackend(settings.rate_limit_max_keys)
+
+    return AuthRateLimiter(
+        backend,
+        settings.rate_limit_ip_capacity,
+        settings.rate_limit_ip_refill_per_second,
+        settings.rate_limit_account_capacity,
+        settings.rate_limit_account_refill_per_second,
+    )
@@ -0,0 +1,176 @@
+import secrets
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from fastapi.requests import Request
+
+from src.app.constants.user_constants import USER_LOGIN_STATE
+from src.app.core.config import settings
+from src.app.core.redis import RedisClient, get_redis_client
+from src.app.utils import NoInstantiableMeta, TTLLRUCache
+
+
+class SessionStore(ABC):
+    """
+    服务端会话存储, 以不透明的会话ID为键保存会话数据
+    """
+
+    @abstractmethod
+    async def get(self, session_id: str) -> str | None:
+        """
+        读取会话数据
+
+        Args:
+            session_id (str): 会话ID
+
+        Returns:
+            str | None: 会话数据, 不存在或已过期时返回 None
+        """
+
+    @abstractmethod
+    async def set(self, session_id: str, data: str, ttl: int) -> None:
+        """
+        写入会话数据
+
+        Args:
+            session_id (str): 会话ID
+            data (str): 会话数据
+            ttl (int): 过期秒数
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        """
+        删除会话数据
+
+        Args:
+            session_id (str): 会话ID
+
+        Returns:
+            bool: 会话是否存在并被删除
+        """
+
+
+class MemorySessionStore(SessionStore):
+    """
+    进程内 LRU 会话存储, 适用于单节点部署
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._cache: TTLLRUCache[str, str] = TTLLRUCache(max_entries)
+
+    async def get(self, session_id: str) -> str | None:
+        return self._cache.get(session_id)
+
+    async def set(self, session_id: str, data: str, ttl: int) -> None:
+        self._cache.set(session_id, data, ttl)
+
+    async def delete(self, session_id: str) -> bool:
+        return self._cache.pop(session_id) is not None
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 会话存储, 适用于多节点部署
+    """
+
+    def __init__(self, client: RedisClient, key_prefix: str = "user_center:session:") -> None:
+        self._client = client
+        self._key_prefix = key_prefix
+
+    def _key(self, session_id: str) -> str:
+        return self._key_prefix + session_id
+
+    async def get(self, session_id: str) -> str | None:
+        return await self._client.get(self._key(session_id))
+
+    async def set(self, session_id: str, data: str, ttl: int) -> None:
+        await self._client.set(self._key(session_id), data, ex=ttl)
+
+    async def delete(self, session_id: str) -> bool:
+        return bool(await self._client.delete(self._key(session_id)))
+
+
+@lru_cache()
+def get_session_store() -> SessionStore:
+    """
+    按配置创建会话存储(进程内单例)
+
+    Returns:
+        SessionStore: 会话存储
+    """
+
+    if settings.session_backend == "redis":
+        return RedisSessionStore(get_redis_client())
+    return MemorySessionStore(settings.session_max_entries)
+
+
+class SessionManager(metaclass=NoInstantiableMeta):
+    """
+    会话管理, Cookie 中仅保存会话ID, 会话数据保存在服务端存储中
+    """
+
+    @staticmethod
+    async def login(request: Request, data: str) -> str:
+        """
+        创建会话并将会话ID写入 Cookie
+
+        Args:
+            request (Request): 请求实例
+            data (str): 会话数据
+
+        Returns:
+            str: 会话ID
+        """
+
+        # 重新登录时作废旧会话, 避免会话固定
+        old_session_id = request.session.get(USER_LOGIN_STATE)
+        if old_session_id:
+            await get_session_store().delete(old_session_id)
+
+        session_id = secrets.token_urlsafe(32)
+        await get_session_store().set(session_id, data, settings.session_ttl_seconds)
+        request.session[USER_LOGIN_STATE] = session_id
+
+        return session_id
+
+    @staticmethod
+    async def get(request: Request) -> str | None:
+        """
+        读取当前请求的会话数据
+
+        Args:
+            request (Request): 请求实例
+
+        Returns:
+            str | None: 会话数据, 未登录或会话已过期时返回 None
+        """
+
+        session_id = request.session.get(USER_LOGIN_STATE)
+        if not session_id:
+            return None
+
+        data = await get_session_store().get(session_id)
+        if data is None:
+            # 服务端会话已失效, 清理 Cookie 中的残留ID
+            request.session.pop(USER_LOGIN_STATE, None)
+
+        return data
+
+    @staticmethod
+    async def logout(request: Request) -> bool:
+        """
+        删除当前请求的会话
+
+        Args:
+            request (Request): 请求实例
+
+        Returns:
+            bool: 会话是否存在并被删除
+        """
+
+        session_id = request.session.pop(USER_LOGIN_STATE, None)
+        if not session_id:
+            return False
+
+        return await get_session_store().delete(session_id)
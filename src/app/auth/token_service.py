@@ -0,0 +1,224 @@
+import logging
+import secrets
+import time
+from functools import lru_cache
+from typing import Literal
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from src.app.common import StatusCode
+from src.app.core.config import settings
+from src.app.exceptions import BusinessException
+from src.app.schemas import TokenPair
+from src.app.utils import InvalidTokenError, JWTUtils, TTLLRUCache
+from .principal import Principal
+
+logger = logging.getLogger(__name__)
+
+type TokenType = Literal["access", "refresh"]
+
+
+class TokenService:
+    """
+    ES256 无状态令牌服务
+
+    已校验过签名的令牌会按其剩余有效期缓存在有界 LRU 中, 热点令牌再次访问时无需重新进行 ECDSA 验签
+    """
+
+    def __init__(
+            self,
+            private_key: ec.EllipticCurvePrivateKey,
+            public_key: ec.EllipticCurvePublicKey,
+            access_ttl: int,
+            refresh_ttl: int,
+            cache_size: int,
+    ) -> None:
+        self._private_key = private_key
+        self._public_key = public_key
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        # 缓存值为 (令牌类型, 用户主体)
+        self._verified: TTLLRUCache[str, tuple[str, Principal]] | None = (
+            TTLLRUCache(cache_size) if cache_size > 0 else None
+        )
+
+    @classmethod
+    def from_pem_files(
+            cls,
+            private_key_path: str,
+            public_key_path: str,
+            access_ttl: int,
+            refresh_ttl: int,
+            cache_size: int,
+    ) -> "TokenService":
+        """
+        从 PEM 文件加载密钥对并创建令牌服务
+
+        Args:
+            private_key_path (str): 私钥路径
+            public_key_path (str): 公钥路径
+            access_ttl (int): 访问令牌有效秒数
+            refresh_ttl (int): 刷新令牌有效秒数
+            cache_size (int): 已验签令牌缓存容量, 0 表示不缓存
+
+        Returns:
+            TokenService: 令牌服务
+
+        Raises:
+            RuntimeError: 密钥文件不存在或不是 P-256 密钥
+        """
+
+        try:
+            with open(private_key_path, "rb") as f:
+                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            with open(public_key_path, "rb") as f:
+                public_key = serialization.load_pem_public_key(f.read())
+        except FileNotFoundError as e:
+            raise RuntimeError(f"令牌密钥文件不存在: {e.filename}, 请先运行 key_generator_utils 生成密钥对") from e
+
+        if not (
+                isinstance(private_key, ec.EllipticCurvePrivateKey)
+                and isinstance(public_key, ec.EllipticCurvePublicKey)
+                and isinstance(public_key.curve, ec.SECP256R1)
+        ):
+            raise RuntimeError("ES256 令牌需要 secp256r1 密钥对")
+
+        return cls(private_key, public_key, access_ttl, refresh_ttl, cache_size)
+
+    def _issue(self, principal: Principal, token_type: TokenType, ttl: int, now: int) -> str:
+        claims = {
+            "sub": principal.id,
+            "role": principal.role,
+            "status": principal.status,
+            "typ": token_type,
+            "iat": now,
+            "exp": now + ttl,
+            "jti": secrets.token_urlsafe(8),
+        }
+        return JWTUtils.encode_es256(claims, self._private_key)
+
+    def issue_token_pair(self, principal: Principal) -> TokenPair:
+        """
+        为用户签发访问令牌与刷新令牌
+
+        Args:
+            principal (Principal): 用户主体
+
+        Returns:
+            TokenPair: 令牌对
+        """
+
+        now = int(time.time())
+        return TokenPair(
+            access_token=self._issue(principal, "access", self.access_ttl, now),
+            refresh_token=self._issue(principal, "refresh", self.refresh_ttl, now),
+            expires_in=self.access_ttl,
+        )
+
+    def verify_uncached(self, token: str) -> tuple[str, Principal, int]:
+        """
+        验签并解析令牌, 不使用缓存
+
+        Args:
+            token (str): 令牌
+
+        Returns:
+            tuple[str, Principal, int]: 令牌类型, 用户主体, 过期时间戳
+
+        Raises:
+            BusinessException: 令牌无效 | 令牌已过期
+        """
+
+        try:
+            claims = JWTUtils.decode_es256(token, self._public_key)
+            token_type = claims["typ"]
+            principal = Principal(int(claims["sub"]), int(claims["role"]), int(claims["status"]))
+            expire_at = int(claims["exp"])
+        except (InvalidTokenError, KeyError, TypeError, ValueError) as e:
+            raise BusinessException(StatusCode.NOT_LOGIN, "令牌无效") from e
+
+        if expire_at <= time.time():
+            raise BusinessException(StatusCode.NOT_LOGIN, "令牌已过期")
+
+        return token_type, principal, expire_at
+
+    def verify(self, token: str, token_type: TokenType = "access") -> Principal:
+        """
+        校验令牌并返回用户主体, 优先命中已验签缓存
+
+        Args:
+            token (str): 令牌
+            token_type (TokenType): 期望的令牌类型
+
+        Returns:
+            Principal: 用户主体
+
+        Raises:
+            BusinessException: 令牌无效 | 令牌已过期 | 令牌类型不匹配
+        """
+
+        cached = self._verified.get(token) if self._verified is not None else None
+        if cached is None:
+            actual_type, principal, expire_at = self.verify_uncached(token)
+            if self._verified is not None:
+                # 缓存条目与令牌同时过期
+                self._verified.set(token, (actual_type, principal), expire_at - time.time())
+        else:
+            actual_type, principal = cached
+
+        if actual_type != token_type:
+            raise BusinessException(StatusCode.NOT_LOGIN, "令牌类型不匹配")
+
+        return principal
+
+    def stats(self) -> dict[str, int]:
+        """
+        已验签令牌缓存统计
+
+        Returns:
+            dict[str, int]: 命中、未命中、淘汰次数及当前条目数
+        """
+
+        if self._verified is None:
+            return {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
+        return {
+            "hits": self._verified.hits,
+            "misses": self._verified.misses,
+            "evictions": self._verified.evictions,
+            "size": len(self._verified),
+        }
+
+
+@lru_cache()
+def get_token_service() -> TokenService:
+    """
+    按配置创建令牌服务(进程内单例)
+
+    Returns:
+        TokenService: 令牌服务
+    """
+
+    return TokenService.from_pem_files(
+        settings.auth_private_key_path,
+        settings.auth_public_key_path,
+        settings.access_token_ttl_seconds,
+        settings.refresh_token_ttl_seconds,
+        settings.token_cache_size,
+    )
+
+
+@lru_cache()
+def get_optional_token_service() -> TokenService | None:
+    """
+    获取令牌服务, 未配置密钥对(仅使用会话认证的部署)时返回 None
+
+    Returns:
+        TokenService | None: 令牌服务
+    """
+
+    try:
+        return get_token_service()
+    except RuntimeError as e:
+        logger.warning("令牌认证未启用: %s", e)
+        return None
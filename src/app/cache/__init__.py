@@ -0,0 +1,18 @@
+from .invalidation_bus import (
+    InvalidationBus,
+    InvalidationTransport,
+    LocalSocketTransport,
+    RedisPubSubTransport,
+    get_invalidation_bus,
+)
+from .user_cache import UserCache, get_user_cache
+
+__all__ = [
+    "UserCache",
+    "get_user_cache",
+    "InvalidationBus",
+    "InvalidationTransport",
+    "LocalSocketTransport",
+    "RedisPubSubTransport",
+    "get_invalidation_bus",
+]
@@ -0,0 +1,373 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterable
+from functools import lru_cache
+from typing import Protocol
+
+from src.app.core.config import settings
+from src.app.core.redis import RedisClient, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 失效处理函数: 参数为用户ID列表, 为 None 时表示全部失效(代数失效)
+type InvalidationHandler = Callable[[list[int] | None], None]
+
+# 消息格式为 "<来源> <载荷>", 载荷为逗号分隔的用户ID, 或表示全部失效的 "*"
+_FLUSH_ALL = "*"
+# 本地套接字单条消息的最大字节数, 批量大小需保证消息不超过该值
+_MAX_DATAGRAM = 64 * 1024
+
+
+class InvalidationTransport(Protocol):
+    """
+    失效消息的传输方式, 消息发送给其他所有进程(是否发送给自身由实现决定, 总线会忽略自身发出的消息)
+    """
+
+    # 因接收方缓冲区已满等原因丢弃的消息数
+    dropped: int
+
+    async def open(self) -> None: ...
+
+    async def publish(self, message: str) -> None: ...
+
+    def listen(self) -> AsyncIterator[str]: ...
+
+    async def close(self) -> None: ...
+
+
+class RedisPubSubTransport:
+    """
+    基于 Redis Pub/Sub 的传输, 适用于多主机部署; 订阅断开期间的消息会丢失, 由总线在重连后整体失效兜底
+    """
+
+    def __init__(self, client: RedisClient, channel: str, poll_timeout: float = 1.0) -> None:
+        """
+        Args:
+            client (RedisClient): Redis 客户端
+            channel (str): 频道名
+            poll_timeout (float): 单次等待消息的秒数
+        """
+
+        self._client = client
+        self._channel = channel
+        self._poll_timeout = poll_timeout
+        self.dropped = 0
+
+    async def open(self) -> None:
+        pass
+
+    async def publish(self, message: str) -> None:
+        await self._client.publish(self._channel, message)
+
+    async def listen(self) -> AsyncIterator[str]:
+        pubsub = self._client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel)
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self._poll_timeout)
+                if message is None:
+                    continue
+                data = message["data"]
+                yield data.decode() if isinstance(data, bytes) else data
+        finally:
+            await pubsub.unsubscribe(self._channel)
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalSocketTransport:
+    """
+    基于 Unix 数据报套接字的传输, 适用于单主机多工作进程且没有 Redis 的部署
+
+    每个进程在同一目录下绑定各自的套接字, 发送时逐个发送给目录下的其他套接字,
+    已退出进程遗留的套接字在发送失败时删除; 不支持 Windows
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Args:
+            directory (str): 套接字目录, 同一主机上的各工作进程需相同
+        """
+
+        self._directory = directory
+        self._path = ""
+        self._sock: socket.socket | None = None
+        self.dropped = 0
+
+    async def open(self) -> None:
+        os.makedirs(self._directory, mode=0o700, exist_ok=True)
+        # 套接字在 open 时创建, 应在 fork 出的工作进程中调用
+        self._path = os.path.join(self._directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        sock.bind(self._path)
+        self._sock = sock
+
+    async def publish(self, message: str) -> None:
+        if self._sock is None:
+            return
+
+        data = message.encode()
+        for entry in os.scandir(self._directory):
+            if entry.path == self._path or not entry.name.endswith(".sock"):
+                continue
+            try:
+                self._sock.sendto(data, entry.path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # 进程已退出
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                self.dropped += 1
+
+    async def listen(self) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        while self._sock is not None:
+            data = await loop.sock_recv(self._sock, _MAX_DATAGRAM)
+            yield data.decode()
+
+    async def close(self) -> None:
+        if self._sock is None:
+            return
+        self._sock.close()
+        self._sock = None
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+
+class InvalidationBus:
+    """
+    跨进程缓存失效总线: 本进程的失效在批量窗口内合并(同一用户只发送一次, 全部失效覆盖单个用户的失效)后
+    广播给其他进程, 收到其他进程的消息时调用失效处理函数
+
+    消息可能因订阅断开而丢失, 接收出错重连后对本进程执行一次全部失效
+    """
+
+    def __init__(
+            self,
+            transport: InvalidationTransport,
+            batch_interval: float = 0.005,
+            max_batch: int = 1000,
+            reconnect_delay: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            transport (InvalidationTransport): 传输方式
+            batch_interval (float): 批量窗口秒数, 首个待发送失效之后等待该时长再发送
+            max_batch (int): 单条消息中的用户ID数量上限
+            reconnect_delay (float): 接收出错后重连的等待秒数
+        """
+
+        self._transport = transport
+        self._batch_interval = batch_interval
+        self._max_batch = max_batch
+        self._reconnect_delay = reconnect_delay
+        self._origin = uuid.uuid4().hex
+        self._handler: InvalidationHandler | None = None
+        self._pending: set[int] = set()
+        self._pending_all = False
+        self._flush_task: asyncio.Task | None = None
+        self._listen_task: asyncio.Task | None = None
+        self.published_messages = 0
+        self.published_ids = 0
+        self.coalesced = 0
+        self.received_messages = 0
+        self.received_ids = 0
+        self.errors = 0
+
+    @property
+    def is_running(self) -> bool:
+        """是否已启动"""
+        return self._listen_task is not None
+
+    async def start(self, handler: InvalidationHandler) -> None:
+        """
+        打开传输并开始接收其他进程的失效消息
+
+        Args:
+            handler (InvalidationHandler): 失效处理函数
+        """
+
+        if self._listen_task is not None:
+            return
+        self._handler = handler
+        await self._transport.open()
+        self._listen_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """发送待发送的失效, 停止接收并关闭传输"""
+
+        if self._listen_task is None:
+            return
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+        self._listen_task.cancel()
+        try:
+            await self._listen_task
+        except asyncio.CancelledError:
+            pass
+        self._listen_task = None
+        await self._transport.close()
+
+    def publish(self, user_ids: Iterable[int]) -> None:
+        """
+        广播用户失效, 在批量窗口结束时发送; 未启动时忽略
+
+        Args:
+            user_ids (Iterable[int]): 用户ID
+        """
+
+        if self._listen_task is None:
+            return
+
+        before = len(self._pending)
+        count = 0
+        for user_id in user_ids:
+            count += 1
+            if not self._pending_all:
+                self._pending.add(user_id)
+        # 窗口内已待发送的用户, 以及已有全部失效待发送时的失效, 均被合并
+        self.coalesced += count - (len(self._pending) - before)
+        self._schedule()
+
+    def publish_all(self) -> None:
+        """广播全部失效(代数失效), 覆盖窗口内待发送的单个用户失效; 未启动时忽略"""
+
+        if self._listen_task is None:
+            return
+
+        self.coalesced += len(self._pending)
+        self._pending.clear()
+        self._pending_all = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._batch_interval)
+        # 发送期间产生的失效由新的任务发送
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """立即发送待发送的失效"""
+
+        payloads = []
+        if self._pending_all:
+            payloads.append(_FLUSH_ALL)
+            self._pending_all = False
+        user_ids = sorted(self._pending)
+        self._pending.clear()
+        for start in range(0, len(user_ids), self._max_batch):
+            payloads.append(",".join(map(str, user_ids[start:start + self._max_batch])))
+        if not payloads:
+            return
+
+        for payload in payloads:
+            try:
+                await self._transport.publish(f"{self._origin} {payload}")
+            except Exception:
+                self.errors += 1
+                logger.exception("缓存失效消息发送失败")
+                continue
+            self.published_messages += 1
+        self.published_ids += len(user_ids)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._transport.listen():
+                    self._receive(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("缓存失效消息接收失败, %.1f 秒后重连", self._reconnect_delay)
+            await asyncio.sleep(self._reconnect_delay)
+            # 断开期间可能丢失消息
+            self._handler(None)
+
+    def _receive(self, message: str) -> None:
+        origin, _, payload = message.partition(" ")
+        if origin == self._origin or not payload:
+            return
+
+        self.received_messages += 1
+        if payload == _FLUSH_ALL:
+            self._handler(None)
+            return
+        try:
+            user_ids = [int(user_id) for user_id in payload.split(",")]
+        except ValueError:
+            self.errors += 1
+            logger.warning("无效的缓存失效消息: %s", message)
+            return
+        self.received_ids += len(user_ids)
+        self._handler(user_ids)
+
+    def stats(self) -> dict[str, int]:
+        """
+        广播统计
+
+        Returns:
+            dict[str, int]: 发送的消息数与用户数、合并的失效数、收到的消息数与用户数、丢弃与出错次数
+        """
+
+        return {
+            "published_messages": self.published_messages,
+            "published_ids": self.published_ids,
+            "coalesced": self.coalesced,
+            "received_messages": self.received_messages,
+            "received_ids": self.received_ids,
+            "dropped": self._transport.dropped,
+            "errors": self.errors,
+        }
+
+
+def create_transport(backend: str) -> InvalidationTransport:
+    """
+    按后端名称创建传输
+
+    Args:
+        backend (str): redis 或 local
+
+    Returns:
+        InvalidationTransport: 传输方式
+    """
+
+    if backend == "redis":
+        return RedisPubSubTransport(get_redis_client(), settings.user_cache_bus_channel)
+    return LocalSocketTransport(settings.user_cache_bus_socket_dir)
+
+
+@lru_cache()
+def get_invalidation_bus() -> InvalidationBus | None:
+    """
+    按配置创建缓存失效总线(进程内单例)
+
+    Returns:
+        InvalidationBus | None: 失效总线, 未启用时为 None
+    """
+
+    if settings.user_cache_bus_backend == "none":
+        return None
+    return InvalidationBus(
+        create_transport(settings.user_cache_bus_backend),
+        batch_interval=settings.user_cache_bus_batch_ms / 1000,
+        max_batch=settings.user_cache_bus_max_batch,
+    )
@@ -0,0 +1,236 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+
+from src.app.core.config import settings
+from src.app.core.redis import RedisClient, get_redis_client
+from src.app.schemas import SafetyUser
+from src.app.utils import TTLLRUCache
+from .invalidation_bus import InvalidationBus, get_invalidation_bus
+
+# 清空 Redis 缓存时每次扫描与删除的键数量
+_SCAN_BATCH = 500
+
+
+class UserCache:
+    """
+    脱敏用户信息的两级读穿缓存
+
+    一级为进程内 TTL + LRU 缓存, 二级为可选的 Redis 缓存; 未命中时由调用方提供的加载函数查询数据库,
+    同一用户的并发未命中只加载一次. 加载期间发生失效时不回填, 避免把失效前读到的旧数据写回缓存
+
+    配置失效总线时, 本进程的失效广播给其他工作进程, 其他进程的失效同样清除本进程的一级缓存
+    """
+
+    def __init__(
+            self,
+            max_entries: int,
+            ttl: float,
+            redis_client: RedisClient | None = None,
+            redis_ttl: int = 600,
+            key_prefix: str = "user_center:user:",
+            bus: InvalidationBus | None = None,
+    ) -> None:
+        self._local: TTLLRUCache[int, SafetyUser] = TTLLRUCache(max_entries, ttl)
+        self._redis = redis_client
+        self._redis_ttl = redis_ttl
+        self._key_prefix = key_prefix
+        self._bus = bus
+        self._inflight: dict[int, asyncio.Future[SafetyUser]] = {}
+        # 每次失效递增, 用于识别加载期间发生的失效
+        self._generation = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.loads = 0
+
+    def _key(self, user_id: int) -> str:
+        return f"{self._key_prefix}{user_id}"
+
+    @property
+    def bus(self) -> InvalidationBus | None:
+        """跨进程失效总线"""
+        return self._bus
+
+    async def start(self) -> None:
+        """开始接收其他进程的失效广播, 未配置失效总线时无操作"""
+        if self._bus is not None:
+            await self._bus.start(self._invalidate_remote)
+
+    async def stop(self) -> None:
+        """发送待广播的失效并停止接收"""
+        if self._bus is not None:
+            await self._bus.stop()
+
+    def _invalidate_remote(self, user_ids: list[int] | None) -> None:
+        # 其他进程已删除 Redis 中的键, 只需清除一级缓存
+        if user_ids is None:
+            self.clear()
+            return
+        self._generation += 1
+        for user_id in user_ids:
+            self._local.pop(user_id)
+
+    async def get_or_load(self, user_id: int, loader: Callable[[int], Awaitable[SafetyUser]]) -> SafetyUser:
+        """
+        读取用户信息, 未命中时加载并回填
+
+        Args:
+            user_id (int): 用户ID
+            loader (Callable[[int], Awaitable[SafetyUser]]): 从数据库加载用户信息的函数
+
+        Returns:
+            SafetyUser: 用户信息(脱敏)
+        """
+
+        safety_user = self._local.get(user_id)
+        if safety_user is not None:
+            return safety_user
+
+        inflight = self._inflight.get(user_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[SafetyUser] = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        try:
+            safety_user = await self._load(user_id, loader)
+        except Exception as e:
+            future.set_exception(e)
+            # 没有并发等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(safety_user)
+            return safety_user
+        finally:
+            del self._inflight[user_id]
+
+    async def _load(self, user_id: int, loader: Callable[[int], Awaitable[SafetyUser]]) -> SafetyUser:
+        generation = self._generation
+
+        if self._redis is not None:
+            data = await self._redis.get(self._key(user_id))
+            if data is not None:
+                self.redis_hits += 1
+                safety_user = SafetyUser.model_validate_json(data)
+                if generation == self._generation:
+                    self._local.set(user_id, safety_user)
+                return safety_user
+            self.redis_misses += 1
+
+        self.loads += 1
+        safety_user = await loader(user_id)
+
+        if generation == self._generation:
+            self._local.set(user_id, safety_user)
+            if self._redis is not None:
+                await self._redis.set(self._key(user_id), safety_user.model_dump_json(), ex=self._redis_ttl)
+
+        return safety_user
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        使指定用户的缓存失效(两级)
+
+        Args:
+            user_id (int): 用户ID
+        """
+
+        self.invalidate_local(user_id)
+        if self._redis is not None:
+            await self._redis.delete(self._key(user_id))
+        if self._bus is not None:
+            self._bus.publish((user_id,))
+
+    async def invalidate_many(self, user_ids: list[int]) -> None:
+        """
+        批量使用户缓存失效(两级), Redis 中的键一次删除
+
+        Args:
+            user_ids (list[int]): 用户ID列表
+        """
+
+        if not user_ids:
+            return
+
+        self._generation += 1
+        for user_id in user_ids:
+            self._local.pop(user_id)
+        if self._redis is not None:
+            await self._redis.delete(*(self._key(user_id) for user_id in user_ids))
+        if self._bus is not None:
+            self._bus.publish(user_ids)
+
+    def invalidate_local(self, user_id: int) -> None:
+        """
+        仅使进程内缓存中的指定用户失效
+
+        Args:
+            user_id (int): 用户ID
+        """
+
+        self._generation += 1
+        self._local.pop(user_id)
+
+    async def invalidate_all(self) -> None:
+        """
+        清空全部用户的缓存(两级), 用于直接修改数据库等无法确定受影响用户的场景:
+        本进程及其他工作进程的一级缓存代数失效, Redis 中的键按前缀扫描后分批删除
+        """
+
+        self.clear()
+        if self._redis is not None:
+            keys = []
+            async for key in self._redis.scan_iter(match=f"{self._key_prefix}*", count=_SCAN_BATCH):
+                keys.append(key)
+                if len(keys) >= _SCAN_BATCH:
+                    await self._redis.delete(*keys)
+                    keys.clear()
+            if keys:
+                await self._redis.delete(*keys)
+        if self._bus is not None:
+            self._bus.publish_all()
+
+    def clear(self) -> None:
+        """清空进程内缓存"""
+        self._generation += 1
+        self._local.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        缓存统计
+
+        Returns:
+            dict[str, int]: 各级命中、未命中、淘汰次数及数据库加载次数
+        """
+
+        return {
+            "local_hits": self._local.hits,
+            "local_misses": self._local.misses,
+            "local_evictions": self._local.evictions,
+            "local_size": len(self._local),
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+            "loads": self.loads,
+        }
+
+
+@lru_cache()
+def get_user_cache() -> UserCache:
+    """
+    按配置创建用户缓存(进程内单例)
+
+    Returns:
+        UserCache: 用户缓存
+    """
+
+    return UserCache(
+        max_entries=settings.user_cache_max_entries,
+        ttl=settings.user_cache_ttl_seconds,
+        redis_client=get_redis_client() if settings.user_cache_redis_enabled else None,
+        redis_ttl=settings.user_cache_redis_ttl_seconds,
+        bus=get_invalidation_bus(),
+    )
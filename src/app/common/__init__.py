@@ -1,6 +1,14 @@
 from .base_response import BaseResponse, BaseHTTPResponse
 from .http_response_utils import HTTPResponseUtils
+from .model_response_route import ModelResponseRoute
 from .result_utils import ResultUtils
 from .status_code import StatusCode
 
-__all__ = ["ResultUtils", "BaseResponse", "StatusCode", "HTTPResponseUtils", "BaseHTTPResponse"]
+__all__ = [
+    "ResultUtils",
+    "BaseResponse",
+    "StatusCode",
+    "HTTPResponseUtils",
+    "BaseHTTPResponse",
+    "ModelResponseRoute",
+]
@@ -11,11 +11,14 @@ class BaseResponse[T](BaseModel):
 
 
 class BaseHTTPResponse[T](Response):
-    def __init__(self, content: BaseResponse[T]):
-        headers = {
-            "Content-Type": "application/json",
-        }
-        super().__init__(
-            headers=headers,
-            content=content.model_dump_json(indent=2)
-        )
+    """
+    紧凑 JSON 响应, 内容为 BaseResponse 时由 pydantic-core 直接序列化, 不再经过校验;
+    内容为 bytes 时视为已编码的响应体(如预编码的错误响应)
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: BaseResponse[T] | bytes, status_code: int = 200):
+        if isinstance(content, BaseResponse):
+            content = content.__pydantic_serializer__.to_json(content)
+        super().__init__(content=content, status_code=status_code)
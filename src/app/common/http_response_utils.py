@@ -1,15 +1,56 @@
+from functools import lru_cache
+
+from pydantic_core import to_json
+
 from src.app.utils import NoInstantiableMeta
-from .base_response import BaseResponse, BaseHTTPResponse
+from .base_response import BaseHTTPResponse, Json
+from .status_code import StatusCode
+
+
+def _encode_error(code: int, message: Json, description: Json) -> bytes:
+    """
+    编码错误响应体, 字段顺序与 BaseResponse 一致
+
+    Args:
+        code (int): 状态码
+        message (Json): 状态码信息
+        description (Json): 错误描述
+
+    Returns:
+        bytes: 紧凑 JSON
+    """
+
+    return to_json({"code": code, "data": None, "message": message, "description": description})
+
+
+@lru_cache(maxsize=1024)
+def _cached_error_body(code: int, message: str, description: str) -> bytes:
+    # 仅用于业务异常: 其描述均为固定文案, 组合数量有限, 编码结果(不可变 bytes)缓存复用
+    return _encode_error(code, message, description)
+
+
+# 启动时预编码各状态码的默认错误响应体
+for _status_code in StatusCode:
+    _cached_error_body(_status_code.value.code, _status_code.value.message, _status_code.value.description)
 
 
 class HTTPResponseUtils(metaclass=NoInstantiableMeta):
     @staticmethod
-    def error(code, message, description):
-        return BaseHTTPResponse(
-            content=BaseResponse(
-                code=code,
-                data=None,
-                message=message,
-                description=description,
-            )
-        )
+    def error(code: int, message: Json, description: Json, cache: bool = False) -> BaseHTTPResponse:
+        """
+        构造错误响应
+
+        Args:
+            code (int): 状态码
+            message (Json): 状态码信息
+            description (Json): 错误描述
+            cache (bool): 是否缓存编码结果, 仅用于固定文案(业务异常); 异常消息等可能包含用户输入的描述不缓存,
+                以免占满缓存挤出固定文案
+
+        Returns:
+            BaseHTTPResponse: 错误响应
+        """
+
+        if cache and isinstance(message, str) and isinstance(description, str):
+            return BaseHTTPResponse(content=_cached_error_body(code, message, description))
+        return BaseHTTPResponse(content=_encode_error(code, message, description))
@@ -0,0 +1,33 @@
+import inspect
+from typing import Any
+
+from fastapi.routing import APIRoute, request_response
+
+from .base_response import BaseHTTPResponse, BaseResponse
+
+
+class ModelResponseRoute(APIRoute):
+    """
+    直接序列化 BaseResponse 的路由
+
+    FastAPI 默认会按路由的返回值注解重新校验 ResultUtils.success 构造的 BaseResponse, 再经
+    jsonable_encoder 转换后编码. 本路由将异步路由函数返回的 BaseResponse 直接编码为紧凑 JSON 响应,
+    跳过上述步骤; 返回值注解仍用于生成 OpenAPI 文档. 通过 Response 参数设置响应头的路由保持默认行为
+    """
+
+    def __init__(self, path: str, endpoint: Any, **kwargs: Any) -> None:
+        super().__init__(path, endpoint, **kwargs)
+        if not inspect.iscoroutinefunction(endpoint) or self.dependant.response_param_name is not None:
+            return
+
+        call = self.dependant.call
+        status_code = self.status_code or 200
+
+        async def encode_response(**values: Any) -> Any:
+            content = await call(**values)
+            if isinstance(content, BaseResponse):
+                return BaseHTTPResponse(content, status_code)
+            return content
+
+        self.dependant.call = encode_response
+        self.app = request_response(self.get_route_handler())
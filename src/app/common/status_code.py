@@ -16,4 +16,5 @@ class StatusCode(Enum):
     NULL_ERROR = Code(40001, "请求数据为空", "")
     NOT_LOGIN = Code(40100, "未登录", "")
     NO_AUTH = Code(40101, "无权限", "")
+    TOO_MANY_REQUESTS = Code(42900, "请求过于频繁", "")
     SYSTEM_ERROR = Code(50000, "系统内部异常", "")
@@ -1,4 +1,23 @@
-from .database import register_postgres
+from .database import get_pool_saturation, get_pool_stats, register_postgres
+from .db_router import (
+    ReplicaRouter,
+    ReplicaRouting,
+    get_replica_routing,
+    read_primary,
+    replica_read,
+    set_consistency_key,
+)
 from .config import settings
 
-__all__ = ["register_postgres", "settings"]
+__all__ = [
+    "register_postgres",
+    "settings",
+    "get_pool_stats",
+    "get_pool_saturation",
+    "ReplicaRouter",
+    "ReplicaRouting",
+    "get_replica_routing",
+    "replica_read",
+    "read_primary",
+    "set_consistency_key",
+]
@@ -1,10 +1,14 @@
 from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     # Redis缓存配置
     redis_host: str = 'localhost'
     redis_port: int = 6379
+    redis_db: int = 0
+    redis_password: str | None = None
 
     # 数据库配置
     database_host: str = "localhost"
@@ -13,9 +17,148 @@ class Settings(BaseSettings):
     database_password: str = "123456"
     database_name: str = "user_center"
 
+    # 数据库连接池配置(每个工作进程各自持有连接池, 工作进程数 * database_pool_max_size 需小于 Postgres
+    # max_connections 并为管理连接留出余量; 经 PgBouncer 事务模式连接时需将 database_statement_cache_size 设为 0)
+    database_pool_min_size: int = 1
+    database_pool_max_size: int = 10
+    database_pool_max_queries: int = 50_000
+    database_pool_max_inactive_connection_lifetime: float = 300
+    database_connect_timeout_seconds: float = 10
+    database_command_timeout_seconds: float | None = 30
+    database_statement_cache_size: int = 100
+    database_max_cached_statement_lifetime: int = 300
+    database_max_cacheable_statement_size: int = 15 * 1024
+    # 服务端会话参数(statement_timeout 为 0 表示不限制)
+    database_statement_timeout_ms: int = 0
+    database_plan_cache_mode: Literal["auto", "force_custom_plan", "force_generic_plan"] = "auto"
+    database_application_name: str = "user-center-backend"
+    # 启动时按模型创建缺失的数据表; 表结构由 aerich 迁移管理, 默认关闭, 仅本地开发未执行迁移时开启
+    database_generate_schemas: bool = False
+
+    # 只读副本配置("host" 或 "host:port", 其余连接参数与主库相同, 为空时不启用读写分离;
+    # 只读服务方法读取副本, 事务内读取与本人写入后窗口期内的读取走主库)
+    database_replica_hosts: list[str] = []
+    database_read_your_writes_seconds: float = 5
+    database_read_your_writes_max_keys: int = 100_000
+
+    # 服务进程配置(python -m src.app.server 启动; 工作进程数为 0 时使用 CPU 核数, 并发上限为空时不限制,
+    # 工作进程处理 server_limit_max_requests 个请求后平滑退出并由新进程替换, 为空时不回收,
+    # 各进程在此基础上随机增加不超过 server_max_requests_jitter 个请求, 避免同时重启;
+    # 多个工作进程时会话与限流须使用 redis 后端, 否则拒绝启动, 仅压测等无需共享状态的场景可关闭 server_require_shared_state)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 1
+    server_preload: bool = True
+    server_loop: Literal["auto", "asyncio", "uvloop"] = "uvloop"
+    server_http: Literal["auto", "h11", "httptools"] = "httptools"
+    server_backlog: int = 2048
+    server_keep_alive_seconds: int = 5
+    server_limit_concurrency: int | None = None
+    server_limit_max_requests: int | None = None
+    server_max_requests_jitter: int = 0
+    server_graceful_shutdown_seconds: int | None = 30
+    server_proxy_headers: bool = False
+    server_forwarded_allow_ips: str = "127.0.0.1"
+    server_access_log: bool = False
+    server_require_shared_state: bool = True
+
     auth_key: str = "use to generate jwt"
+    # 旧版 MD5 密码盐值, 仅用于校验并升级存量密码
     salt: str = "password encrypt salt"
 
+    # 密码哈希配置(scrypt, 在独立进程池中计算)
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+    password_hash_timeout_seconds: float = 5.0
+    password_scrypt_n: int = 2 ** 14
+    password_scrypt_r: int = 8
+    password_scrypt_p: int = 1
+
+    # 登录/注册限流配置(令牌桶, 容量为突发上限, 补充速率单位为 个/秒)
+    rate_limit_enabled: bool = True
+    rate_limit_backend: Literal["memory", "redis"] = "memory"
+    rate_limit_ip_capacity: int = 20
+    rate_limit_ip_refill_per_second: float = 1.0
+    rate_limit_account_capacity: int = 5
+    rate_limit_account_refill_per_second: float = 0.1
+    rate_limit_max_keys: int = 100_000
+
+    # 用户搜索分页配置
+    search_default_limit: int = 20
+    search_max_limit: int = 100
+
+    # 用户缓存配置(进程内一级缓存 + 可选 Redis 二级缓存)
+    user_cache_max_entries: int = 10_000
+    user_cache_ttl_seconds: float = 60
+    user_cache_redis_enabled: bool = False
+    user_cache_redis_ttl_seconds: int = 600
+    # 跨进程缓存失效广播(多工作进程部署时同步各进程的一级缓存, 启用后可调大 user_cache_ttl_seconds;
+    # redis 使用 Pub/Sub, local 使用同一主机上的 Unix 数据报套接字; 批量窗口内的失效合并后发送)
+    user_cache_bus_backend: Literal["none", "redis", "local"] = "none"
+    user_cache_bus_channel: str = "user_center:user_cache:invalidate"
+    user_cache_bus_socket_dir: str = "/tmp/user_center_cache_bus"
+    user_cache_bus_batch_ms: float = 5
+    user_cache_bus_max_batch: int = 1000
+
+    # 账号布隆过滤器配置(注册查重与账号可用性检查, 快照路径为空时不持久化, 重建间隔为 0 时不定期重建;
+    # 可用性检查是否直接采信"一定不存在"的判定, 为空时仅单工作进程采信, 多工作进程时查询数据库确认)
+    account_filter_enabled: bool = True
+    account_filter_capacity: int = 1_000_000
+    account_filter_error_rate: float = 0.01
+    account_filter_snapshot_path: str | None = None
+    account_filter_rebuild_interval_seconds: int = 0
+    account_filter_trust_negatives: bool | None = None
+
+    # 用户导出配置
+    export_chunk_size: int = 1000
+
+    # 用户批量软删除/恢复配置(单次处理数量上限)
+    user_batch_max_size: int = 10_000
+
+    # 已删除用户清理配置(超过保留天数后分批物理删除, 定时间隔为 0 时只能手动触发)
+    user_purge_retention_days: int = 30
+    user_purge_chunk_size: int = 500
+    user_purge_chunk_sleep_seconds: float = 0.1
+    user_purge_interval_seconds: int = 3600
+
+    # 用户批量导入配置(每批一次查重与一次批量插入, 响应中最多返回的错误行数)
+    import_batch_size: int = 1000
+    import_max_reported_errors: int = 1000
+
+    # 审计日志配置(事件写入有界内存队列, 后台任务达到批量大小或刷新间隔时批量写入 audit_log 表;
+    # 队列满时按溢出策略丢弃并计数: drop_newest 丢弃新事件, drop_oldest 丢弃最早的事件)
+    audit_log_enabled: bool = True
+    audit_log_queue_size: int = 10_000
+    audit_log_batch_size: int = 500
+    audit_log_flush_interval_seconds: float = 1.0
+    audit_log_overflow: Literal["drop_newest", "drop_oldest"] = "drop_newest"
+
+    # 指标配置(/metrics 以 Prometheus 文本格式输出; 仅允许来源IP在 metrics_allowed_ips(IP或网段)内,
+    # 或携带 Authorization: Bearer <metrics_token> 的抓取请求, 其他请求返回无权限)
+    metrics_enabled: bool = True
+    metrics_allowed_ips: list[str] = ["127.0.0.1", "::1"]
+    metrics_token: str | None = None
+
+    # 请求级 SQL 统计配置(Server-Timing 响应头, 单个请求内同一语句执行达到次数阈值时标记为重复;
+    # 调试模式下记录慢查询与重复语句日志)
+    query_timing_enabled: bool = True
+    query_repeat_threshold: int = 5
+    query_debug: bool = False
+    query_slow_threshold_ms: float = 100
+
+    # 会话配置
+    session_secret_key: str = "your-secret-key-keep-it-safe"
+    session_backend: Literal["memory", "redis"] = "memory"
+    session_ttl_seconds: int = 7 * 24 * 3600
+    session_max_entries: int = 100_000
+
+    # 令牌配置(ES256, 密钥对由 src/app/utils/key_generator_utils.py 生成)
+    auth_private_key_path: str = "es256_private_key.pem"
+    auth_public_key_path: str = "es256_public_key.pem"
+    access_token_ttl_seconds: int = 15 * 60
+    refresh_token_ttl_seconds: int = 7 * 24 * 3600
+    token_cache_size: int = 10_000
+
     model_config = SettingsConfigDict(
         env_file=(".env.dev", ".env.prod")
     )
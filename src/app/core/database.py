@@ -1,49 +1,113 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+from tortoise import connections
 from tortoise.contrib.fastapi import RegisterTortoise
+from tortoise.exceptions import ConfigurationError
 from fastapi import FastAPI
 
-from .config import settings
+from .config import Settings, settings
+from .db_router import replica_connection_names
 
 # 映射类加载列表
 MODELS = [
     "src.app.models.users",
+    "src.app.models.audit_log",
     "aerich.models",
 ]
 
-# 数据库连接配置
-TORTOISE_ORM = {
-    "connections": {
-        "user_center_conn": {
-            "engine": "tortoise.backends.asyncpg",
-            "credentials": {
-                "host": settings.database_host,
-                "port": settings.database_port,
-                "user": settings.database_user,
-                "password": settings.database_password,
-                "database": settings.database_name,
+
+def build_credentials(config: Settings) -> dict[str, Any]:
+    """
+    根据配置生成 asyncpg 连接参数, 连接池参数由 Tortoise 透传给 asyncpg.create_pool
+
+    Args:
+        config (Settings): 配置
+
+    Returns:
+        dict[str, Any]: Tortoise 连接的 credentials
+    """
+
+    server_settings = {
+        "application_name": config.database_application_name,
+        "plan_cache_mode": config.database_plan_cache_mode,
+    }
+    if config.database_statement_timeout_ms > 0:
+        server_settings["statement_timeout"] = str(config.database_statement_timeout_ms)
+
+    return {
+        "host": config.database_host,
+        "port": config.database_port,
+        "user": config.database_user,
+        "password": config.database_password,
+        "database": config.database_name,
+        "minsize": config.database_pool_min_size,
+        "maxsize": config.database_pool_max_size,
+        "max_queries": config.database_pool_max_queries,
+        "max_inactive_connection_lifetime": config.database_pool_max_inactive_connection_lifetime,
+        "timeout": config.database_connect_timeout_seconds,
+        "command_timeout": config.database_command_timeout_seconds,
+        "statement_cache_size": config.database_statement_cache_size,
+        "max_cached_statement_lifetime": config.database_max_cached_statement_lifetime,
+        "max_cacheable_statement_size": config.database_max_cacheable_statement_size,
+        "server_settings": server_settings,
+    }
+
+
+def build_tortoise_config(config: Settings) -> dict[str, Any]:
+    """
+    根据配置生成 Tortoise 配置, 配置了只读副本时同时注册副本连接与读写分离路由
+
+    Args:
+        config (Settings): 配置
+
+    Returns:
+        dict[str, Any]: Tortoise 配置
+    """
+
+    credentials = build_credentials(config)
+    tortoise_config: dict[str, Any] = {
+        "connections": {
+            "user_center_conn": {
+                "engine": "tortoise.backends.asyncpg",
+                "credentials": credentials,
             }
+        },
+        "apps": {
+            "user_center_app": {
+                "models": MODELS,
+                "default_connection": "user_center_conn"
+            }
+        },
+        "use_tz": False,
+        "timezone": "Asia/Shanghai"
+    }
+
+    replica_names = replica_connection_names(config)
+    for name, replica_host in zip(replica_names, config.database_replica_hosts):
+        host, _, port = replica_host.partition(":")
+        tortoise_config["connections"][name] = {
+            "engine": "tortoise.backends.asyncpg",
+            "credentials": {**credentials, "host": host, "port": int(port) if port else config.database_port},
         }
-    },
-    "apps": {
-        "user_center_app": {
-            "models": MODELS,
-            "default_connection": "user_center_conn"
-        }
-    },
-    "use_tz": False,
-    "timezone": "Asia/Shanghai"
-}
+    if replica_names:
+        tortoise_config["routers"] = ["src.app.core.db_router.ReplicaRouter"]
+
+    return tortoise_config
+
+
+# 数据库连接配置
+TORTOISE_ORM = build_tortoise_config(settings)
 
 
 @asynccontextmanager
-async def register_postgres(app: FastAPI) -> AsyncGenerator[None, None]:
+async def register_postgres(app: FastAPI, config: Settings = settings) -> AsyncGenerator[None, None]:
     """
-    连接数据库, 生成数据表
+    按配置连接数据库, 开启 database_generate_schemas 时生成缺失的数据表
 
     Args:
         app (FastAPI): 网络实例
+        config (Settings): 配置
 
     Yields:
         None: 无返回
@@ -51,7 +115,70 @@ async def register_postgres(app: FastAPI) -> AsyncGenerator[None, None]:
 
     async with RegisterTortoise(
             app,
-            config=TORTOISE_ORM,
-            generate_schemas=True,
+            config=build_tortoise_config(config),
+            generate_schemas=config.database_generate_schemas,
     ):
         yield
+
+
+def _pool_waiters(pool: Any) -> int:
+    """
+    等待获取连接的协程数量
+
+    asyncpg 未公开该数值, 从连接池内部的空闲连接队列读取, 读取失败时返回 0
+    """
+
+    getters = getattr(getattr(pool, "_queue", None), "_getters", None)
+    if not getters:
+        return 0
+    return sum(not getter.done() for getter in getters)
+
+
+def get_pool_stats() -> dict[str, dict[str, int]]:
+    """
+    已建立连接池的数据库连接的使用情况, 不带连接池的后端(如 SQLite)不返回
+
+    Returns:
+        dict[str, dict[str, int]]: 连接名 -> size(已建立连接数)、idle(空闲)、in_use(使用中)、
+            waiters(等待获取连接)、min_size、max_size
+    """
+
+    try:
+        clients = connections.all()
+    except ConfigurationError:
+        # 数据库尚未初始化
+        return {}
+
+    stats = {}
+    for client in clients:
+        pool = getattr(client, "_pool", None)
+        if pool is None or not hasattr(pool, "get_size"):
+            continue
+        size = pool.get_size()
+        idle = pool.get_idle_size()
+        stats[client.connection_name] = {
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "waiters": _pool_waiters(pool),
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+        }
+    return stats
+
+
+def get_pool_saturation(connection_name: str) -> float:
+    """
+    连接池饱和度: (使用中 + 等待中) / 上限, 大于 1 表示存在排队
+
+    Args:
+        connection_name (str): 连接名
+
+    Returns:
+        float: 饱和度, 连接不存在或没有连接池时为 0
+    """
+
+    stats = get_pool_stats().get(connection_name)
+    if stats is None or not stats["max_size"]:
+        return 0.0
+    return (stats["in_use"] + stats["waiters"]) / stats["max_size"]
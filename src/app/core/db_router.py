@@ -0,0 +1,209 @@
+import functools
+import inspect
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any
+
+from tortoise.backends.base.client import TransactionalDBClient
+
+from src.app.utils import TTLLRUCache
+from .config import Settings, settings
+
+# 当前上下文是否处于只读服务方法中
+_replica_read: ContextVar[bool] = ContextVar("replica_read", default=False)
+# 读己之写的一致性键(如当前登录用户), 该键写入后的窗口期内读取走主库
+_consistency_key: ContextVar[str | None] = ContextVar("consistency_key", default=None)
+
+
+def replica_connection_names(config: Settings) -> list[str]:
+    """
+    只读副本的连接名, 与副本主机配置一一对应
+
+    Args:
+        config (Settings): 配置
+
+    Returns:
+        list[str]: 连接名
+    """
+
+    return [f"user_center_replica_{index}" for index in range(len(config.database_replica_hosts))]
+
+
+class ReplicaRouting:
+    """
+    读写分离路由状态: 只读服务方法中的读取按轮询分配到副本, 以下情况走主库:
+
+    - 未标记为只读的调用(写操作及写前查询)
+    - 事务内的读取(与事务内的写入使用同一连接)
+    - 一致性键在窗口期内有过写入(读己之写)
+
+    写入记录在进程内, 多进程部署时其他进程不感知, 读取不到刚写入数据的调用方需自行回退主库
+    """
+
+    def __init__(self, replicas: list[str], read_your_writes_window: float, max_keys: int) -> None:
+        """
+        Args:
+            replicas (list[str]): 副本连接名, 为空时全部读取走主库
+            read_your_writes_window (float): 写入后读取走主库的秒数
+            max_keys (int): 记录写入的一致性键数量上限
+        """
+
+        self.replicas = replicas
+        self._recent_writes: TTLLRUCache[str, bool] = TTLLRUCache(max_keys, ttl=read_your_writes_window)
+        self._next = 0
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        """是否配置了副本"""
+        return bool(self.replicas)
+
+    def db_for_read(self, model: Any) -> str | None:
+        """
+        选择读取连接
+
+        Args:
+            model (Any): 模型类
+
+        Returns:
+            str | None: 副本连接名, 为空时使用模型默认连接(主库或当前事务)
+        """
+
+        if not self.replicas or not _replica_read.get():
+            return None
+
+        key = _consistency_key.get()
+        if isinstance(model._meta.db, TransactionalDBClient) or (
+                key is not None and self._recent_writes.get(key) is not None
+        ):
+            self.primary_reads += 1
+            return None
+
+        self.replica_reads += 1
+        self._next = (self._next + 1) % len(self.replicas)
+        return self.replicas[self._next]
+
+    def db_for_write(self, model: Any) -> None:
+        """
+        记录一致性键的写入, 写入始终使用模型默认连接
+
+        Args:
+            model (Any): 模型类
+        """
+
+        key = _consistency_key.get()
+        if key is not None:
+            self._recent_writes.set(key, True)
+
+    def stats(self) -> dict[str, int]:
+        """
+        路由统计
+
+        Returns:
+            dict[str, int]: 副本数量、只读调用中读取副本与走主库的次数
+        """
+
+        return {
+            "replicas": len(self.replicas),
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "recent_writers": len(self._recent_writes),
+        }
+
+
+@lru_cache()
+def get_replica_routing() -> ReplicaRouting:
+    """
+    获取读写分离路由状态(进程内单例)
+
+    Returns:
+        ReplicaRouting: 路由状态
+    """
+
+    return ReplicaRouting(
+        replicas=replica_connection_names(settings),
+        read_your_writes_window=settings.database_read_your_writes_seconds,
+        max_keys=settings.database_read_your_writes_max_keys,
+    )
+
+
+class ReplicaRouter:
+    """
+    Tortoise 数据库路由, 由 Tortoise 实例化, 路由决策委托给 ReplicaRouting 单例
+    """
+
+    def db_for_read(self, model: Any) -> str | None:
+        return get_replica_routing().db_for_read(model)
+
+    def db_for_write(self, model: Any) -> None:
+        return get_replica_routing().db_for_write(model)
+
+
+def set_consistency_key(key: str | None) -> None:
+    """
+    设置当前请求的读己之写一致性键, 之后的写入使该键在窗口期内读取主库
+
+    Args:
+        key (str | None): 一致性键, 如 user:<用户ID>、account:<账号>
+    """
+
+    _consistency_key.set(key)
+
+
+@contextmanager
+def read_primary() -> Iterator[None]:
+    """
+    在只读服务方法中临时读取主库, 用于副本延迟导致的未命中回退
+    """
+
+    token = _replica_read.set(False)
+    try:
+        yield
+    finally:
+        _replica_read.reset(token)
+
+
+def replica_read[F: Callable](func: F) -> F:
+    """
+    将服务方法标记为只读, 方法内的查询可路由到副本, 支持协程函数与异步生成器函数
+
+    异步生成器每次迭代单独设置只读标记, 迭代可以发生在不同的上下文中(如流式响应)
+
+    Args:
+        func (F): 服务方法
+
+    Returns:
+        F: 包装后的方法
+    """
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def generator_wrapper(*args, **kwargs) -> AsyncIterator:
+            iterator = func(*args, **kwargs)
+            try:
+                while True:
+                    token = _replica_read.set(True)
+                    try:
+                        item = await anext(iterator)
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        _replica_read.reset(token)
+                    yield item
+            finally:
+                await iterator.aclose()
+
+        return generator_wrapper
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _replica_read.set(True)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _replica_read.reset(token)
+
+    return wrapper
@@ -0,0 +1,53 @@
+from functools import lru_cache
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
+
+from .config import settings
+
+
+class RedisClient(Protocol):
+    """
+    项目使用到的 Redis 协议命令子集, redis.asyncio.Redis 及测试用替身均满足该协议
+    """
+
+    async def get(self, name: str) -> Any: ...
+
+    async def set(self, name: str, value: Any, ex: int | None = None) -> Any: ...
+
+    async def delete(self, *names: str) -> int: ...
+
+    async def expire(self, name: str, time: int) -> bool: ...
+
+    async def incr(self, name: str, amount: int = 1) -> int: ...
+
+    def scan_iter(self, match: str | None = None, count: int | None = None) -> AsyncIterator[Any]: ...
+
+    async def publish(self, channel: str, message: Any) -> int: ...
+
+    def pubsub(self) -> Any: ...
+
+
+@lru_cache()
+def get_redis_client() -> RedisClient:
+    """
+    按配置创建 Redis 客户端(进程内单例)
+
+    Returns:
+        RedisClient: redis.asyncio 客户端
+
+    Raises:
+        RuntimeError: 未安装 redis 依赖
+    """
+
+    try:
+        from redis.asyncio import Redis
+    except ImportError as e:
+        raise RuntimeError("使用 Redis 后端需要安装 redis 依赖: pip install 'user-center-backend[redis]'") from e
+
+    return Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        password=settings.redis_password,
+        decode_responses=True,
+    )
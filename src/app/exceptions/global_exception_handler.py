@@ -3,13 +3,15 @@ from fastapi.exceptions import ValidationException, RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from src.app.common import StatusCode, HTTPResponseUtils
+from src.app.metrics import get_app_metrics, route_label
 from .business_exception import BusinessException
 
 
 def mount_exception_handler(app: FastAPI):
     @app.exception_handler(BusinessException)
-    async def business_exception_handler(_: Request, exc: BusinessException):
-        return HTTPResponseUtils.error(exc.code, exc.message, exc.description)
+    async def business_exception_handler(request: Request, exc: BusinessException):
+        get_app_metrics().observe_business_error(route_label(request.scope), exc.code)
+        return HTTPResponseUtils.error(exc.code, exc.message, exc.description, cache=True)
 
     @app.exception_handler(Exception)
     async def system_exception_handler(_: Request, exc: Exception):
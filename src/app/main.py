@@ -1,5 +1,7 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any
 
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
@@ -7,9 +9,21 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from src.app.routers import api_routers
-from src.app.core import register_postgres
+from src.app.auth import get_password_hasher
+from src.app.cache import get_user_cache
+from src.app.metrics import (
+    MetricsMiddleware,
+    QueryTimingMiddleware,
+    add_query_observer,
+    get_app_metrics,
+    instrument_tortoise,
+    observe_request_query,
+)
+from src.app.routers import api_routers, metrics_router
+from src.app.core import register_postgres, settings
+from src.app.core.config import Settings
 from src.app.exceptions import mount_exception_handler
+from src.app.services import get_account_filter, get_audit_log_writer, get_user_purge_job, get_username_index
 from tortoise import generate_config, Tortoise
 from tortoise.contrib.fastapi import RegisterTortoise
 
@@ -18,7 +32,7 @@ from tortoise.contrib.fastapi import RegisterTortoise
 async def lifespan_test(web_app: FastAPI) -> AsyncGenerator[None, None]:
     config = generate_config(
         "sqlite://:memory:",
-        app_modules={"models": ["src.app.models.users"]},
+        app_modules={"models": ["src.app.models.users", "src.app.models.audit_log"]},
         testing=True,
         connection_label="models",
     )
@@ -36,33 +50,127 @@ async def lifespan_test(web_app: FastAPI) -> AsyncGenerator[None, None]:
 
 
 @asynccontextmanager
-async def app_lifespan(web_app: FastAPI) -> AsyncGenerator[None, None]:
+async def register_database(web_app: FastAPI, config: Settings) -> AsyncGenerator[None, None]:
     if getattr(web_app.state, "testing", None):
         async with lifespan_test(web_app):
             yield
     else:
-        async with register_postgres(web_app):
+        async with register_postgres(web_app, config):
             yield
 
 
-app = FastAPI(lifespan=app_lifespan)
-app.add_middleware(
-    SessionMiddleware,
-    secret_key="your-secret-key-keep-it-safe",  # 替换为你的实际密钥
-    same_site="None; Secure",
-)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:8080", "http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-app.mount("/static", StaticFiles(directory="static"), "static")
-mount_exception_handler(app)
-app.include_router(api_routers)
+@asynccontextmanager
+async def app_lifespan(web_app: FastAPI) -> AsyncGenerator[None, None]:
+    config: Settings = web_app.state.config
+    try:
+        async with register_database(web_app, config):
+            # 不支持 pg_trgm 的数据库在启动时构建用户名搜索索引
+            username_index = get_username_index()
+            username_index.reset()
+            if username_index.is_supported():
+                await username_index.build()
+
+            # 构建账号布隆过滤器(存在快照时后台重建)
+            account_filter = get_account_filter()
+            account_filter.reset()
+            if config.account_filter_enabled:
+                await account_filter.start()
+
+            # 定时清理超过保留期的已删除用户
+            user_purge_job = get_user_purge_job()
+            await user_purge_job.start()
+
+            # 批量写入审计日志
+            audit_log_writer = get_audit_log_writer()
+            await audit_log_writer.start()
+
+            # 接收其他工作进程的缓存失效广播
+            user_cache = get_user_cache()
+            await user_cache.start()
+            try:
+                yield
+            finally:
+                await user_cache.stop()
+                # 在关闭数据库连接前写入剩余的审计日志
+                await audit_log_writer.stop()
+                await user_purge_job.stop()
+                await account_filter.stop()
+    finally:
+        # 关闭密码哈希进程池
+        get_password_hasher().shutdown()
 
 
-@app.get("/", include_in_schema=False)
 async def root():
     return RedirectResponse(url="/docs")
+
+
+def create_app(config: Settings = settings) -> FastAPI:
+    """
+    创建应用实例, 注册中间件、异常处理与路由; 数据库连接与后台任务在 lifespan 中启动
+
+    中间件、路由与数据库连接使用传入的配置; 缓存、限流器等进程内单例在首次使用时按全局配置创建
+
+    Args:
+        config (Settings): 配置
+
+    Returns:
+        FastAPI: 应用实例
+    """
+
+    web_app = FastAPI(lifespan=app_lifespan)
+    web_app.state.config = config
+    web_app.add_middleware(
+        SessionMiddleware,
+        secret_key=config.session_secret_key,
+        max_age=config.session_ttl_seconds,
+        same_site="None; Secure",
+    )
+    web_app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:8080", "http://localhost:3000"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if config.query_timing_enabled:
+        web_app.add_middleware(
+            QueryTimingMiddleware,
+            metrics=get_app_metrics(),
+            repeat_threshold=config.query_repeat_threshold,
+            debug=config.query_debug,
+            slow_threshold=config.query_slow_threshold_ms / 1000,
+        )
+        instrument_tortoise()
+        add_query_observer(observe_request_query)
+    if config.metrics_enabled:
+        # 最外层记录请求指标, 包含会话与跨域中间件的耗时
+        web_app.add_middleware(MetricsMiddleware)
+        instrument_tortoise()
+        add_query_observer(get_app_metrics().observe_query)
+        web_app.include_router(metrics_router)
+    web_app.mount("/static", StaticFiles(directory="static"), "static")
+    mount_exception_handler(web_app)
+    web_app.include_router(api_routers)
+    web_app.add_api_route("/", root, include_in_schema=False)
+
+    return web_app
+
+
+@lru_cache()
+def get_app() -> FastAPI:
+    """
+    获取默认配置的应用实例(进程内单例)
+
+    Returns:
+        FastAPI: 应用实例
+    """
+
+    return create_app()
+
+
+def __getattr__(name: str) -> Any:
+    # 兼容 uvicorn src.app.main:app 启动方式, 首次访问时才创建应用;
+    # 推荐使用 uvicorn --factory src.app.main:create_app
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
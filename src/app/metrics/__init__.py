@@ -0,0 +1,24 @@
+from .app_metrics import AppMetrics, get_app_metrics
+from .db import add_query_observer, instrument_tortoise, query_operation, remove_query_observer
+from .middleware import MetricsMiddleware, route_label
+from .query_tracker import QueryTimingMiddleware, RequestQueries, current_queries, observe_request_query
+from .registry import Counter, Gauge, Histogram, MetricsRegistry
+
+__all__ = [
+    "AppMetrics",
+    "get_app_metrics",
+    "MetricsMiddleware",
+    "route_label",
+    "MetricsRegistry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "instrument_tortoise",
+    "add_query_observer",
+    "remove_query_observer",
+    "query_operation",
+    "QueryTimingMiddleware",
+    "RequestQueries",
+    "current_queries",
+    "observe_request_query",
+]
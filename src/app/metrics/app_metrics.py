@@ -0,0 +1,162 @@
+from functools import lru_cache
+
+from .db import query_operation
+from .registry import MetricsRegistry
+
+# 未匹配到路由的请求统一使用该标签, 避免任意路径造成标签基数膨胀
+UNMATCHED_ROUTE = "unmatched"
+
+
+class AppMetrics:
+    """
+    应用指标: HTTP 请求、业务异常、SQL 执行与连接池, 以及各子系统运行统计
+
+    请求与 SQL 指标在热路径上直接更新; 连接池与子系统统计在抓取时写入
+    """
+
+    def __init__(self) -> None:
+        registry = MetricsRegistry("user_center")
+        self.registry = registry
+        self.http_requests = registry.counter(
+            "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status"),
+        )
+        self.http_request_duration = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route"),
+        )
+        self.http_requests_in_progress = registry.gauge(
+            "http_requests_in_progress", "HTTP requests currently being handled.",
+        )
+        self.business_errors = registry.counter(
+            "business_errors_total", "BusinessException responses by route and error code.", ("route", "code"),
+        )
+        self.db_queries = registry.counter(
+            "db_queries_total", "SQL statements executed by operation.", ("operation",),
+        )
+        self.db_query_duration = registry.histogram(
+            "db_query_duration_seconds", "SQL statement latency in seconds.", ("operation",),
+        )
+        self.db_queries_per_request = registry.histogram(
+            "db_queries_per_request", "SQL statements executed per HTTP request.", ("route",),
+            buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+        )
+        self.db_repeated_query_requests = registry.counter(
+            "db_repeated_query_requests_total",
+            "HTTP requests that executed an identical statement repeatedly (possible N+1).",
+            ("route",),
+        )
+        self.db_pool_connections = registry.gauge(
+            "db_pool_connections", "Database pool connections by state.", ("connection", "state"),
+        )
+        self.component_stats = registry.gauge(
+            "component_stats", "Runtime counters reported by application components.", ("component", "stat"),
+        )
+
+    def observe_request(self, method: str, route: str, status: int, elapsed: float) -> None:
+        """
+        记录一次 HTTP 请求
+
+        Args:
+            method (str): 请求方法
+            route (str): 路由模板
+            status (int): 响应状态码
+            elapsed (float): 耗时秒数
+        """
+
+        self.http_requests.inc((method, route, str(status)))
+        self.http_request_duration.observe(elapsed, (method, route))
+
+    def observe_business_error(self, route: str, code: int) -> None:
+        """
+        记录一次业务异常
+
+        Args:
+            route (str): 路由模板
+            code (int): 业务错误码
+        """
+
+        self.business_errors.inc((route, str(code)))
+
+    def observe_query(self, query: str, elapsed: float) -> None:
+        """
+        记录一条 SQL 语句, 作为 SQL 执行观察函数注册
+
+        Args:
+            query (str): SQL 语句
+            elapsed (float): 耗时秒数
+        """
+
+        labels = (query_operation(query),)
+        self.db_queries.inc(labels)
+        self.db_query_duration.observe(elapsed, labels)
+
+    def observe_request_queries(self, route: str, count: int) -> None:
+        """
+        记录单个请求执行的 SQL 语句数
+
+        Args:
+            route (str): 路由模板
+            count (int): 语句数
+        """
+
+        self.db_queries_per_request.observe(count, (route,))
+
+    def observe_repeated_queries(self, route: str) -> None:
+        """
+        记录一次存在重复语句的请求
+
+        Args:
+            route (str): 路由模板
+        """
+
+        self.db_repeated_query_requests.inc((route,))
+
+    def set_pool_stats(self, pools: dict[str, dict[str, int]]) -> None:
+        """
+        写入连接池使用情况
+
+        Args:
+            pools (dict[str, dict[str, int]]): 连接名 -> 各状态的连接数
+        """
+
+        self.db_pool_connections.clear()
+        for connection, stats in pools.items():
+            for state, value in stats.items():
+                self.db_pool_connections.set(value, (connection, state))
+
+    def set_component_stats(self, component: str, stats: dict[str, int | float]) -> None:
+        """
+        写入子系统运行统计
+
+        Args:
+            component (str): 子系统名
+            stats (dict[str, int | float]): 统计项
+        """
+
+        for stat, value in stats.items():
+            self.component_stats.set(value, (component, stat))
+
+    def render(self) -> str:
+        """
+        输出 Prometheus 文本格式
+
+        Returns:
+            str: 指标文本
+        """
+
+        return self.registry.render()
+
+    def clear(self) -> None:
+        """清空所有样本"""
+        self.registry.clear()
+
+
+@lru_cache()
+def get_app_metrics() -> AppMetrics:
+    """
+    获取应用指标(进程内单例)
+
+    Returns:
+        AppMetrics: 应用指标
+    """
+
+    return AppMetrics()
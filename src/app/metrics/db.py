@@ -0,0 +1,105 @@
+import functools
+import importlib
+import time
+from collections.abc import Callable
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+# 观察函数: (SQL 语句, 耗时秒数)
+type QueryObserver = Callable[[str, float], None]
+
+# Tortoise 客户端中实际执行 SQL 的方法, 各后端及其事务包装类分别实现
+_EXECUTE_METHODS = ("execute_insert", "execute_query", "execute_query_dict", "execute_many", "execute_script")
+# 需要插桩的后端模块, 未安装的后端跳过
+_BACKEND_MODULES = ("tortoise.backends.sqlite.client", "tortoise.backends.asyncpg.client")
+
+_observers: list[QueryObserver] = []
+
+_OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+
+def query_operation(query: str) -> str:
+    """
+    SQL 语句的操作类型
+
+    Args:
+        query (str): SQL 语句
+
+    Returns:
+        str: SELECT / INSERT / UPDATE / DELETE, 其他语句为 OTHER
+    """
+
+    operation = query[:6].upper()
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """
+    注册 SQL 执行观察函数, 每条语句执行结束(包括失败)后按注册顺序调用
+
+    Args:
+        observer (QueryObserver): 观察函数
+    """
+
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_query_observer(observer: QueryObserver) -> None:
+    """
+    移除 SQL 执行观察函数
+
+    Args:
+        observer (QueryObserver): 观察函数
+    """
+
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def _instrument[F: Callable](method: F) -> F:
+    """包装执行方法, 结束后通知观察函数"""
+
+    @functools.wraps(method)
+    async def wrapper(self, query: str, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(self, query, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            for observer in _observers:
+                observer(query, elapsed)
+
+    wrapper.__query_instrumented__ = True
+    return wrapper
+
+
+def _subclasses(cls: type) -> list[type]:
+    """递归获取所有子类"""
+    result = []
+    for subclass in cls.__subclasses__():
+        result.append(subclass)
+        result.extend(_subclasses(subclass))
+    return result
+
+
+def instrument_tortoise() -> None:
+    """
+    为 Tortoise 数据库客户端插桩, 可重复调用
+
+    只包装类自身定义的执行方法, 继承的方法已在父类包装, 避免同一语句被重复计时
+    """
+
+    for module in _BACKEND_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+
+    for cls in _subclasses(BaseDBAsyncClient):
+        for name in _EXECUTE_METHODS:
+            method = cls.__dict__.get(name)
+            if method is None or getattr(method, "__query_instrumented__", False):
+                continue
+            setattr(cls, name, _instrument(method))
+
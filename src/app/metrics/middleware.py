@@ -0,0 +1,68 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .app_metrics import UNMATCHED_ROUTE, AppMetrics, get_app_metrics
+
+
+def route_label(scope: Scope) -> str:
+    """
+    请求匹配到的路由模板, 路由匹配后由路由器写入 scope
+
+    Args:
+        scope (Scope): ASGI scope
+
+    Returns:
+        str: 路由模板, 未匹配时为 unmatched
+    """
+
+    route = scope.get("route")
+    return route.path if route is not None else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    记录 HTTP 请求数量、状态码与延迟的 ASGI 中间件
+
+    直接实现 ASGI 接口而非 BaseHTTPMiddleware, 每个请求只增加一次计时与几次字典更新;
+    路由标签使用路由模板, 未被处理的异常按 500 记录
+    """
+
+    def __init__(self, app: ASGIApp, metrics: AppMetrics | None = None) -> None:
+        """
+        Args:
+            app (ASGIApp): 下游应用
+            metrics (AppMetrics | None): 应用指标, 为空时使用进程内单例
+        """
+
+        self.app = app
+        self.metrics = metrics or get_app_metrics()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        in_progress = metrics.http_requests_in_progress
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.inc(amount=-1)
+            route = scope.get("route")
+            if route is None:
+                # 未匹配路由时方法同样可能是任意值
+                metrics.observe_request("", UNMATCHED_ROUTE, status, elapsed)
+            else:
+                metrics.observe_request(scope["method"], route.path, status, elapsed)
@@ -0,0 +1,158 @@
+import logging
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .app_metrics import UNMATCHED_ROUTE, AppMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueries:
+    """
+    单个请求内执行的 SQL 统计: 语句数、总耗时与相同语句的执行次数
+
+    参数化语句的文本不含参数值, 同一语句重复执行多次通常意味着循环内逐条查询(N+1)
+    """
+
+    __slots__ = ("count", "duration", "statements", "slow_threshold")
+
+    def __init__(self, slow_threshold: float | None = None) -> None:
+        """
+        Args:
+            slow_threshold (float | None): 慢查询阈值(秒), 为空时不记录慢查询日志
+        """
+
+        self.count = 0
+        self.duration = 0.0
+        self.statements: dict[str, int] = {}
+        self.slow_threshold = slow_threshold
+
+    def record(self, query: str, elapsed: float) -> None:
+        """
+        记录一条语句
+
+        Args:
+            query (str): SQL 语句
+            elapsed (float): 耗时秒数
+        """
+
+        self.count += 1
+        self.duration += elapsed
+        statements = self.statements
+        statements[query] = statements.get(query, 0) + 1
+        if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+            logger.warning("慢查询 %.1f ms: %s", elapsed * 1e3, query)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """
+        执行次数达到阈值的语句
+
+        Args:
+            threshold (int): 次数阈值
+
+        Returns:
+            dict[str, int]: 语句 -> 执行次数
+        """
+
+        return {query: count for query, count in self.statements.items() if count >= threshold}
+
+
+_current_queries: ContextVar[RequestQueries | None] = ContextVar("current_queries", default=None)
+
+
+def current_queries() -> RequestQueries | None:
+    """
+    当前请求的 SQL 统计
+
+    Returns:
+        RequestQueries | None: 请求外(如后台任务启动前)为空
+    """
+
+    return _current_queries.get()
+
+
+def observe_request_query(query: str, elapsed: float) -> None:
+    """
+    SQL 执行观察函数, 记录到当前请求的统计中
+
+    Args:
+        query (str): SQL 语句
+        elapsed (float): 耗时秒数
+    """
+
+    queries = _current_queries.get()
+    if queries is not None:
+        queries.record(query, elapsed)
+
+
+class QueryTimingMiddleware:
+    """
+    统计每个请求执行的 SQL 并通过 Server-Timing 响应头返回的 ASGI 中间件
+
+    响应头格式为 db;dur=<总耗时毫秒>;desc="<语句数> queries", 存在重复执行的语句时追加
+    db-repeated;desc="<重复语句数> statements x<最大次数>"。统计对象通过 ContextVar 在请求内传递,
+    需配合 observe_request_query 观察函数使用; 响应头发送后执行的语句不计入响应头
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            metrics: AppMetrics,
+            repeat_threshold: int = 5,
+            debug: bool = False,
+            slow_threshold: float = 0.1,
+    ) -> None:
+        """
+        Args:
+            app (ASGIApp): 下游应用
+            metrics (AppMetrics): 应用指标
+            repeat_threshold (int): 同一语句在单个请求内执行达到该次数时标记为重复
+            debug (bool): 调试模式, 记录慢查询与重复语句日志
+            slow_threshold (float): 调试模式下的慢查询阈值(秒)
+        """
+
+        self.app = app
+        self.metrics = metrics
+        self.repeat_threshold = repeat_threshold
+        self.debug = debug
+        self.slow_threshold = slow_threshold if debug else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(self.slow_threshold)
+        token = _current_queries.set(queries)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                header = (b"server-timing", self._server_timing(scope, queries).encode("latin-1"))
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_queries.reset(token)
+
+    def _server_timing(self, scope: Scope, queries: RequestQueries) -> str:
+        """生成 Server-Timing 响应头并记录请求级指标"""
+        route = scope.get("route")
+        route_path = route.path if route is not None else UNMATCHED_ROUTE
+        self.metrics.observe_request_queries(route_path, queries.count)
+
+        value = f'db;dur={queries.duration * 1e3:.3f};desc="{queries.count} queries"'
+        if queries.count < self.repeat_threshold:
+            return value
+        repeated = queries.repeated(self.repeat_threshold)
+        if not repeated:
+            return value
+
+        self.metrics.observe_repeated_queries(route_path)
+        if self.debug:
+            for query, count in repeated.items():
+                logger.warning("%s %s 重复执行 %d 次: %s", scope["method"], route_path, count, query)
+        return f'{value}, db-repeated;desc="{len(repeated)} statements x{max(repeated.values())}"'
+
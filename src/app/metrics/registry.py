@@ -0,0 +1,295 @@
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+
+type LabelValues = tuple[str, ...]
+
+# 默认延迟分桶(秒), 覆盖进程内亚毫秒级请求到秒级慢请求
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    """转义标签值中的反斜杠、双引号与换行"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """格式化标签, 无标签时返回空字符串"""
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    """格式化样本值, 整数值不带小数部分"""
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """
+    指标基类: 按标签值元组保存样本, 调用方按 label_names 顺序传入标签值
+
+    指标只在事件循环线程中更新, 不加锁
+    """
+
+    __slots__ = ("name", "documentation", "label_names", "_values")
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        """
+        Args:
+            name (str): 指标名
+            documentation (str): 指标说明
+            label_names (Sequence[str]): 标签名
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: dict = {}
+
+    def clear(self) -> None:
+        """清空样本"""
+        self._values.clear()
+
+    def samples(self) -> Iterator[str]:
+        """按文本格式逐行输出样本"""
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+    def collect(self) -> Iterator[str]:
+        """输出 HELP、TYPE 与样本行"""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self.samples()
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    __slots__ = ()
+
+    type_name = "counter"
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        """
+        增加计数
+
+        Args:
+            labels (LabelValues): 标签值
+            amount (float): 增量
+        """
+
+        values = self._values
+        values[labels] = values.get(labels, 0) + amount
+
+    def get(self, labels: LabelValues = ()) -> float:
+        """读取计数, 不存在时为 0"""
+        return self._values.get(labels, 0)
+
+
+class Gauge(_Metric):
+    """可增可减的瞬时值"""
+
+    __slots__ = ()
+
+    type_name = "gauge"
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        """
+        设置当前值
+
+        Args:
+            value (float): 当前值
+            labels (LabelValues): 标签值
+        """
+
+        self._values[labels] = value
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        """
+        增加当前值, amount 为负数时减少
+
+        Args:
+            labels (LabelValues): 标签值
+            amount (float): 增量
+        """
+
+        values = self._values
+        values[labels] = values.get(labels, 0) + amount
+
+    def get(self, labels: LabelValues = ()) -> float:
+        """读取当前值, 不存在时为 0"""
+        return self._values.get(labels, 0)
+
+
+class Histogram(_Metric):
+    """
+    分桶直方图: 每组标签保存各桶的非累计计数、总和与总数, 输出时再累加为 Prometheus 的累计分桶
+    """
+
+    __slots__ = ("buckets",)
+
+    type_name = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        Args:
+            name (str): 指标名
+            documentation (str): 指标说明
+            label_names (Sequence[str]): 标签名
+            buckets (Sequence[float]): 递增的分桶上界, 不含 +Inf
+        """
+
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        """
+        记录一次观测
+
+        Args:
+            value (float): 观测值
+            labels (LabelValues): 标签值
+        """
+
+        state = self._values.get(labels)
+        if state is None:
+            # [各桶计数(最后一个为 +Inf), 总和, 总数]
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        # 分桶上界包含等于的值
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def get(self, labels: LabelValues = ()) -> tuple[int, float]:
+        """
+        读取观测次数与总和
+
+        Returns:
+            tuple[int, float]: (观测次数, 观测值总和), 不存在时为 (0, 0.0)
+        """
+
+        state = self._values.get(labels)
+        if state is None:
+            return 0, 0.0
+        return state[2], state[1]
+
+    def samples(self) -> Iterator[str]:
+        label_names = (*self.label_names, "le")
+        bounds = (*map(_format_value, self.buckets), "+Inf")
+        for labels, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels(label_names, (*labels, bound))} {cumulative}"
+            label_text = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {count}"
+
+
+class MetricsRegistry:
+    """
+    指标注册表, 按注册顺序输出 Prometheus 文本格式(0.0.4)
+    """
+
+    def __init__(self, namespace: str = "") -> None:
+        """
+        Args:
+            namespace (str): 指标名前缀, 非空时与指标名以下划线连接
+        """
+
+        self._namespace = namespace
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register[M: _Metric](self, metric: M) -> M:
+        """注册指标, 同名指标已存在时返回已有指标"""
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                raise ValueError(f"metric {metric.name} already registered with a different definition")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _full_name(self, name: str) -> str:
+        return f"{self._namespace}_{name}" if self._namespace else name
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """
+        注册计数器
+
+        Args:
+            name (str): 指标名(不含前缀)
+            documentation (str): 指标说明
+            label_names (Sequence[str]): 标签名
+
+        Returns:
+            Counter: 计数器
+        """
+
+        return self._register(Counter(self._full_name(name), documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        """
+        注册瞬时值
+
+        Args:
+            name (str): 指标名(不含前缀)
+            documentation (str): 指标说明
+            label_names (Sequence[str]): 标签名
+
+        Returns:
+            Gauge: 瞬时值
+        """
+
+        return self._register(Gauge(self._full_name(name), documentation, label_names))
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        注册直方图
+
+        Args:
+            name (str): 指标名(不含前缀)
+            documentation (str): 指标说明
+            label_names (Sequence[str]): 标签名
+            buckets (Sequence[float]): 分桶上界
+
+        Returns:
+            Histogram: 直方图
+        """
+
+        return self._register(Histogram(self._full_name(name), documentation, label_names, buckets))
+
+    def clear(self) -> None:
+        """清空所有指标的样本, 指标定义保留"""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        """
+        输出所有指标
+
+        Returns:
+            str: Prometheus 文本格式
+        """
+
+        lines = [line for metric in self._metrics.values() for line in metric.collect()]
+        lines.append("")
+        return "\n".join(lines)
@@ -1,3 +1,5 @@
+from .audit_log import AuditEvent, AuditLog
+from .base import SoftDeleteManager, SoftDeleteQuerySet
 from .users import Users
 
-__all__ = ["Users"]
+__all__ = ["Users", "SoftDeleteManager", "SoftDeleteQuerySet", "AuditLog", "AuditEvent"]
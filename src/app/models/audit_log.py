@@ -0,0 +1,52 @@
+from enum import StrEnum
+
+from tortoise import fields
+from tortoise.indexes import Index
+from tortoise.models import Model
+
+
+class AuditEvent(StrEnum):
+    """
+    审计事件类型
+    """
+
+    REGISTER = "register"
+    LOGIN_SUCCESS = "login_success"
+    LOGIN_FAILURE = "login_failure"
+    LOGOUT = "logout"
+    ADMIN_DELETE = "admin_delete"
+
+
+class AuditLog(Model):
+    """
+    审计日志映射类, 只追加不修改
+
+    Attributes:
+        event (AuditEvent): 事件类型
+        user_id (int): 事件涉及的用户ID(登录失败等无法确定用户时为空)
+        user_account (str): 事件涉及的用户账号
+        operator_id (int): 操作人ID(管理员操作时为管理员ID)
+        ip (str): 客户端IP
+        detail (str): 事件详情(如登录失败原因、批量删除的用户数量)
+        create_time (datetime): 事件发生时间(而非写入时间)
+    """
+
+    id = fields.BigIntField(primary_key=True)
+    event = fields.CharEnumField(AuditEvent, max_length=32, description="事件类型")
+    user_id = fields.IntField(null=True, description="用户ID")
+    user_account = fields.CharField(max_length=256, null=True, description="用户账号")
+    operator_id = fields.IntField(null=True, description="操作人ID")
+    ip = fields.CharField(max_length=64, null=True, description="客户端IP")
+    detail = fields.CharField(max_length=256, null=True, description="事件详情")
+    create_time = fields.DatetimeField(null=False, description="事件时间")
+
+    class Meta:
+        table = "audit_log"
+        table_description = "审计日志表"
+        # 与迁移 6_20261018150000_update 保持一致
+        indexes = (
+            # 按用户查询事件
+            Index(fields=("user_id", "create_time"), name="idx_audit_log_user_time"),
+            # 按时间范围查询与清理
+            Index(fields=("create_time",), name="idx_audit_log_create_time"),
+        )
@@ -1,12 +1,102 @@
+from datetime import datetime
+from typing import Self, override
+
 from tortoise import fields
+from tortoise.indexes import PartialIndex
 from tortoise.manager import Manager
 from tortoise.models import Model
-from tortoise.queryset import QuerySet
+from tortoise.queryset import DeleteQuery, Q, QuerySet, UpdateQuery
+
+
+class SoftDeleteQuerySet[T: Model](QuerySet[T]):
+    """
+    软删除查询集, 默认只包含未删除的记录, 并提供批量软删除、恢复与物理删除
+
+    软删除范围条件作为普通过滤条件保存, 因此 update / count / values 等派生查询同样生效;
+    批量操作均只生成一条 UPDATE / DELETE 语句
+    """
+
+    __slots__ = ("_scope_q",)
+
+    def __init__(self, model: type[T]) -> None:
+        super().__init__(model)
+        # 当前的软删除范围条件, 为 None 时包含全部记录
+        self._scope_q: Q | None = Q(is_deleted=False)
+        self._q_objects.append(self._scope_q)
+
+    @override
+    def _clone(self) -> Self:
+        queryset = super()._clone()
+        queryset._scope_q = self._scope_q
+        return queryset
+
+    def _with_scope(self, is_deleted: bool | None) -> Self:
+        """
+        替换软删除范围条件
+
+        Args:
+            is_deleted (bool | None): 只包含未删除(False)或已删除(True)的记录, 为 None 时包含全部记录
+
+        Returns:
+            Self: 新的查询集
+        """
+
+        queryset = self._clone()
+        if queryset._scope_q is not None:
+            queryset._q_objects = [q for q in queryset._q_objects if q is not queryset._scope_q]
+        queryset._scope_q = None if is_deleted is None else Q(is_deleted=is_deleted)
+        if queryset._scope_q is not None:
+            queryset._q_objects.append(queryset._scope_q)
+        return queryset
+
+    def include_deleted(self) -> Self:
+        """返回包含已删除记录的查询集"""
+        return self._with_scope(None)
+
+    def only_deleted(self) -> Self:
+        """返回仅包含已删除记录的查询集"""
+        return self._with_scope(True)
+
+    def soft_delete(self) -> UpdateQuery:
+        """批量软删除当前查询集中未删除的记录"""
+        return self._with_scope(False).update(is_deleted=True, delete_time=datetime.now())
+
+    def restore(self) -> UpdateQuery:
+        """批量恢复当前查询集中已删除的记录"""
+        return self._with_scope(True).update(is_deleted=False, delete_time=None)
+
+    def hard_delete(self) -> DeleteQuery:
+        """物理删除当前查询集中的记录(包含已删除的记录)"""
+        return super(SoftDeleteQuerySet, self.include_deleted()).delete()
+
+    @override
+    def delete(self) -> UpdateQuery:
+        return self.soft_delete()
 
 
 class SoftDeleteManager(Manager):
-    def get_queryset(self) -> QuerySet:
-        return super(SoftDeleteManager, self).get_queryset().filter(is_deleted=False)
+    """
+    软删除管理器, 提供 SoftDeleteQuerySet
+    """
+
+    def get_queryset(self) -> SoftDeleteQuerySet:
+        return SoftDeleteQuerySet(self._model)
+
+
+class UniquePartialIndex(PartialIndex):
+    """
+    唯一部分索引, 仅对满足条件的行保证唯一(如仅未删除的行)
+    """
+
+    def get_sql(self, schema_generator, model, safe: bool) -> str:
+        return schema_generator.UNIQUE_INDEX_CREATE_TEMPLATE.format(
+            exists="IF NOT EXISTS " if safe else "",
+            index_name=self.index_name(schema_generator, model),
+            index_type="",
+            table_name=model._meta.db_table,
+            fields=", ".join(schema_generator.quote(field) for field in self.field_names),
+            extra=self.extra,
+        )
 
 
 class SoftDeleteMixin:
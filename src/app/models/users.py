@@ -1,6 +1,7 @@
 from tortoise import fields
+from tortoise.indexes import PartialIndex
 
-from .base import BaseModel, SoftDeleteManager, SoftDeleteMixin
+from .base import BaseModel, SoftDeleteManager, SoftDeleteMixin, UniquePartialIndex
 
 
 class Users(SoftDeleteMixin, BaseModel):
@@ -33,6 +34,18 @@ class Users(SoftDeleteMixin, BaseModel):
         ordering = ["id"]
         table_description = "用户表"
         manager = SoftDeleteManager()
+        # 与迁移 4_20261018130000_update 保持一致
+        indexes = (
+            # 登录查询与注册查重: 未删除账号唯一
+            UniquePartialIndex(
+                fields=("user_account",), name="uidx_users_user_account_active", condition={"is_deleted": False}
+            ),
+            # 软删除管理器默认过滤 + 按 ID 排序/分页
+            PartialIndex(fields=("id",), name="idx_users_active_id", condition={"is_deleted": False}),
+            # 已删除记录按删除时间清理
+            PartialIndex(fields=("delete_time",), name="idx_users_deleted_time", condition={"is_deleted": True}),
+            # 用户名模糊搜索的 pg_trgm GIN 索引仅适用于 PostgreSQL, 由迁移 5_20261018140000_update 创建
+        )
 
     class PydanticMeta:
         exclude = ("user_password", "update_time", "is_deleted", "delete_time")
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 
+from .metrics_router import router as metrics_router
 from .v1 import v1_routers
 
 api_routers = APIRouter(prefix="/api")
 api_routers.include_router(v1_routers)
+
+__all__ = ["api_routers", "metrics_router"]
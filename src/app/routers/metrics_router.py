@@ -0,0 +1,76 @@
+import ipaddress
+import secrets
+from functools import lru_cache
+
+from fastapi import APIRouter, Depends
+from fastapi.requests import Request
+from fastapi.responses import PlainTextResponse
+
+from src.app.common import StatusCode
+from src.app.core import get_pool_stats, settings
+from src.app.exceptions import BusinessException
+from src.app.metrics import get_app_metrics
+from .v1.system_router import collect_stats
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus 文本格式版本
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_BEARER_PREFIX = "bearer "
+
+
+@lru_cache()
+def allowed_networks() -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    """
+    允许抓取指标的网段
+
+    Returns:
+        tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]: 由 metrics_allowed_ips 解析的网段
+    """
+
+    return tuple(ipaddress.ip_network(value, strict=False) for value in settings.metrics_allowed_ips)
+
+
+async def require_metrics_access(request: Request) -> None:
+    """
+    校验抓取请求的来源IP或令牌
+
+    Args:
+        request (Request): 请求实例
+
+    Raises:
+        BusinessException: 无权访问指标
+    """
+
+    authorization = request.headers.get("authorization")
+    if settings.metrics_token and authorization and authorization[:len(_BEARER_PREFIX)].lower() == _BEARER_PREFIX:
+        if secrets.compare_digest(authorization[len(_BEARER_PREFIX):].strip(), settings.metrics_token):
+            return
+
+    if request.client is not None:
+        try:
+            address = ipaddress.ip_address(request.client.host)
+        except ValueError:
+            address = None
+        if address is not None and any(address in network for network in allowed_networks()):
+            return
+
+    raise BusinessException(StatusCode.NO_AUTH, "无权访问指标")
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def get_metrics() -> PlainTextResponse:
+    """
+    Prometheus 指标路由, 连接池与子系统统计在抓取时采集
+
+    Returns:
+        PlainTextResponse: Prometheus 文本格式的指标
+    """
+
+    metrics = get_app_metrics()
+    metrics.set_pool_stats(get_pool_stats())
+    for component, stats in collect_stats().items():
+        metrics.set_component_stats(component, stats)
+
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
+from .system_router import router as system_router
 from .users_router import router as user_router
 
 v1_routers = APIRouter(prefix="/v1")
-v1_routers.include_router(user_router)
\ No newline at end of file
+v1_routers.include_router(user_router)
+v1_routers.include_router(system_router)
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends
+
+from src.app.auth import Principal, get_auth_rate_limiter, get_password_hasher, require_admin
+from src.app.cache import get_user_cache
+from src.app.core import get_pool_stats, get_replica_routing
+from src.app.common import ModelResponseRoute, ResultUtils, BaseResponse
+from src.app.services import get_account_filter, get_audit_log_writer, get_user_purge_job
+
+router = APIRouter(prefix="/system", tags=["system"], route_class=ModelResponseRoute)
+
+type Stats = dict[str, dict[str, int | float]]
+
+
+def collect_stats() -> Stats:
+    """
+    收集各子系统的计数器, 供运行统计路由与指标端点共用
+
+    Returns:
+        Stats: 子系统名 -> 计数器
+    """
+
+    stats: Stats = {}
+
+    rate_limiter = get_auth_rate_limiter()
+    if rate_limiter is not None:
+        stats["rate_limit_shed"] = dict(rate_limiter.shed)
+
+    stats["password_hasher"] = {"rejected": get_password_hasher().rejected}
+    user_cache = get_user_cache()
+    stats["user_cache"] = user_cache.stats()
+    if user_cache.bus is not None:
+        stats["user_cache_bus"] = user_cache.bus.stats()
+    stats["account_filter"] = get_account_filter().stats()
+    stats["user_purge"] = get_user_purge_job().stats()
+    stats["db_router"] = get_replica_routing().stats()
+    stats["audit_log"] = get_audit_log_writer().stats()
+
+    return stats
+
+
+@router.get("/stats")
+async def get_system_stats(_: Principal = Depends(require_admin)) -> BaseResponse[Stats]:
+    """
+    系统运行统计路由
+
+    Returns:
+        BaseResponse[Stats]: 各子系统的计数器
+
+    Raises:
+        BusinessException: 用户非管理员
+    """
+
+    stats = collect_stats()
+    for connection_name, pool_stats in get_pool_stats().items():
+        stats[f"db_pool_{connection_name}"] = pool_stats
+
+    return ResultUtils.success(stats)
+
+
+@router.post("/purge")
+async def trigger_user_purge(_: Principal = Depends(require_admin)) -> BaseResponse[bool]:
+    """
+    手动触发已删除用户清理路由, 清理在后台执行, 进度见 /system/stats
+
+    Returns:
+        BaseResponse[bool]: 是否启动清理, 已有清理在运行时为 False
+
+    Raises:
+        BusinessException: 用户非管理员
+    """
+
+    is_started = get_user_purge_job().trigger()
+
+    return ResultUtils.success(is_started)
+
+
+@router.post("/cache/clear")
+async def clear_user_cache(_: Principal = Depends(require_admin)) -> BaseResponse[bool]:
+    """
+    清空用户缓存路由, 启用缓存失效广播时同时清空其他工作进程的进程内缓存, 用于直接修改数据库后
+
+    Returns:
+        BaseResponse[bool]: 是否成功
+
+    Raises:
+        BusinessException: 用户非管理员
+    """
+
+    await get_user_cache().invalidate_all()
+
+    return ResultUtils.success(True)
@@ -1,55 +1,82 @@
+from typing import Literal
+
 from fastapi import APIRouter, Depends
 from fastapi.requests import Request
+from fastapi.responses import StreamingResponse
 
-from src.app.common import ResultUtils, BaseResponse, StatusCode
-from src.app.constants.user_constants import ADMIN_ROLE, USER_LOGIN_STATE
+from src.app.auth import Principal, get_auth_rate_limiter, get_principal, require_admin, require_login
+from src.app.common import ModelResponseRoute, ResultUtils, BaseResponse, StatusCode
 from src.app.exceptions import BusinessException
-from src.app.schemas import UserRegisterRequest, UserLoginRequest, SafetyUser
-from src.app.services import UserService
+from src.app.models import AuditEvent
+from src.app.core import settings
+from src.app.schemas import (
+    UserRegisterRequest,
+    UserLoginRequest,
+    SafetyUser,
+    SafetyUserPage,
+    TokenPair,
+    TokenRefreshRequest,
+    UserBatchRequest,
+    UserBatchResult,
+    UserImportResult,
+)
+from src.app.services import UserService, get_audit_log_writer
 from src.app.utils import StringUtils
 
-router = APIRouter(prefix="/user", tags=["users"])
+router = APIRouter(prefix="/user", tags=["users"], route_class=ModelResponseRoute)
 
 
-def is_admin(request: Request) -> bool:
+def client_ip(request: Request) -> str | None:
     """
-    根据会话判断用户是否为管理员
+    获取客户端IP
 
     Args:
         request (Request): 请求实例
 
     Returns:
-        bool: 用户是否为管理员
+        str | None: 客户端IP, 无法获取时返回 None
+    """
+
+    return request.client.host if request.client else None
+
+
+async def throttle(request: Request, action: str, user_account: str | None) -> None:
     """
+    登录/注册限流, 在任何数据库查询与密码哈希之前执行
 
-    # 从会话中获取数据
-    data = request.session.get(USER_LOGIN_STATE)
-    if data is None:
-        return False
+    Args:
+        request (Request): 请求实例
+        action (str): 操作名称
+        user_account (str | None): 账号, 为空时仅按IP限流
 
-    # 数据反序列化
-    safety_user = SafetyUser.model_validate_json(data)
+    Raises:
+        BusinessException: 请求过于频繁
+    """
 
-    # 用户角色必须为管理员
-    if safety_user.user_role != ADMIN_ROLE:
-        return False
+    rate_limiter = get_auth_rate_limiter()
+    if rate_limiter is None:
+        return
 
-    return True
+    await rate_limiter.check(action, client_ip(request), user_account)
 
 
 @router.post("/register")
-async def user_register(user_register_request: UserRegisterRequest | None = None) -> BaseResponse[int]:
+async def user_register(
+        request: Request,
+        user_register_request: UserRegisterRequest | None = None,
+) -> BaseResponse[int]:
     """
     用户注册路由
 
     Args:
+        request (Request): 请求实例
         user_register_request (UserRegisterRequest | None): 用户注册信息请求体
 
     Returns:
         BaseResponse[int]: 用户ID
 
     Raises:
-        BusinessException: 注册信息为空 | 参数为空
+        BusinessException: 注册信息为空 | 参数为空 | 请求过于频繁
     """
 
     if user_register_request is None:
@@ -61,11 +88,38 @@ async def user_register(user_register_request: UserRegisterRequest | None = None
     if StringUtils.is_any_blank(user_account, user_password, confirm_password):
         raise BusinessException(StatusCode.PARAMS_ERROR, "参数为空")
 
-    user_id = await UserService.user_register(user_account, user_password, confirm_password)
+    await throttle(request, "register", user_account)
+    user_id = await UserService.user_register(user_account, user_password, confirm_password, client_ip(request))
 
     return ResultUtils.success(user_id)
 
 
+@router.get("/exists")
+async def user_account_exists(request: Request, user_account: str = "") -> BaseResponse[bool]:
+    """
+    账号是否已被注册路由, 供注册表单检查账号可用性
+
+    Args:
+        request (Request): 请求实例
+        user_account (str): 账号
+
+    Returns:
+        BaseResponse[bool]: 账号是否已存在
+
+    Raises:
+        BusinessException: 参数为空 | 请求过于频繁
+    """
+
+    if StringUtils.is_any_blank(user_account):
+        raise BusinessException(StatusCode.PARAMS_ERROR, "参数为空")
+
+    # 可用性检查会遍历不同账号, 仅按IP限流
+    await throttle(request, "exists", None)
+    is_exist = await UserService.user_account_exists(user_account)
+
+    return ResultUtils.success(is_exist)
+
+
 @router.post("/login")
 async def user_login(
         request: Request,
@@ -82,7 +136,7 @@ async def user_login(
         BaseResponse[SafetyUser]: 用户信息(脱敏)
 
     Raises:
-                BusinessException: 登录信息为空 | 参数为空
+        BusinessException: 登录信息为空 | 参数为空 | 请求过于频繁
     """
 
     if user_login_request is None:
@@ -93,18 +147,75 @@ async def user_login(
     if StringUtils.is_any_blank(user_account, user_password):
         raise BusinessException(StatusCode.PARAMS_ERROR, "参数为空")
 
+    await throttle(request, "login", user_account)
     safety_user = await UserService.user_login(user_account, user_password, request)
 
     return ResultUtils.success(safety_user)
 
 
+@router.post("/token")
+async def user_token_login(
+        request: Request,
+        user_login_request: UserLoginRequest | None = None,
+) -> BaseResponse[TokenPair]:
+    """
+    用户令牌登录路由
+
+    Args:
+        request (Request): 请求实例
+        user_login_request (UserLoginRequest | None): 用户登录信息
+
+    Returns:
+        BaseResponse[TokenPair]: 访问令牌与刷新令牌
+
+    Raises:
+        BusinessException: 登录信息为空 | 参数为空 | 请求过于频繁
+    """
+
+    if user_login_request is None:
+        raise BusinessException(StatusCode.NULL_ERROR, "登录信息为空")
+
+    user_account = user_login_request.user_account
+    user_password = user_login_request.user_password
+    if StringUtils.is_any_blank(user_account, user_password):
+        raise BusinessException(StatusCode.PARAMS_ERROR, "参数为空")
+
+    await throttle(request, "login", user_account)
+    token_pair = await UserService.user_token_login(user_account, user_password, client_ip(request))
+
+    return ResultUtils.success(token_pair)
+
+
+@router.post("/token/refresh")
+async def refresh_token(token_refresh_request: TokenRefreshRequest | None = None) -> BaseResponse[TokenPair]:
+    """
+    刷新令牌路由
+
+    Args:
+        token_refresh_request (TokenRefreshRequest | None): 刷新令牌信息
+
+    Returns:
+        BaseResponse[TokenPair]: 新的访问令牌与刷新令牌
+
+    Raises:
+        BusinessException: 刷新令牌为空
+    """
+
+    if token_refresh_request is None or StringUtils.is_any_blank(token_refresh_request.refresh_token or ""):
+        raise BusinessException(StatusCode.NULL_ERROR, "刷新令牌为空")
+
+    token_pair = await UserService.refresh_token(token_refresh_request.refresh_token)
+
+    return ResultUtils.success(token_pair)
+
+
 @router.get("/current")
-async def get_current_user(request: Request) -> BaseResponse[SafetyUser]:
+async def get_current_user(principal: Principal = Depends(require_login)) -> BaseResponse[SafetyUser]:
     """
     获取当前用户信息路由
 
     Args:
-        request (Request): 请求实例
+        principal (Principal): 当前登录用户
 
     Returns:
         BaseResponse[SafetyUser]: 用户信息(脱敏)
@@ -113,70 +224,131 @@ async def get_current_user(request: Request) -> BaseResponse[SafetyUser]:
         BusinessException: 用户未登录
     """
 
-    # 从会话中获取用户凭证
-    data = request.session.get(USER_LOGIN_STATE)
-    if data is None:
-        raise BusinessException(StatusCode.NOT_LOGIN, "用户未登录")
-
-    # 反序列化
-    safety_user_session = SafetyUser.model_validate_json(data)
-
     # 根据用户ID从数据库中查询用户信息
-    user_id = safety_user_session.id
-    safety_user = await UserService.get_user_by_id(user_id)
+    safety_user = await UserService.get_user_by_id(principal.id)
 
     return ResultUtils.success(safety_user)
 
 
 @router.post("/logout")
-async def user_logout(request: Request) -> BaseResponse[bool]:
+async def user_logout(
+        request: Request,
+        principal: Principal | None = Depends(get_principal),
+) -> BaseResponse[bool]:
     """
     用户注销路由
 
     Args:
         request (Request): 请求实例
+        principal (Principal | None): 当前登录用户
 
     Returns:
         BaseResponse[bool]: 用户是否完成注销
     """
 
-    is_logout = UserService.user_logout(request)
+    is_logout = await UserService.user_logout(request)
+    get_audit_log_writer().record(
+        AuditEvent.LOGOUT, user_id=principal.id if principal else None, ip=client_ip(request)
+    )
     return ResultUtils.success(is_logout)
 
 
 @router.get("/search")
-async def search_users(request: Request, username: str = "") -> BaseResponse[list[SafetyUser]]:
+async def search_users(
+        username: str = "",
+        cursor: str | None = None,
+        limit: int = settings.search_default_limit,
+        fuzzy: bool = False,
+        _: Principal = Depends(require_admin),
+) -> BaseResponse[SafetyUserPage]:
     """
-    搜索用户信息路由
+    搜索用户信息路由(按ID游标分页, 模糊搜索时按相关度排序且不分页)
 
     Args:
-        request (Request): 请求实例
         username (str): 用户名
+        cursor (str | None): 上一页返回的 next_cursor
+        limit (int): 每页数量
+        fuzzy (bool): 是否模糊搜索
 
     Returns:
-        BaseResponse[list[SafetyUser]]: 用户信息列表(脱敏)
+        BaseResponse[SafetyUserPage]: 用户信息分页结果(脱敏)
+
+    Raises:
+        BusinessException: 用户非管理员 | 每页数量不为正整数 | 游标无效 | 搜索用户名为空
+    """
+
+    if fuzzy:
+        safety_users_page = await UserService.fuzzy_search_users_by_username(username, limit)
+    else:
+        safety_users_page = await UserService.search_users_by_username(username, cursor, limit)
+
+    return ResultUtils.success(safety_users_page)
+
+
+@router.get("/export")
+async def export_users(
+        export_format: Literal["ndjson", "csv"] = "ndjson",
+        _: Principal = Depends(require_admin),
+) -> StreamingResponse:
+    """
+    流式导出全部用户信息路由
+
+    Args:
+        export_format (Literal["ndjson", "csv"]): 导出格式
+
+    Returns:
+        StreamingResponse: 用户信息(脱敏)数据流
 
     Raises:
         BusinessException: 用户非管理员
     """
 
-    # 权限校验
-    if not is_admin(request):
-        raise BusinessException(StatusCode.NO_AUTH, "用户非管理员")
+    media_type = "application/x-ndjson" if export_format == "ndjson" else "text/csv"
+    return StreamingResponse(
+        UserService.export_users(export_format),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'},
+    )
+
+
+@router.post("/import")
+async def import_users(
+        request: Request,
+        import_format: Literal["ndjson", "csv"] = "ndjson",
+        _: Principal = Depends(require_admin),
+) -> BaseResponse[UserImportResult]:
+    """
+    批量导入用户路由, 请求体为 NDJSON 或 CSV 文件内容(流式读取)
+
+    Args:
+        request (Request): 请求实例
+        import_format (Literal["ndjson", "csv"]): 文件格式
+
+    Returns:
+        BaseResponse[UserImportResult]: 导入结果与错误行
+
+    Raises:
+        BusinessException: 用户非管理员 | 文件编码错误 | 系统繁忙
+    """
 
-    safety_users_list = await UserService.search_users_by_username(username)
+    import_result = await UserService.import_users(request.stream(), import_format)
 
-    return ResultUtils.success(safety_users_list)
+    return ResultUtils.success(import_result)
 
 
 @router.post("/delete")
-async def delete_user(request: Request, user_id: int = 0) -> BaseResponse[bool]:
+async def delete_user(
+        request: Request,
+        user_id: int = 0,
+        principal: Principal = Depends(require_admin),
+) -> BaseResponse[bool]:
     """
     逻辑删除用户路由
 
     Args:
         request (Request): 请求实例
         user_id (int): 用户ID
+        principal (Principal): 当前管理员
 
     Returns:
         BaseResponse[bool]: 用户是否被删除(逻辑)
@@ -185,15 +357,74 @@ async def delete_user(request: Request, user_id: int = 0) -> BaseResponse[bool]:
         BusinessException: 用户非管理员 | 删除用户ID为空 | 删除用户ID不为正整数
     """
 
-    # 权限校验
-    if not is_admin(request):
-        raise BusinessException(StatusCode.NO_AUTH, "用户非管理员")
-
     if user_id is None:
         raise BusinessException(StatusCode.NULL_ERROR, "删除用户ID为空")
     if user_id <= 0:
         raise BusinessException(StatusCode.PARAMS_ERROR, "删除用户ID不为正整数")
 
     is_deleted = await UserService.delete_user_by_id(user_id)
+    if is_deleted:
+        get_audit_log_writer().record(
+            AuditEvent.ADMIN_DELETE, user_id=user_id, operator_id=principal.id, ip=client_ip(request)
+        )
 
     return ResultUtils.success(is_deleted)
+
+
+@router.post("/batch/delete")
+async def delete_users(
+        request: Request,
+        batch_request: UserBatchRequest | None = None,
+        principal: Principal = Depends(require_admin),
+) -> BaseResponse[UserBatchResult]:
+    """
+    批量逻辑删除用户路由, 按用户ID列表或条件筛选
+
+    Args:
+        request (Request): 请求实例
+        batch_request (UserBatchRequest | None): 批量条件
+        principal (Principal): 当前管理员
+
+    Returns:
+        BaseResponse[UserBatchResult]: 删除的用户ID
+
+    Raises:
+        BusinessException: 用户非管理员 | 批量条件为空 | 用户ID不为正整数 | 批量数量超过上限
+    """
+
+    if batch_request is None:
+        raise BusinessException(StatusCode.NULL_ERROR, "批量条件为空")
+
+    batch_result = await UserService.delete_users(batch_request)
+    audit_log_writer = get_audit_log_writer()
+    ip = client_ip(request)
+    for user_id in batch_result.user_ids:
+        audit_log_writer.record(AuditEvent.ADMIN_DELETE, user_id=user_id, operator_id=principal.id, ip=ip)
+
+    return ResultUtils.success(batch_result)
+
+
+@router.post("/batch/restore")
+async def restore_users(
+        batch_request: UserBatchRequest | None = None,
+        _: Principal = Depends(require_admin),
+) -> BaseResponse[UserBatchResult]:
+    """
+    批量恢复已逻辑删除的用户路由, 按用户ID列表或条件筛选
+
+    Args:
+        batch_request (UserBatchRequest | None): 批量条件
+
+    Returns:
+        BaseResponse[UserBatchResult]: 恢复的用户ID与未恢复的用户ID
+
+    Raises:
+        BusinessException: 用户非管理员 | 批量条件为空 | 用户ID不为正整数 | 批量数量超过上限 | 账号重复
+    """
+
+    if batch_request is None:
+        raise BusinessException(StatusCode.NULL_ERROR, "批量条件为空")
+
+    batch_result = await UserService.restore_users(batch_request)
+
+    return ResultUtils.success(batch_result)
@@ -1,9 +1,38 @@
-from .users import SafetyUserPydantic, SafetyUserPydanticList, SafetyUser, UserLoginRequest, UserRegisterRequest
+from typing import Any
+
+from . import users
+from .tokens import TokenPair, TokenRefreshRequest
+from .users import (
+    SAFETY_USER_FIELDS,
+    SafetyUser,
+    SafetyUserPage,
+    UserBatchRequest,
+    UserBatchResult,
+    UserImportError,
+    UserImportResult,
+    UserLoginRequest,
+    UserRegisterRequest,
+)
 
 __all__ = [
+    "SAFETY_USER_FIELDS",
     "SafetyUserPydantic",
     "SafetyUserPydanticList",
     "SafetyUser",
+    "SafetyUserPage",
+    "UserBatchRequest",
+    "UserBatchResult",
+    "UserImportError",
+    "UserImportResult",
     "UserLoginRequest",
-    "UserRegisterRequest"
+    "UserRegisterRequest",
+    "TokenPair",
+    "TokenRefreshRequest",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # 按需生成的模型, 见 users.__getattr__
+    if name in ("SafetyUserPydantic", "SafetyUserPydanticList"):
+        return getattr(users, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+
+
+class TokenPair(BaseModel):
+    """
+    访问令牌与刷新令牌
+
+    Attributes:
+        access_token (str): 访问令牌
+        refresh_token (str): 刷新令牌
+        token_type (str): 令牌类型
+        expires_in (int): 访问令牌有效秒数
+    """
+
+    access_token: str = Field(description="访问令牌")
+    refresh_token: str = Field(description="刷新令牌")
+    token_type: str = Field(default="Bearer", description="令牌类型")
+    expires_in: int = Field(description="访问令牌有效秒数")
+
+
+class TokenRefreshRequest(BaseModel):
+    """
+    刷新令牌请求信息校验模型
+
+    Attributes:
+        refresh_token (str): 刷新令牌
+    """
+    refresh_token: str | None
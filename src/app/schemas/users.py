@@ -1,12 +1,32 @@
+from collections.abc import Sequence
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Self
 
 from pydantic import BaseModel, ConfigDict, EmailStr, HttpUrl, Field
-from tortoise.contrib.pydantic import pydantic_model_creator, pydantic_queryset_creator
 
 from src.app.models import Users
 
-SafetyUserPydantic = pydantic_model_creator(Users)
-SafetyUserPydanticList = pydantic_queryset_creator(Users)
+
+@lru_cache()
+def _safety_user_pydantic() -> type[BaseModel]:
+    from tortoise.contrib.pydantic import pydantic_model_creator
+    return pydantic_model_creator(Users)
+
+
+@lru_cache()
+def _safety_user_pydantic_list() -> type[BaseModel]:
+    from tortoise.contrib.pydantic import pydantic_queryset_creator
+    return pydantic_queryset_creator(Users)
+
+
+def __getattr__(name: str) -> Any:
+    # SafetyUserPydantic / SafetyUserPydanticList 在首次访问时生成, 导入时不为模型构建校验器
+    if name == "SafetyUserPydantic":
+        return _safety_user_pydantic()
+    if name == "SafetyUserPydanticList":
+        return _safety_user_pydantic_list()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class SafetyUser(BaseModel):
@@ -41,6 +61,125 @@ class SafetyUser(BaseModel):
         from_attributes=True
     )
 
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> Self:
+        """
+        由数据库行构造, 跳过校验; 仅用于读取本服务写入并已校验过的数据, 外部输入仍需完整校验
+
+        Args:
+            row (Sequence[Any]): 按 SAFETY_USER_FIELDS 顺序排列的字段值, 如 values_list 的结果
+
+        Returns:
+            Self: 用户信息(脱敏)
+        """
+
+        values = dict(zip(SAFETY_USER_FIELDS, row))
+        # 头像以 HttpUrl 类型序列化, 字符串需转换, 否则序列化时产生类型告警
+        if values["avatar_url"] is not None:
+            values["avatar_url"] = HttpUrl(values["avatar_url"])
+
+        safety_user = cls.__new__(cls)
+        object.__setattr__(safety_user, "__dict__", values)
+        object.__setattr__(safety_user, "__pydantic_fields_set__", set(SAFETY_USER_FIELDS))
+        object.__setattr__(safety_user, "__pydantic_extra__", None)
+        object.__setattr__(safety_user, "__pydantic_private__", None)
+        return safety_user
+
+    @classmethod
+    def from_model(cls, user: Any) -> Self:
+        """
+        由已查询的 ORM 实例构造, 跳过校验
+
+        Args:
+            user (Any): 用户 ORM 实例
+
+        Returns:
+            Self: 用户信息(脱敏)
+        """
+
+        return cls.from_row([getattr(user, field) for field in SAFETY_USER_FIELDS])
+
+
+# 脱敏用户信息的字段, 读取时 values_list(*SAFETY_USER_FIELDS) 的结果可直接传入 SafetyUser.from_row
+SAFETY_USER_FIELDS: tuple[str, ...] = tuple(SafetyUser.model_fields)
+
+
+class SafetyUserPage(BaseModel):
+    """
+    脱敏用户信息分页结果
+
+    Attributes:
+        items (list[SafetyUser]): 当前页用户信息
+        next_cursor (str | None): 下一页游标, 没有下一页时为 None
+    """
+
+    items: list[SafetyUser] = Field(description="当前页用户信息")
+    next_cursor: str | None = Field(description="下一页游标")
+
+
+class UserImportError(BaseModel):
+    """
+    批量导入的错误行
+
+    Attributes:
+        line (int): 行号(从 1 开始, csv 含表头行)
+        user_account (str | None): 用户账号
+        description (str): 错误描述
+    """
+
+    line: int = Field(description="行号")
+    user_account: str | None = Field(description="用户账号")
+    description: str = Field(description="错误描述")
+
+
+class UserImportResult(BaseModel):
+    """
+    批量导入结果
+
+    Attributes:
+        total (int): 数据行数
+        created (int): 成功导入数量
+        failed (int): 失败数量
+        errors (list[UserImportError]): 错误行, 超过上限的部分不返回
+    """
+
+    total: int = Field(default=0, description="数据行数")
+    created: int = Field(default=0, description="成功导入数量")
+    failed: int = Field(default=0, description="失败数量")
+    errors: list[UserImportError] = Field(default_factory=list, description="错误行")
+
+
+class UserBatchRequest(BaseModel):
+    """
+    批量软删除/恢复的用户条件, 各条件同时满足; 至少指定一个条件
+
+    Attributes:
+        user_ids (list[int] | None): 用户ID列表
+        username (str | None): 用户名包含的内容
+        user_status (int | None): 用户状态
+        created_before (datetime | None): 创建时间早于
+    """
+
+    user_ids: list[int] | None = Field(default=None, description="用户ID列表")
+    username: str | None = Field(default=None, description="用户名包含的内容")
+    user_status: int | None = Field(default=None, description="用户状态")
+    created_before: datetime | None = Field(default=None, description="创建时间早于")
+
+
+class UserBatchResult(BaseModel):
+    """
+    批量软删除/恢复结果
+
+    Attributes:
+        user_ids (list[int]): 本次处理的用户ID
+        skipped (list[int]): 因账号已被占用而未恢复的用户ID
+        has_more (bool): 是否还有超出单次上限未处理的用户
+    """
+
+    user_ids: list[int] = Field(description="本次处理的用户ID")
+    skipped: list[int] = Field(default_factory=list, description="未恢复的用户ID")
+    has_more: bool = Field(default=False, description="是否还有未处理的用户")
+
 
 class UserRegisterRequest(BaseModel):
     """
@@ -0,0 +1,302 @@
+"""
+生产环境启动入口: 主进程预加载应用并绑定监听套接字, fork 出多个工作进程共享该套接字,
+各工作进程在 lifespan 中各自建立数据库连接池与后台任务
+
+用法:
+    python -m src.app.server [--app src.app.main:create_app] [--host 0.0.0.0] [--port 8000] [--workers 4]
+
+其余参数见 Settings 中的 server_* 配置, 可通过环境变量或 .env 文件设置
+
+多个工作进程时各进程内存不共享, 会话与登录限流须使用 Redis(SESSION_BACKEND=redis, RATE_LIMIT_BACKEND=redis),
+否则在一个工作进程登录的用户在其他进程视为未登录, 限流额度也按工作进程数倍增; 使用内存后端时拒绝启动
+"""
+import argparse
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+from types import FrameType
+from typing import Any
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from src.app.core.config import Settings, settings
+
+# 与 uvicorn 共用日志配置
+logger = logging.getLogger("uvicorn.error")
+
+# 工作进程启动失败(如 lifespan 中连接数据库失败)的退出码, 主进程收到后停止全部工作进程, 避免反复重启
+WORKER_BOOT_ERROR = 3
+# 配置不支持多工作进程的退出码
+CONFIG_ERROR = 2
+
+
+def build_uvicorn_config(app: Any, config: Settings) -> uvicorn.Config:
+    """
+    根据配置生成 uvicorn 配置
+
+    Args:
+        app (Any): ASGI 应用, 或 "模块:工厂函数" 形式的应用工厂导入路径
+        config (Settings): 配置
+
+    Returns:
+        uvicorn.Config: uvicorn 配置
+    """
+
+    return uvicorn.Config(
+        app,
+        factory=isinstance(app, str),
+        host=config.server_host,
+        port=config.server_port,
+        loop=config.server_loop,
+        http=config.server_http,
+        backlog=config.server_backlog,
+        timeout_keep_alive=config.server_keep_alive_seconds,
+        limit_concurrency=config.server_limit_concurrency,
+        limit_max_requests=config.server_limit_max_requests,
+        timeout_graceful_shutdown=config.server_graceful_shutdown_seconds,
+        proxy_headers=config.server_proxy_headers,
+        forwarded_allow_ips=config.server_forwarded_allow_ips,
+        access_log=config.server_access_log,
+    )
+
+
+def check_shared_state(config: Settings) -> list[str]:
+    """
+    检查多工作进程部署时需要跨进程共享的状态是否使用了进程内存储
+
+    Args:
+        config (Settings): 配置
+
+    Returns:
+        list[str]: 问题描述, 为空时可以多进程运行
+    """
+
+    problems = []
+    if config.session_backend == "memory":
+        problems.append("session_backend=memory: 会话只在创建它的工作进程中有效, 请使用 redis")
+    if config.rate_limit_enabled and config.rate_limit_backend == "memory":
+        problems.append("rate_limit_backend=memory: 限流额度按工作进程数倍增, 请使用 redis")
+    return problems
+
+
+def load_app(app_path: str) -> Any:
+    """
+    导入应用工厂并创建应用
+
+    Args:
+        app_path (str): "模块:工厂函数" 形式的导入路径
+
+    Returns:
+        Any: ASGI 应用
+    """
+
+    return import_from_string(app_path)()
+
+
+class WorkerSupervisor:
+    """
+    多进程服务的主进程: 在 fork 前绑定监听套接字, 工作进程退出后补充新进程(limit_max_requests 回收或异常退出),
+    收到 SIGINT / SIGTERM 时通知全部工作进程平滑退出, 再次收到时强制结束
+
+    预加载的应用在 fork 前只完成路由与中间件的构建, 不建立数据库连接、不创建进程池与后台任务,
+    这些资源在工作进程的 lifespan 中创建, 不会被多个进程共享
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int, max_requests_jitter: int = 0) -> None:
+        """
+        Args:
+            config (uvicorn.Config): uvicorn 配置, 应用已加载时工作进程直接使用
+            workers (int): 工作进程数
+            max_requests_jitter (int): 各工作进程回收请求数的随机增量上限
+        """
+
+        self.config = config
+        self.workers = workers
+        self.max_requests_jitter = max_requests_jitter
+        self.children: set[int] = set()
+        self.should_exit = False
+        self.restarts = 0
+        self.exit_code = 0
+
+    def run(self) -> int:
+        """
+        启动工作进程并等待全部退出
+
+        Returns:
+            int: 退出码, 工作进程启动失败时非 0
+        """
+
+        sock = self.config.bind_socket()
+        handlers = {sig: signal.signal(sig, self.handle_exit) for sig in (signal.SIGINT, signal.SIGTERM)}
+        logger.info("Started supervisor process [%d] with %d workers", os.getpid(), self.workers)
+
+        try:
+            for _ in range(self.workers):
+                self.spawn(sock)
+            self.wait(sock)
+        finally:
+            sock.close()
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+
+        logger.info("Stopped supervisor process [%d]", os.getpid())
+        return self.exit_code
+
+    def wait(self, sock: socket.socket) -> None:
+        """
+        等待工作进程退出, 未停止服务时补充新进程
+        """
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            if pid not in self.children:
+                continue
+            self.children.discard(pid)
+
+            exit_code = os.waitstatus_to_exitcode(status)
+            if self.should_exit:
+                continue
+            if exit_code == WORKER_BOOT_ERROR:
+                logger.error("Worker [%d] failed to boot, stopping supervisor", pid)
+                self.exit_code = WORKER_BOOT_ERROR
+                self.should_exit = True
+                self.stop(signal.SIGTERM)
+                continue
+
+            if exit_code != 0:
+                logger.warning("Worker [%d] exited with code %d, restarting", pid, exit_code)
+            else:
+                logger.info("Worker [%d] recycled, restarting", pid)
+            self.restarts += 1
+            self.spawn(sock)
+
+    def spawn(self, sock: socket.socket) -> None:
+        """
+        fork 一个工作进程
+        """
+
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return
+
+        # 工作进程: 不返回到主进程的代码路径
+        exit_code = 1
+        try:
+            exit_code = self.serve(sock)
+        except BaseException:
+            logger.exception("Worker [%d] crashed", os.getpid())
+        finally:
+            os._exit(exit_code)
+
+    def serve(self, sock: socket.socket) -> int:
+        """
+        在工作进程中运行服务, 信号由 uvicorn 接管
+
+        Returns:
+            int: 退出码
+        """
+
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # fork 后随机数状态与主进程相同, 重新播种
+        random.seed()
+
+        if self.config.limit_max_requests is not None and self.max_requests_jitter > 0:
+            self.config.limit_max_requests += random.randint(0, self.max_requests_jitter)
+
+        server = uvicorn.Server(self.config)
+        server.run(sockets=[sock])
+        return 0 if server.started else WORKER_BOOT_ERROR
+
+    def stop(self, sig: int) -> None:
+        """
+        向全部工作进程发送信号
+        """
+
+        for pid in self.children:
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        """
+        首次收到退出信号时平滑停止工作进程, 再次收到时强制结束
+        """
+
+        if self.should_exit:
+            self.stop(signal.SIGKILL)
+            return
+        self.should_exit = True
+        self.stop(signal.SIGTERM)
+
+
+def run(app_path: str, config: Settings = settings) -> int:
+    """
+    按配置启动服务
+
+    工作进程数为 1 或平台不支持 fork 时在当前进程中运行; 开启 server_preload 时在 fork 前创建应用,
+    应用导入与路由构建只执行一次, 工作进程共享这部分内存页
+
+    Args:
+        app_path (str): "模块:工厂函数" 形式的应用工厂导入路径
+        config (Settings): 配置
+
+    Returns:
+        int: 退出码
+    """
+
+    workers = config.server_workers or os.cpu_count() or 1
+    if workers > 1 and not hasattr(os, "fork"):
+        logger.warning("os.fork is unavailable on this platform, running a single worker")
+        workers = 1
+
+    if workers > 1 and config.server_require_shared_state:
+        problems = check_shared_state(config)
+        if problems:
+            for problem in problems:
+                logger.error("Cannot run %d workers with %s", workers, problem)
+            return CONFIG_ERROR
+
+    if config.server_preload:
+        uvicorn_config = build_uvicorn_config(load_app(app_path), config)
+        uvicorn_config.load()
+    else:
+        # 应用在各工作进程中由工厂创建
+        uvicorn_config = build_uvicorn_config(app_path, config)
+
+    if workers == 1:
+        server = uvicorn.Server(uvicorn_config)
+        server.run()
+        return 0 if server.started else WORKER_BOOT_ERROR
+
+    uvicorn_config.workers = workers
+    supervisor = WorkerSupervisor(uvicorn_config, workers, config.server_max_requests_jitter)
+    return supervisor.run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="src.app.main:create_app", help="应用工厂的导入路径")
+    parser.add_argument("--host", help="监听地址, 默认 server_host")
+    parser.add_argument("--port", type=int, help="监听端口, 默认 server_port")
+    parser.add_argument("--workers", type=int, help="工作进程数, 默认 server_workers")
+    args = parser.parse_args()
+
+    # 命令行参数写入全局配置, 工作进程中按工作进程数决定的行为(如账号过滤器)与实际一致
+    for key, value in (("server_host", args.host), ("server_port", args.port), ("server_workers", args.workers)):
+        if value is not None:
+            setattr(settings, key, value)
+    sys.exit(run(args.app, settings))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,17 @@
+from .audit_log import AuditLogWriter, get_audit_log_writer
+from .account_filter import AccountExistenceFilter, get_account_filter
+from .user_purge import UserPurgeJob, get_user_purge_job
 from .user_service import UserService
+from .username_index import UsernameSearchIndex, get_username_index
 
-__all__ = ["UserService"]
+__all__ = [
+    "UserService",
+    "UsernameSearchIndex",
+    "get_username_index",
+    "AccountExistenceFilter",
+    "get_account_filter",
+    "UserPurgeJob",
+    "get_user_purge_job",
+    "AuditLogWriter",
+    "get_audit_log_writer",
+]
@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import os
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
+from src.app.core import settings
+from src.app.models import Users
+from src.app.utils import CountingBloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+class AccountExistenceFilter:
+    """
+    未删除账号的进程内布隆过滤器, 用于注册查重与账号可用性检查
+
+    判定"一定不存在"时可跳过数据库查询, 判定"可能存在"时仍以数据库为准; 未构建完成前
+    所有账号均视为可能存在。多进程部署时各进程独立维护, 其他进程新注册的账号在下次重建前
+    可能被判定为不存在: 注册由唯一索引兜底, 可用性检查在 trust_negatives 为 False 时查询数据库确认
+    """
+
+    def __init__(
+            self,
+            capacity: int,
+            error_rate: float,
+            snapshot_path: str | None = None,
+            rebuild_interval: int = 0,
+            chunk_size: int = 5000,
+            trust_negatives: bool = True,
+    ) -> None:
+        """
+        Args:
+            capacity (int): 预期账号数量
+            error_rate (float): 目标误判率
+            snapshot_path (str | None): 快照文件路径, 为空时不持久化
+            rebuild_interval (int): 后台定期重建间隔(秒), 0 表示不定期重建
+            chunk_size (int): 构建时每批读取数量
+            trust_negatives (bool): "一定不存在"的判定是否可直接作为可用性检查的结果,
+                多进程部署时过滤器不包含其他进程注册的账号, 应为 False
+        """
+
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._rebuild_interval = rebuild_interval
+        self._chunk_size = chunk_size
+        self._trust_negatives = trust_negatives
+        self._filter = CountingBloomFilter(capacity, error_rate)
+        self._building: CountingBloomFilter | None = None
+        self._built = False
+        self._task: asyncio.Task | None = None
+        self.negatives = 0
+        self.positives = 0
+        self.false_positives = 0
+        self.stale_negatives = 0
+
+    @property
+    def is_built(self) -> bool:
+        """过滤器是否可用"""
+        return self._built
+
+    @property
+    def trust_negatives(self) -> bool:
+        """"一定不存在"的判定是否无需数据库确认"""
+        return self._trust_negatives
+
+    async def build(self) -> None:
+        """从数据库按ID分批全量构建过滤器, 构建完成后整体替换"""
+        bloom_filter = CountingBloomFilter(self._capacity, self._error_rate)
+        # 构建期间的新注册同时写入新过滤器, 避免替换时丢失
+        self._building = bloom_filter
+        try:
+            last_id = 0
+            while True:
+                rows = await (
+                    Users.filter(id__gt=last_id, user_account__isnull=False)
+                    .order_by("id")
+                    .limit(self._chunk_size)
+                    .values_list("id", "user_account")
+                )
+                for _, user_account in rows:
+                    bloom_filter.add(user_account)
+                if len(rows) < self._chunk_size:
+                    break
+                last_id = rows[-1][0]
+        finally:
+            self._building = None
+
+        self._filter = bloom_filter
+        self._built = True
+        if len(bloom_filter) > self._capacity:
+            logger.warning("账号数量 %d 超过布隆过滤器容量 %d, 误判率将升高", len(bloom_filter), self._capacity)
+
+    async def start(self) -> None:
+        """
+        启动过滤器: 存在快照时先加载快照并在后台重建校正, 否则同步构建; 按配置启动定期重建
+        """
+
+        if await self.load_snapshot():
+            self._task = asyncio.create_task(self._run(initial_delay=0))
+        else:
+            await self.build()
+            if self._rebuild_interval > 0:
+                self._task = asyncio.create_task(self._run(initial_delay=self._rebuild_interval))
+
+    async def _run(self, initial_delay: int) -> None:
+        """后台重建循环"""
+        await asyncio.sleep(initial_delay)
+        while True:
+            try:
+                await self.build()
+            except Exception:
+                logger.exception("账号布隆过滤器重建失败")
+            if self._rebuild_interval <= 0:
+                return
+            await asyncio.sleep(self._rebuild_interval)
+
+    async def stop(self) -> None:
+        """停止后台重建并保存快照"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save_snapshot()
+
+    async def load_snapshot(self) -> bool:
+        """
+        加载快照
+
+        Returns:
+            bool: 是否加载成功
+        """
+
+        if self._snapshot_path is None or not self._snapshot_path.exists():
+            return False
+        try:
+            data = await asyncio.to_thread(self._snapshot_path.read_bytes)
+            self._filter = CountingBloomFilter.from_bytes(data)
+        except (OSError, ValueError):
+            logger.warning("账号布隆过滤器快照 %s 无效, 将重新构建", self._snapshot_path)
+            return False
+        self._built = True
+        return True
+
+    async def save_snapshot(self) -> None:
+        """保存快照, 未配置路径或未构建时忽略"""
+        if self._snapshot_path is None or not self._built:
+            return
+        data = self._filter.to_bytes()
+        # 多个工作进程同时保存时各自写入临时文件, 再原子替换
+        tmp_path = self._snapshot_path.with_name(
+            f"{self._snapshot_path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        )
+        try:
+            await asyncio.to_thread(tmp_path.write_bytes, data)
+            await asyncio.to_thread(tmp_path.replace, self._snapshot_path)
+        except OSError:
+            logger.exception("账号布隆过滤器快照保存失败")
+            tmp_path.unlink(missing_ok=True)
+
+    def might_contain(self, user_account: str) -> bool:
+        """
+        账号是否可能存在
+
+        Args:
+            user_account (str): 账号
+
+        Returns:
+            bool: False 表示一定不存在, True 表示可能存在(需查询数据库确认)
+        """
+
+        if not self._built:
+            return True
+        if user_account in self._filter:
+            self.positives += 1
+            return True
+        self.negatives += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        """记录一次经数据库确认的误判"""
+        if self._built:
+            self.false_positives += 1
+
+    def record_stale_negative(self, user_account: str) -> None:
+        """
+        记录一次经数据库确认存在、但过滤器判定不存在的账号(由其他进程注册), 并补入过滤器
+
+        Args:
+            user_account (str): 账号
+        """
+
+        self.stale_negatives += 1
+        self.add(user_account)
+
+    def add(self, user_account: str) -> None:
+        """
+        同步新注册的账号
+
+        Args:
+            user_account (str): 账号
+        """
+
+        if self._built:
+            self._filter.add(user_account)
+        if self._building is not None:
+            self._building.add(user_account)
+
+    def remove(self, user_account: str) -> None:
+        """
+        同步删除的账号; 构建中的过滤器不做删除, 以免删除尚未扫描到的账号造成漏判
+
+        Args:
+            user_account (str): 账号
+        """
+
+        if self._built:
+            self._filter.remove(user_account)
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        运行统计
+
+        Returns:
+            dict[str, int | float]: 元素数量、判定次数、误判次数与误判率
+        """
+
+        # 实际不存在的账号中被误判为可能存在的比例
+        absent = self.false_positives + self.negatives
+        return {
+            "entries": len(self._filter),
+            "negatives": self.negatives,
+            "positives": self.positives,
+            "false_positives": self.false_positives,
+            "false_positive_rate": self.false_positives / absent if absent else 0.0,
+            "stale_negatives": self.stale_negatives,
+            "estimated_false_positive_rate": self._filter.estimated_false_positive_rate(),
+        }
+
+    def reset(self) -> None:
+        """清空过滤器与统计, 下次启动时重新构建"""
+        self._filter.clear()
+        self._built = False
+        self.negatives = 0
+        self.positives = 0
+        self.false_positives = 0
+        self.stale_negatives = 0
+
+
+@lru_cache()
+def get_account_filter() -> AccountExistenceFilter:
+    """
+    获取账号布隆过滤器(进程内单例)
+
+    Returns:
+        AccountExistenceFilter: 账号布隆过滤器
+    """
+
+    return AccountExistenceFilter(
+        capacity=settings.account_filter_capacity,
+        error_rate=settings.account_filter_error_rate,
+        snapshot_path=settings.account_filter_snapshot_path,
+        rebuild_interval=settings.account_filter_rebuild_interval_seconds,
+        trust_negatives=(
+            settings.server_workers == 1
+            if settings.account_filter_trust_negatives is None
+            else settings.account_filter_trust_negatives
+        ),
+    )
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import Literal
+
+from tortoise import timezone
+
+from src.app.core import settings
+from src.app.models import AuditEvent, AuditLog
+
+logger = logging.getLogger(__name__)
+
+# 字符串字段的列长度, 超长的值截断后写入
+_FIELD_LIMITS = {
+    name: AuditLog._meta.fields_map[name].max_length
+    for name in ("user_account", "ip", "detail")
+}
+
+
+def _truncate(value: str | None, field: str) -> str | None:
+    limit = _FIELD_LIMITS[field]
+    if value is None or len(value) <= limit:
+        return value
+    return value[:limit]
+
+
+class AuditLogWriter:
+    """
+    审计日志异步批量写入(write-behind)
+
+    记录事件只追加到进程内的有界队列, 不访问数据库; 后台任务在队列达到批量大小或刷新间隔到期时,
+    每批一次 bulk_create 写入, 批量写入失败时逐条重试, 只丢弃写入失败的事件. 队列满时按溢出策略丢弃事件并计数,
+    请求不会因审计日志阻塞或失败; 停止时写入队列中的剩余事件, 进程异常退出时未写入的事件丢失
+    """
+
+    def __init__(
+            self,
+            max_queue: int,
+            batch_size: int,
+            flush_interval: float,
+            overflow: Literal["drop_newest", "drop_oldest"] = "drop_newest",
+            enabled: bool = True,
+    ) -> None:
+        """
+        Args:
+            max_queue (int): 队列容量
+            batch_size (int): 每批写入数量, 队列达到该数量时立即写入
+            flush_interval (float): 刷新间隔秒数
+            overflow (Literal["drop_newest", "drop_oldest"]): 队列满时丢弃新事件或最早的事件
+            enabled (bool): 是否记录, 关闭时忽略全部事件
+        """
+
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow = overflow
+        self._enabled = enabled
+        self._queue: deque[AuditLog] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._closing = False
+        self._task: asyncio.Task | None = None
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        """队列中等待写入的事件数"""
+        return len(self._queue)
+
+    def record(
+            self,
+            event: AuditEvent,
+            user_id: int | None = None,
+            user_account: str | None = None,
+            operator_id: int | None = None,
+            ip: str | None = None,
+            detail: str | None = None,
+    ) -> None:
+        """
+        记录审计事件, 事件时间为调用时间, 超过列长度的字符串截断
+
+        Args:
+            event (AuditEvent): 事件类型
+            user_id (int | None): 用户ID
+            user_account (str | None): 用户账号
+            operator_id (int | None): 操作人ID
+            ip (str | None): 客户端IP
+            detail (str | None): 事件详情
+        """
+
+        if not self._enabled:
+            return
+
+        if len(self._queue) >= self._max_queue:
+            self.dropped += 1
+            if self._overflow == "drop_newest":
+                return
+            self._queue.popleft()
+
+        self._queue.append(AuditLog(
+            event=event,
+            user_id=user_id,
+            user_account=_truncate(user_account, "user_account"),
+            operator_id=operator_id,
+            ip=_truncate(ip, "ip"),
+            detail=_truncate(detail, "detail"),
+            create_time=timezone.now(),
+        ))
+        self.recorded += 1
+        if len(self._queue) >= self._batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """
+        按批写入队列中的全部事件, 批量写入失败时逐条重试, 仍写入失败的事件丢弃并计数
+
+        Returns:
+            int: 写入的事件数
+        """
+
+        written = 0
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self._batch_size, len(self._queue)))]
+            try:
+                await AuditLog.bulk_create(batch)
+            except Exception:
+                logger.warning("审计日志批量写入失败, 逐条重试 %d 条", len(batch), exc_info=True)
+                batch_written = await self._write_each(batch)
+                written += batch_written
+                if not batch_written:
+                    # 整批均写入失败(如数据库不可用), 剩余事件留待下次写入
+                    break
+                continue
+            self.batches += 1
+            written += len(batch)
+        self.written += written
+        return written
+
+    async def _write_each(self, batch: list[AuditLog]) -> int:
+        written = 0
+        for audit_log in batch:
+            try:
+                await audit_log.save()
+            except Exception:
+                self.failed += 1
+                logger.exception("审计日志写入失败, 丢弃: %s", audit_log.event)
+                continue
+            written += 1
+        return written
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            wakeup.clear()
+            await self.flush()
+            if self._closing:
+                return
+
+    async def start(self) -> None:
+        """启动后台写入任务"""
+        if self._enabled and self._task is None:
+            # 事件对象绑定创建时的事件循环, 每次启动重新创建
+            self._wakeup = asyncio.Event()
+            self._closing = False
+            self._task = asyncio.create_task(self._run(self._wakeup))
+
+    async def stop(self) -> None:
+        """停止后台写入任务, 停止前写入队列中的剩余事件"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._wakeup = None
+
+    def reset(self) -> None:
+        """清空队列中未写入的事件"""
+        self._queue.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        写入统计
+
+        Returns:
+            dict[str, int]: 记录、丢弃、写入、写入失败的事件数, 写入批次与等待写入的事件数
+        """
+
+        return {
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+            "pending": self.pending,
+        }
+
+
+@lru_cache()
+def get_audit_log_writer() -> AuditLogWriter:
+    """
+    获取审计日志写入器(进程内单例)
+
+    Returns:
+        AuditLogWriter: 审计日志写入器
+    """
+
+    return AuditLogWriter(
+        max_queue=settings.audit_log_queue_size,
+        batch_size=settings.audit_log_batch_size,
+        flush_interval=settings.audit_log_flush_interval_seconds,
+        overflow=settings.audit_log_overflow,
+        enabled=settings.audit_log_enabled,
+    )
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from src.app.core import settings
+from src.app.models import Users
+
+logger = logging.getLogger(__name__)
+
+
+class UserPurgeJob:
+    """
+    已逻辑删除用户的后台清理任务
+
+    删除时间超过保留期的用户按ID分批物理删除, 每批一次查询与一条 DELETE 语句, 批次之间休眠,
+    避免长时间持有锁或占满连接池; 同一时间只运行一次清理
+    """
+
+    def __init__(self, retention_days: int, chunk_size: int, chunk_sleep: float, interval: int) -> None:
+        """
+        Args:
+            retention_days (int): 逻辑删除后的保留天数
+            chunk_size (int): 每批删除数量
+            chunk_sleep (float): 批次间隔秒数
+            interval (int): 定时清理间隔秒数, 0 表示只能手动触发
+        """
+
+        self._retention = timedelta(days=retention_days)
+        self._chunk_size = chunk_size
+        self._chunk_sleep = chunk_sleep
+        self._interval = interval
+        self._schedule_task: asyncio.Task | None = None
+        self._run_task: asyncio.Task | None = None
+        self.runs = 0
+        self.failures = 0
+        self.chunks = 0
+        self.purged = 0
+        self.current_purged = 0
+        self.last_purged = 0
+        self.last_finished_at = 0.0
+        self.last_duration = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        """是否正在清理"""
+        return self._run_task is not None and not self._run_task.done()
+
+    async def purge(self) -> int:
+        """
+        执行一次完整清理
+
+        Returns:
+            int: 本次物理删除的用户数量
+        """
+
+        cutoff = datetime.now() - self._retention
+        started = time.perf_counter()
+        self.current_purged = 0
+        try:
+            last_id = 0
+            while True:
+                user_ids = await (
+                    Users.all()
+                    .only_deleted()
+                    .filter(id__gt=last_id, delete_time__lt=cutoff)
+                    .order_by("id")
+                    .limit(self._chunk_size)
+                    .values_list("id", flat=True)
+                )
+                if not user_ids:
+                    break
+
+                # 查询与删除之间被恢复的用户不删除
+                purged = await Users.filter(id__in=user_ids, is_deleted=True, delete_time__lt=cutoff).hard_delete()
+                self.chunks += 1
+                self.purged += purged
+                self.current_purged += purged
+
+                if len(user_ids) < self._chunk_size:
+                    break
+                last_id = user_ids[-1]
+                await asyncio.sleep(self._chunk_sleep)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.runs += 1
+            self.last_purged = self.current_purged
+            self.last_finished_at = time.time()
+            self.last_duration = time.perf_counter() - started
+
+        return self.last_purged
+
+    def trigger(self) -> bool:
+        """
+        在后台启动一次清理
+
+        Returns:
+            bool: 是否启动, 已有清理在运行时返回 False
+        """
+
+        if self.is_running:
+            return False
+        self._run_task = asyncio.create_task(self._run())
+        return True
+
+    async def _run(self) -> None:
+        """执行清理并记录异常"""
+        try:
+            purged = await self.purge()
+        except Exception:
+            logger.exception("已删除用户清理失败")
+        else:
+            logger.info("已删除用户清理完成, 删除 %d 条", purged)
+
+    async def _schedule(self) -> None:
+        """定时清理循环"""
+        while True:
+            await asyncio.sleep(self._interval)
+            self.trigger()
+            if self._run_task is not None:
+                await asyncio.shield(self._run_task)
+
+    async def start(self) -> None:
+        """按配置启动定时清理"""
+        if self._interval > 0:
+            self._schedule_task = asyncio.create_task(self._schedule())
+
+    async def stop(self) -> None:
+        """停止定时清理与正在运行的清理, 已完成的批次不回滚"""
+        for task in (self._schedule_task, self._run_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._schedule_task = None
+        self._run_task = None
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        清理进度与统计
+
+        Returns:
+            dict[str, int | float]: 运行状态、当前进度与累计删除数量
+        """
+
+        return {
+            "running": int(self.is_running),
+            "runs": self.runs,
+            "failures": self.failures,
+            "chunks": self.chunks,
+            "purged": self.purged,
+            "current_purged": self.current_purged,
+            "last_purged": self.last_purged,
+            "last_finished_at": self.last_finished_at,
+            "last_duration_seconds": self.last_duration,
+        }
+
+
+@lru_cache()
+def get_user_purge_job() -> UserPurgeJob:
+    """
+    获取已删除用户清理任务(进程内单例)
+
+    Returns:
+        UserPurgeJob: 清理任务
+    """
+
+    return UserPurgeJob(
+        retention_days=settings.user_purge_retention_days,
+        chunk_size=settings.user_purge_chunk_size,
+        chunk_sleep=settings.user_purge_chunk_sleep_seconds,
+        interval=settings.user_purge_interval_seconds,
+    )
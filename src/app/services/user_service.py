@@ -1,17 +1,119 @@
-import hashlib
+import asyncio
+import codecs
+import csv
+import io
+import json
 import re
+from collections.abc import AsyncIterator
+from typing import Literal
 
 from fastapi.requests import Request
-from tortoise.transactions import atomic
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import atomic, in_transaction
 
+from src.app.auth import Principal, SessionManager, TokenService, get_optional_token_service, get_password_hasher
+from src.app.cache import get_user_cache
 from src.app.common import StatusCode
 from src.app.exceptions import BusinessException
-from src.app.models import Users
-from src.app.schemas import SafetyUser
-from src.app.utils import NoInstantiableMeta, StringUtils
-from datetime import datetime
-from src.app.constants.user_constants import USER_LOGIN_STATE
-from src.app.core import settings
+from src.app.models import AuditEvent, SoftDeleteQuerySet, Users
+from src.app.core import get_replica_routing, read_primary, replica_read, set_consistency_key, settings
+from src.app.schemas import (
+    SAFETY_USER_FIELDS,
+    SafetyUser,
+    SafetyUserPage,
+    TokenPair,
+    UserBatchRequest,
+    UserBatchResult,
+    UserImportError,
+    UserImportResult,
+)
+from src.app.utils import CursorUtils, NoInstantiableMeta, StringUtils
+from .account_filter import get_account_filter
+from .audit_log import get_audit_log_writer
+from .username_index import get_username_index
+
+# 账号与用户名最大长度, 与 users 表的列长度一致
+_MAX_ACCOUNT_LENGTH = Users._meta.fields_map["user_account"].max_length
+_MAX_USERNAME_LENGTH = Users._meta.fields_map["username"].max_length
+
+# 按 pg_trgm 相似度排序的用户名模糊搜索, 由 GIN 三元组索引支持 ILIKE 与 % 运算符
+_FUZZY_SEARCH_SQL = """
+SELECT "id", "username", "user_account", "avatar_url", "gender", "user_role", "phone", "email", "user_status",
+       "create_time"
+FROM "users"
+WHERE "is_deleted" = false AND ("username" ILIKE $1 OR "username" % $2)
+ORDER BY "username" ILIKE $1 DESC, similarity("username", $2) DESC, "id"
+LIMIT $3
+"""
+
+# 批量导入的一行: 行号, 账号, 明文密码, 用户名
+type ImportRow = tuple[int, str, str, str | None]
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    将字节流按行切分, 兼容 UTF-8 BOM 与 CRLF 换行
+
+    Args:
+        chunks (AsyncIterator[bytes]): 字节流
+
+    Yields:
+        str: 一行文本(不含换行符)
+
+    Raises:
+        BusinessException: 文件编码错误
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.removesuffix("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise BusinessException(StatusCode.PARAMS_ERROR, "文件编码错误")
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def _iter_import_rows(
+        chunks: AsyncIterator[bytes],
+        import_format: Literal["ndjson", "csv"],
+) -> AsyncIterator[tuple[int, dict | None]]:
+    """
+    解析导入文件的数据行, 跳过空行; csv 首行为表头
+
+    Args:
+        chunks (AsyncIterator[bytes]): 字节流
+        import_format (Literal["ndjson", "csv"]): 文件格式
+
+    Yields:
+        tuple[int, dict | None]: 行号与字段, 无法解析时字段为 None
+    """
+
+    header: list[str] | None = None
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+
+        if import_format == "ndjson":
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        yield line_number, dict(zip(header, values)) if len(values) == len(header) else None
 
 
 class UserService(metaclass=NoInstantiableMeta):
@@ -19,11 +121,13 @@ class UserService(metaclass=NoInstantiableMeta):
     用户服务
     """
 
-    __SALT = settings.salt
-
     @staticmethod
-    @atomic()
-    async def user_register(user_account: str, user_password: str, confirm_password: str) -> int:
+    async def user_register(
+            user_account: str,
+            user_password: str,
+            confirm_password: str,
+            client_ip: str | None = None,
+    ) -> int:
         """
         用户注册
 
@@ -31,6 +135,7 @@ class UserService(metaclass=NoInstantiableMeta):
             user_account (str): 账户
             user_password (str): 用户密码
             confirm_password (str): 确认密码
+            client_ip (str | None): 客户端IP, 记录审计日志
 
         Returns:
             int: 用户ID
@@ -41,12 +146,54 @@ class UserService(metaclass=NoInstantiableMeta):
         """
 
         # 1. 校验
+        UserService.__validate_credentials(user_account, user_password, confirm_password)
+
+        # 2. 加密(在进程池中计算, 不占用事务连接)
+        encrypt_password = await get_password_hasher().hash(user_password)
+
+        # 3. 插入数据(布隆过滤器判定账号一定不存在时跳过查重, 并发注册同一账号时由唯一索引兜底);
+        # 之后的读己之写窗口内, 本进程对该账号的读取走主库
+        set_consistency_key(f"account:{user_account}")
+        account_filter = get_account_filter()
+        try:
+            user = await UserService.__create_user(
+                user_account, encrypt_password, account_filter.might_contain(user_account)
+            )
+        except IntegrityError:
+            raise BusinessException(StatusCode.PARAMS_ERROR, "账号重复")
+
+        # 4. 同步账号过滤器与用户名搜索索引
+        account_filter.add(user_account)
+        get_username_index().add(user.id, user.username)
+
+        get_audit_log_writer().record(AuditEvent.REGISTER, user_id=user.id, user_account=user_account, ip=client_ip)
+
+        return user.id
+
+    @staticmethod
+    def __validate_credentials(user_account: str, user_password: str, confirm_password: str | None = None) -> None:
+        """
+        校验账号密码格式, 注册、登录与批量导入共用
+
+        Args:
+            user_account (str): 账户
+            user_password (str): 用户密码
+            confirm_password (str | None): 确认密码, 为空时不校验
+
+        Raises:
+            BusinessException: 参数为空 | 用户账号过短 | 用户账号过长 | 用户密码过短 | 账号存在特殊符号 | 密码与确认密码不一致
+        """
+
+        passwords = (user_password,) if confirm_password is None else (user_password, confirm_password)
+
         # 符合字符长度
-        if StringUtils.is_any_blank(user_account, user_password, confirm_password):
+        if StringUtils.is_any_blank(user_account, *passwords):
             raise BusinessException(StatusCode.PARAMS_ERROR, "参数为空")
         if len(user_account) < 4:
             raise BusinessException(StatusCode.PARAMS_ERROR, "用户账号过短")
-        if len(user_password) < 8 or len(confirm_password) < 8:
+        if len(user_account) > _MAX_ACCOUNT_LENGTH:
+            raise BusinessException(StatusCode.PARAMS_ERROR, "用户账号过长")
+        if any(len(password) < 8 for password in passwords):
             raise BusinessException(StatusCode.PARAMS_ERROR, "用户密码过短")
 
         # 账户不能包含特殊字符
@@ -55,21 +202,136 @@ class UserService(metaclass=NoInstantiableMeta):
             raise BusinessException(StatusCode.PARAMS_ERROR, "账号存在特殊符号")
 
         # 密码和确认密码相同
-        if user_password != confirm_password:
+        if confirm_password is not None and user_password != confirm_password:
             raise BusinessException(StatusCode.PARAMS_ERROR, "密码与确认密码不一致")
 
+    @staticmethod
+    @atomic()
+    async def __create_user(user_account: str, encrypt_password: str, check_exists: bool = True) -> Users:
+        """
+        在事务中校验账号唯一并插入用户
+
+        Args:
+            user_account (str): 账户
+            encrypt_password (str): 密码哈希
+            check_exists (bool): 是否查询账号是否已存在
+
+        Returns:
+            Users: 新用户
+
+        Raises:
+            BusinessException: 账号重复
+        """
+
         # 账户不能重复
+        if check_exists:
+            is_exist = await Users.filter(user_account=user_account).exists()
+            if is_exist:
+                raise BusinessException(StatusCode.PARAMS_ERROR, "账号重复")
+            get_account_filter().record_false_positive()
+
+        return await Users.create(user_account=user_account, user_password=encrypt_password)
+
+    @staticmethod
+    @replica_read
+    async def user_account_exists(user_account: str) -> bool:
+        """
+        账号是否已被注册, 布隆过滤器判定一定不存在且过滤器包含全部账号(单工作进程)时不查询数据库
+
+        Args:
+            user_account (str): 账户
+
+        Returns:
+            bool: 账号是否已存在
+
+        Raises:
+            BusinessException: 参数为空
+        """
+
+        if StringUtils.is_any_blank(user_account):
+            raise BusinessException(StatusCode.PARAMS_ERROR, "参数为空")
+
+        account_filter = get_account_filter()
+        might_exist = account_filter.might_contain(user_account)
+        if not might_exist and account_filter.trust_negatives:
+            return False
+
         is_exist = await Users.filter(user_account=user_account).exists()
-        if is_exist:
-            raise BusinessException(StatusCode.PARAMS_ERROR, "账号重复")
+        if might_exist and not is_exist:
+            account_filter.record_false_positive()
+        elif not might_exist and is_exist:
+            account_filter.record_stale_negative(user_account)
 
-        # 2. 加密
-        encrypt_password = hashlib.md5((UserService.__SALT + user_password).encode()).hexdigest()
+        return is_exist
 
-        # 3. 插入数据
-        user = await Users.create(user_account=user_account, user_password=encrypt_password)
+    @staticmethod
+    async def __authenticate(user_account: str, user_password: str, client_ip: str | None, method: str) -> Users:
+        """
+        校验账号密码, 账号不存在或密码错误时记录登录失败, 通过时记录登录成功
 
-        return user.id
+        Args:
+            user_account (str): 账户
+            user_password (str): 用户密码
+            client_ip (str | None): 客户端IP
+            method (str): 登录方式(session / token)
+
+        Returns:
+            Users: 用户
+
+        Raises:
+            BusinessException: 参数为空 | 用户账号过短 | 用户密码过短 | 账号存在特殊符号 | 账号和密码不匹配
+        """
+
+        # 1. 校验
+        UserService.__validate_credentials(user_account, user_password)
+
+        # 2. 查询用户是否存在
+        set_consistency_key(f"account:{user_account}")
+        audit_log_writer = get_audit_log_writer()
+        user = await UserService.__find_user_by_account(user_account)
+        if user is None:
+            audit_log_writer.record(
+                AuditEvent.LOGIN_FAILURE, user_account=user_account, ip=client_ip, detail="账号不存在"
+            )
+            raise BusinessException(StatusCode.PARAMS_ERROR, "账号和密码不匹配")
+
+        # 3. 校验密码(在进程池中计算)
+        is_valid, upgraded_password = await get_password_hasher().verify(user_password, user.user_password)
+        if not is_valid:
+            audit_log_writer.record(
+                AuditEvent.LOGIN_FAILURE, user_id=user.id, user_account=user_account, ip=client_ip, detail="密码错误"
+            )
+            raise BusinessException(StatusCode.PARAMS_ERROR, "账号和密码不匹配")
+        audit_log_writer.record(
+            AuditEvent.LOGIN_SUCCESS, user_id=user.id, user_account=user_account, ip=client_ip, detail=method
+        )
+
+        # 旧版 MD5 或参数过时的密码哈希在登录成功时透明升级
+        if upgraded_password is not None:
+            await Users.filter(id=user.id).update(user_password=upgraded_password)
+            user.user_password = upgraded_password
+
+        return user
+
+    @staticmethod
+    @replica_read
+    async def __find_user_by_account(user_account: str) -> Users | None:
+        """
+        通过账号查询用户, 优先读取副本; 副本可能尚未同步其他进程刚注册的账号, 未命中时回退主库
+
+        Args:
+            user_account (str): 账户
+
+        Returns:
+            Users | None: 用户, 不存在时返回 None
+        """
+
+        user = await Users.filter(user_account=user_account).first()
+        if user is None and get_replica_routing().enabled:
+            with read_primary():
+                user = await Users.filter(user_account=user_account).first()
+
+        return user
 
     @staticmethod
     async def user_login(user_account: str, user_password: str, request: Request) -> SafetyUser:
@@ -88,38 +350,102 @@ class UserService(metaclass=NoInstantiableMeta):
             BusinessException: 参数为空 | 用户账号过短 | 用户密码过短 | 账号存在特殊符号 | 账号和密码不匹配
         """
 
-        # 1. 校验
-        # 符合字符长度
-        if StringUtils.is_any_blank(user_account, user_password):
-            raise BusinessException(StatusCode.PARAMS_ERROR, "参数为空")
-        if len(user_account) < 4:
-            raise BusinessException(StatusCode.PARAMS_ERROR, "用户账号过短")
-        if len(user_password) < 8:
-            raise BusinessException(StatusCode.PARAMS_ERROR, "用户密码过短")
+        client_ip = request.client.host if request.client else None
+        user = await UserService.__authenticate(user_account, user_password, client_ip, "session")
 
-        # 账户不能包含特殊字符
-        find_special_char = re.search(r'[^\w\s]|\s+', user_account)
-        if find_special_char:
-            raise BusinessException(StatusCode.PARAMS_ERROR, "账号存在特殊符号")
+        # 用户脱敏
+        safety_user = SafetyUser.from_model(user)
 
-        # 2. 加密
-        encrypt_password = hashlib.md5((UserService.__SALT + user_password).encode()).hexdigest()
+        # 记录用户的登录态
+        principal = Principal(user.id, user.user_role, user.user_status)
+        await SessionManager.login(request, principal.dumps())
 
-        # 3. 查询用户是否存在
-        user = await Users.get_or_none(user_account=user_account, user_password=encrypt_password)
-        if user is None:
-            raise BusinessException(StatusCode.PARAMS_ERROR, "账号和密码不匹配")
+        return safety_user
 
-        # 4. 用户脱敏
-        safety_user = SafetyUser.model_validate(user)
+    @staticmethod
+    async def user_token_login(user_account: str, user_password: str, client_ip: str | None = None) -> TokenPair:
+        """
+        用户令牌登录
 
-        # 5. 记录用户的登录态
-        request.session.update({USER_LOGIN_STATE: safety_user.model_dump_json()})
+        Args:
+            user_account (str): 账户
+            user_password (str): 用户密码
+            client_ip (str | None): 客户端IP, 记录审计日志
 
-        return safety_user
+        Returns:
+            TokenPair: 访问令牌与刷新令牌
+
+        Raises:
+            BusinessException: 令牌认证未启用 | 参数为空 | 用户账号过短 | 用户密码过短 | 账号存在特殊符号 | 账号和密码不匹配
+        """
+
+        # 在校验密码与记录审计日志之前确认令牌认证可用
+        token_service = UserService.__require_token_service()
+        user = await UserService.__authenticate(user_account, user_password, client_ip, "token")
+
+        principal = Principal(user.id, user.user_role, user.user_status)
+        return token_service.issue_token_pair(principal)
+
+    @staticmethod
+    def __require_token_service() -> TokenService:
+        """
+        获取令牌服务
+
+        Returns:
+            TokenService: 令牌服务
+
+        Raises:
+            BusinessException: 令牌认证未启用(未配置密钥对)
+        """
+
+        token_service = get_optional_token_service()
+        if token_service is None:
+            raise BusinessException(StatusCode.NOT_LOGIN, "令牌认证未启用")
+        return token_service
+
+    @staticmethod
+    async def refresh_token(refresh_token: str) -> TokenPair:
+        """
+        使用刷新令牌换取新的令牌对, 用户角色与状态以数据库为准
+
+        Args:
+            refresh_token (str): 刷新令牌
+
+        Returns:
+            TokenPair: 访问令牌与刷新令牌
+
+        Raises:
+            BusinessException: 令牌认证未启用 | 令牌无效 | 令牌已过期 | 令牌类型不匹配 | 用户不存在
+        """
+
+        token_service = UserService.__require_token_service()
+        principal = token_service.verify(refresh_token, "refresh")
+
+        user = await Users.get_or_none(id=principal.id)
+        if user is None:
+            raise BusinessException(StatusCode.NOT_LOGIN, "用户不存在")
+
+        return token_service.issue_token_pair(Principal(user.id, user.user_role, user.user_status))
 
     @staticmethod
     async def get_user_by_id(user_id: int) -> SafetyUser:
+        """
+        通过用户ID查询用户信息, 优先读取缓存
+
+        Args:
+            user_id (int): 用户ID
+
+        Returns:
+            SafetyUser: 用户信息(脱敏)
+
+        Raises:
+            BusinessException: 用户不存在
+        """
+
+        return await get_user_cache().get_or_load(user_id, UserService.__load_user_by_id)
+
+    @staticmethod
+    async def __load_user_by_id(user_id: int) -> SafetyUser:
         """
         通过用户ID从数据库查询用户信息
 
@@ -133,63 +459,580 @@ class UserService(metaclass=NoInstantiableMeta):
             BusinessException: 用户不存在
         """
 
-        # 查询用户是否存在
-        user = await Users.get_or_none(id=user_id)
-        if user is None:
+        # 查询用户是否存在(只查询脱敏字段, 不构造 ORM 实例); 结果会写入缓存, 读取主库,
+        # 避免副本延迟的旧数据在缓存中保留整个过期时间
+        rows = await Users.filter(id=user_id).limit(1).values_list(*SAFETY_USER_FIELDS)
+        if not rows:
             # TODO: 修改描述，使其符合异常情况
             raise BusinessException(StatusCode.PARAMS_ERROR, "用户不存在")
 
-        # 用户信息脱敏
-        safety_user = SafetyUser.model_validate(user)
+        # 用户信息脱敏(数据库中的数据写入时已校验)
+        safety_user = SafetyUser.from_row(rows[0])
 
         return safety_user
 
 
     @staticmethod
-    async def search_users_by_username(username: str) -> list[SafetyUser]:
+    @replica_read
+    async def search_users_by_username(
+            username: str,
+            cursor: str | None = None,
+            limit: int = settings.search_default_limit,
+    ) -> SafetyUserPage:
         """
-        搜索用户
+        搜索用户(按ID游标分页)
 
         Args:
-            username (str): 用户名
+            username (str): 用户名, 为空时列出全部用户
+            cursor (str | None): 上一页返回的游标, 为空时从第一页开始
+            limit (int): 每页数量, 超过上限时按上限返回
 
         Returns:
-            list[SafetyUser]: 用户信息列表(脱敏)
+            SafetyUserPage: 用户信息分页结果(脱敏)
+
+        Raises:
+            BusinessException: 每页数量不为正整数 | 游标无效
         """
 
+        if limit <= 0:
+            raise BusinessException(StatusCode.PARAMS_ERROR, "每页数量不为正整数")
+        limit = min(limit, settings.search_max_limit)
+
         # 包含用户名查询或获取全部用户
+        query = Users.all()
         if StringUtils.is_not_blank(username):
-            users = await Users.filter(username__contains=username)
-        else:
-            users = await Users.all()
+            query = query.filter(username__contains=username)
+
+        # 从上一页最后一条记录之后继续查询
+        if cursor:
+            try:
+                query = query.filter(id__gt=CursorUtils.decode(cursor))
+            except ValueError:
+                raise BusinessException(StatusCode.PARAMS_ERROR, "游标无效")
+
+        # 多取一条用于判断是否存在下一页
+        rows = await query.order_by("id").limit(limit + 1).values_list(*SAFETY_USER_FIELDS)
+        has_next = len(rows) > limit
+        rows = rows[:limit]
 
         # 用户信息脱敏
-        safety_users_list = [SafetyUser.model_validate(user) for user in users]
+        safety_users_list = [SafetyUser.from_row(row) for row in rows]
+        next_cursor = CursorUtils.encode(safety_users_list[-1].id) if has_next else None
 
-        return safety_users_list
+        return SafetyUserPage(items=safety_users_list, next_cursor=next_cursor)
+
+    @staticmethod
+    @replica_read
+    async def fuzzy_search_users_by_username(
+            username: str,
+            limit: int = settings.search_default_limit,
+    ) -> SafetyUserPage:
+        """
+        模糊搜索用户: 子串匹配优先, 其次按三元组相似度排序
+
+        PostgreSQL 使用 pg_trgm GIN 索引, 其他数据库使用进程内三元组索引
+
+        Args:
+            username (str): 用户名片段
+            limit (int): 返回数量, 超过上限时按上限返回
+
+        Returns:
+            SafetyUserPage: 用户信息(脱敏), 结果按相关度排序且不分页
+
+        Raises:
+            BusinessException: 搜索用户名为空 | 每页数量不为正整数
+        """
+
+        if StringUtils.is_any_blank(username):
+            raise BusinessException(StatusCode.PARAMS_ERROR, "搜索用户名为空")
+        if limit <= 0:
+            raise BusinessException(StatusCode.PARAMS_ERROR, "每页数量不为正整数")
+        limit = min(limit, settings.search_max_limit)
+
+        db = Users._choose_db()
+        if db.capabilities.dialect == "postgres":
+            escaped = username.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            rows = await db.execute_query_dict(_FUZZY_SEARCH_SQL, [f"%{escaped}%", username, limit])
+            safety_users_list = [SafetyUser.from_row([row[field] for field in SAFETY_USER_FIELDS]) for row in rows]
+        else:
+            username_index = get_username_index()
+            await username_index.ensure_built()
+            user_ids = username_index.search(username, limit)
+            rows = await Users.filter(id__in=user_ids).values_list(*SAFETY_USER_FIELDS)
+            users = {safety_user.id: safety_user for safety_user in map(SafetyUser.from_row, rows)}
+            safety_users_list = [users[user_id] for user_id in user_ids if user_id in users]
+
+        return SafetyUserPage(items=safety_users_list, next_cursor=None)
+
+    @staticmethod
+    @replica_read
+    async def iter_users(chunk_size: int = settings.export_chunk_size) -> AsyncIterator[list[SafetyUser]]:
+        """
+        按ID顺序分批遍历全部用户, 每批一次独立查询, 内存占用与总量无关
+
+        Args:
+            chunk_size (int): 每批数量
+
+        Yields:
+            list[SafetyUser]: 一批用户信息(脱敏)
+        """
+
+        last_id = 0
+        while True:
+            rows = await Users.filter(id__gt=last_id).order_by("id").limit(chunk_size).values_list(*SAFETY_USER_FIELDS)
+            if not rows:
+                return
+
+            safety_users = [SafetyUser.from_row(row) for row in rows]
+            yield safety_users
+
+            if len(rows) < chunk_size:
+                return
+            last_id = safety_users[-1].id
+
+    @staticmethod
+    async def export_users(
+            export_format: Literal["ndjson", "csv"],
+            chunk_size: int = settings.export_chunk_size,
+    ) -> AsyncIterator[str]:
+        """
+        流式导出全部用户
+
+        Args:
+            export_format (Literal["ndjson", "csv"]): 导出格式
+            chunk_size (int): 每批数量
+
+        Yields:
+            str: 一批已编码的用户数据, csv 格式首先输出表头
+        """
+
+        fields = list(SafetyUser.model_fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(fields)
+            yield buffer.getvalue()
+
+        async for safety_users in UserService.iter_users(chunk_size):
+            if export_format == "ndjson":
+                yield "".join(f"{safety_user.model_dump_json()}\n" for safety_user in safety_users)
+                continue
+
+            buffer.seek(0)
+            buffer.truncate()
+            for safety_user in safety_users:
+                row = safety_user.model_dump(mode="json")
+                writer.writerow("" if row[field] is None else row[field] for field in fields)
+            yield buffer.getvalue()
+
+    @staticmethod
+    async def import_users(
+            chunks: AsyncIterator[bytes],
+            import_format: Literal["ndjson", "csv"],
+            batch_size: int = settings.import_batch_size,
+    ) -> UserImportResult:
+        """
+        流式批量导入用户, 校验规则与注册一致; 出错的行记录后跳过, 不影响其他行
+
+        每批账号一次查重、一次批量插入, 下一批的密码哈希与上一批的写入并行进行
+
+        Args:
+            chunks (AsyncIterator[bytes]): 上传文件字节流, 每行包含 user_account、user_password, 可选 username
+            import_format (Literal["ndjson", "csv"]): 文件格式
+            batch_size (int): 每批数量
+
+        Returns:
+            UserImportResult: 导入结果
+
+        Raises:
+            BusinessException: 文件编码错误 | 系统繁忙
+        """
+
+        result = UserImportResult()
+        seen_accounts: set[str] = set()
+        batch: list[ImportRow] = []
+        hashing: asyncio.Task | None = None
+
+        try:
+            async for line, row in _iter_import_rows(chunks, import_format):
+                result.total += 1
+                if row is None:
+                    UserService.__record_import_error(result, line, None, "数据格式错误")
+                    continue
+
+                user_account, user_password, username = (
+                    "" if row.get(key) is None else str(row[key])
+                    for key in ("user_account", "user_password", "username")
+                )
+                try:
+                    UserService.__validate_credentials(user_account, user_password)
+                except BusinessException as e:
+                    UserService.__record_import_error(result, line, user_account or None, e.description)
+                    continue
+                if len(username) > _MAX_USERNAME_LENGTH:
+                    UserService.__record_import_error(result, line, user_account, "用户名过长")
+                    continue
+                if user_account in seen_accounts:
+                    UserService.__record_import_error(result, line, user_account, "账号重复")
+                    continue
+
+                seen_accounts.add(user_account)
+                batch.append((line, user_account, user_password, username or None))
+                if len(batch) >= batch_size:
+                    hashing = await UserService.__pipeline_import_batch(hashing, batch, result)
+                    batch = []
+
+            hashing = await UserService.__pipeline_import_batch(hashing, batch, result)
+            await UserService.__pipeline_import_batch(hashing, [], result)
+        finally:
+            if hashing is not None and not hashing.done():
+                hashing.cancel()
+
+        # 查重错误在写入时才产生, 按行号排序
+        result.errors.sort(key=lambda error: error.line)
+        return result
+
+    @staticmethod
+    async def __pipeline_import_batch(
+            hashing: asyncio.Task | None,
+            batch: list[ImportRow],
+            result: UserImportResult,
+    ) -> asyncio.Task | None:
+        """
+        提交本批的密码哈希计算, 同时写入上一批
+
+        Args:
+            hashing (asyncio.Task | None): 上一批的哈希任务
+            batch (list[ImportRow]): 本批数据, 为空时只写入上一批
+            result (UserImportResult): 导入结果
+
+        Returns:
+            asyncio.Task | None: 本批的哈希任务
+        """
+
+        next_hashing = asyncio.create_task(UserService.__hash_import_batch(batch)) if batch else None
+        try:
+            if hashing is not None:
+                await UserService.__insert_import_batch(*await hashing, result)
+        except BaseException:
+            if next_hashing is not None:
+                next_hashing.cancel()
+            raise
+
+        return next_hashing
+
+    @staticmethod
+    async def __hash_import_batch(batch: list[ImportRow]) -> tuple[list[ImportRow], list[str]]:
+        """
+        并行计算一批密码哈希
+
+        Args:
+            batch (list[ImportRow]): 本批数据
+
+        Returns:
+            tuple[list[ImportRow], list[str]]: 本批数据与对应的密码哈希
+        """
+
+        return batch, await get_password_hasher().hash_many([row[2] for row in batch])
+
+    @staticmethod
+    async def __insert_import_batch(batch: list[ImportRow], hashes: list[str], result: UserImportResult) -> None:
+        """
+        查重并批量插入一批用户, 与并发注册冲突时逐行插入以定位冲突行
+
+        Args:
+            batch (list[ImportRow]): 本批数据
+            hashes (list[str]): 对应的密码哈希
+            result (UserImportResult): 导入结果
+        """
+
+        # 布隆过滤器判定一定不存在的账号无需查重
+        account_filter = get_account_filter()
+        candidates = [row[1] for row in batch if account_filter.might_contain(row[1])]
+        existing = set()
+        if candidates:
+            existing = set(await Users.filter(user_account__in=candidates).values_list("user_account", flat=True))
+
+        lines: list[int] = []
+        users: list[Users] = []
+        for (line, user_account, _, username), encrypt_password in zip(batch, hashes):
+            if user_account in existing:
+                UserService.__record_import_error(result, line, user_account, "账号重复")
+                continue
+            lines.append(line)
+            users.append(Users(user_account=user_account, user_password=encrypt_password, username=username))
+
+        if not users:
+            return
+
+        try:
+            async with in_transaction():
+                await Users.bulk_create(users)
+            created = users
+        except IntegrityError:
+            created = []
+            for line, user in zip(lines, users):
+                try:
+                    await user.save()
+                    created.append(user)
+                except IntegrityError:
+                    UserService.__record_import_error(result, line, user.user_account, "账号重复")
+
+        # 同步账号过滤器, 用户名索引在下次搜索时重建
+        result.created += len(created)
+        for user in created:
+            account_filter.add(user.user_account)
+        if any(user.username for user in created):
+            get_username_index().reset()
+
+    @staticmethod
+    def __record_import_error(result: UserImportResult, line: int, user_account: str | None, description: str) -> None:
+        """
+        记录导入失败的行, 超过上限的错误只计数
+
+        Args:
+            result (UserImportResult): 导入结果
+            line (int): 行号
+            user_account (str | None): 账号
+            description (str): 错误描述
+        """
+
+        result.failed += 1
+        if len(result.errors) < settings.import_max_reported_errors:
+            result.errors.append(UserImportError(line=line, user_account=user_account, description=description))
 
     @staticmethod
-    @atomic()
     async def delete_user_by_id(user_id: int) -> bool:
         """
-        搜索用户
+        逻辑删除用户, 事务提交后同步用户缓存、账号过滤器与用户名搜索索引
 
         Args:
             user_id (int): 用户ID
 
         Returns:
             bool: 用户是否删除成功(逻辑)
+
+        Raises:
+            BusinessException: 用户不存在
+        """
+
+        user_accounts = await UserService.__soft_delete_user(user_id)
+
+        # 提交后再失效, 避免其他连接在提交前读到未删除的用户并重新写入缓存; 回滚时不修改过滤器与索引
+        await get_user_cache().invalidate(user_id)
+        for user_account in user_accounts:
+            if user_account is not None:
+                get_account_filter().remove(user_account)
+        get_username_index().remove(user_id)
+
+        return True
+
+    @staticmethod
+    @atomic()
+    async def __soft_delete_user(user_id: int) -> list[str | None]:
+        """
+        在事务中逻辑删除用户
+
+        Args:
+            user_id (int): 用户ID
+
+        Returns:
+            list[str | None]: 被删除用户的账号
+
+        Raises:
+            BusinessException: 用户不存在
         """
 
-        # 逻辑删除用户
-        is_deleted = bool(await Users.filter(id=user_id).update(is_deleted=True, delete_time=datetime.now()))
+        user_accounts = await Users.filter(id=user_id).limit(1).values_list("user_account", flat=True)
+        is_deleted = bool(await Users.filter(id=user_id).soft_delete())
         if not is_deleted:
             raise BusinessException(StatusCode.PARAMS_ERROR, "用户不存在")
 
-        return is_deleted
+        return user_accounts
+
+    @staticmethod
+    def __batch_queryset(batch_request: UserBatchRequest) -> SoftDeleteQuerySet[Users]:
+        """
+        按批量条件构造查询集
+
+        Args:
+            batch_request (UserBatchRequest): 批量条件
+
+        Returns:
+            SoftDeleteQuerySet[Users]: 查询集
+
+        Raises:
+            BusinessException: 批量条件为空 | 用户ID不为正整数 | 批量数量超过上限
+        """
+
+        query = Users.all()
+        has_condition = False
+        if batch_request.user_ids is not None:
+            if any(user_id <= 0 for user_id in batch_request.user_ids):
+                raise BusinessException(StatusCode.PARAMS_ERROR, "用户ID不为正整数")
+            if len(batch_request.user_ids) > settings.user_batch_max_size:
+                raise BusinessException(StatusCode.PARAMS_ERROR, "批量数量超过上限")
+            query = query.filter(id__in=batch_request.user_ids)
+            has_condition = True
+        if batch_request.username is not None and StringUtils.is_not_blank(batch_request.username):
+            query = query.filter(username__contains=batch_request.username)
+            has_condition = True
+        if batch_request.user_status is not None:
+            query = query.filter(user_status=batch_request.user_status)
+            has_condition = True
+        if batch_request.created_before is not None:
+            query = query.filter(create_time__lt=batch_request.created_before)
+            has_condition = True
+
+        # 不允许无条件操作全部用户
+        if not has_condition:
+            raise BusinessException(StatusCode.PARAMS_ERROR, "批量条件为空")
+
+        return query
+
+    @staticmethod
+    async def delete_users(batch_request: UserBatchRequest) -> UserBatchResult:
+        """
+        批量逻辑删除用户, 一次查询匹配的用户, 一条 UPDATE ... WHERE id IN (...) 完成删除,
+        事务提交后同步用户缓存、账号过滤器与用户名搜索索引
+
+        Args:
+            batch_request (UserBatchRequest): 批量条件
+
+        Returns:
+            UserBatchResult: 删除的用户ID, 超出单次上限时 has_more 为 True
+
+        Raises:
+            BusinessException: 批量条件为空 | 用户ID不为正整数 | 批量数量超过上限
+        """
+
+        rows, has_more = await UserService.__soft_delete_users(batch_request)
+        user_ids = [user_id for user_id, _ in rows]
+
+        # 提交后再失效, 避免其他连接在提交前读到未删除的用户并重新写入缓存
+        await get_user_cache().invalidate_many(user_ids)
+        account_filter = get_account_filter()
+        username_index = get_username_index()
+        for user_id, user_account in rows:
+            if user_account is not None:
+                account_filter.remove(user_account)
+            username_index.remove(user_id)
+
+        return UserBatchResult(user_ids=user_ids, has_more=has_more)
+
+    @staticmethod
+    @atomic()
+    async def __soft_delete_users(batch_request: UserBatchRequest) -> tuple[list[tuple[int, str | None]], bool]:
+        """
+        在事务中批量逻辑删除用户
+
+        Args:
+            batch_request (UserBatchRequest): 批量条件
+
+        Returns:
+            tuple[list[tuple[int, str | None]], bool]: 被删除用户的ID与账号, 是否超出单次上限
+
+        Raises:
+            BusinessException: 批量条件为空 | 用户ID不为正整数 | 批量数量超过上限
+        """
+
+        limit = settings.user_batch_max_size
+        query = UserService.__batch_queryset(batch_request)
+        rows = await query.order_by("id").limit(limit + 1).values_list("id", "user_account")
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        user_ids = [user_id for user_id, _ in rows]
+        if user_ids:
+            await Users.filter(id__in=user_ids).soft_delete()
+
+        return rows, has_more
+
+    @staticmethod
+    async def restore_users(batch_request: UserBatchRequest) -> UserBatchResult:
+        """
+        批量恢复已逻辑删除的用户, 一条 UPDATE ... WHERE id IN (...) 完成恢复,
+        事务提交后同步用户缓存、账号过滤器与用户名搜索索引
+
+        账号已被未删除用户占用的记录不恢复; 同一账号存在多条已删除记录时只恢复最新的一条
+
+        Args:
+            batch_request (UserBatchRequest): 批量条件
+
+        Returns:
+            UserBatchResult: 恢复的用户ID与未恢复的用户ID, 超出单次上限时 has_more 为 True
+
+        Raises:
+            BusinessException: 批量条件为空 | 用户ID不为正整数 | 批量数量超过上限 | 账号重复
+        """
+
+        restored, skipped, has_more = await UserService.__restore_users(batch_request)
+        user_ids = sorted(user_id for user_id, _, _ in restored)
+
+        # 提交后再失效并同步过滤器与索引, 回滚时不修改
+        await get_user_cache().invalidate_many(user_ids)
+        account_filter = get_account_filter()
+        username_index = get_username_index()
+        for user_id, user_account, username in restored:
+            if user_account is not None:
+                account_filter.add(user_account)
+            username_index.add(user_id, username)
+
+        return UserBatchResult(user_ids=user_ids, skipped=sorted(skipped), has_more=has_more)
+
+    @staticmethod
+    @atomic()
+    async def __restore_users(
+            batch_request: UserBatchRequest,
+    ) -> tuple[list[tuple[int, str | None, str | None]], list[int], bool]:
+        """
+        在事务中批量恢复已逻辑删除的用户
+
+        Args:
+            batch_request (UserBatchRequest): 批量条件
+
+        Returns:
+            tuple[list[tuple[int, str | None, str | None]], list[int], bool]:
+                恢复用户的ID、账号与用户名, 未恢复的用户ID, 是否超出单次上限
+
+        Raises:
+            BusinessException: 批量条件为空 | 用户ID不为正整数 | 批量数量超过上限 | 账号重复
+        """
+
+        limit = settings.user_batch_max_size
+        query = UserService.__batch_queryset(batch_request).only_deleted()
+        rows = await query.order_by("-id").limit(limit + 1).values_list("id", "user_account", "username")
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # 跳过账号已被占用的记录
+        user_accounts = list({user_account for _, user_account, _ in rows if user_account is not None})
+        taken = set()
+        if user_accounts:
+            taken = set(await Users.filter(user_account__in=user_accounts).values_list("user_account", flat=True))
+
+        restored: list[tuple[int, str | None, str | None]] = []
+        skipped: list[int] = []
+        for user_id, user_account, username in rows:
+            if user_account is not None and user_account in taken:
+                skipped.append(user_id)
+                continue
+            if user_account is not None:
+                taken.add(user_account)
+            restored.append((user_id, user_account, username))
+
+        user_ids = sorted(user_id for user_id, _, _ in restored)
+        if user_ids:
+            try:
+                await Users.filter(id__in=user_ids).restore()
+            except IntegrityError:
+                # 与并发注册同一账号冲突
+                raise BusinessException(StatusCode.PARAMS_ERROR, "账号重复")
+
+        return restored, skipped, has_more
 
     @staticmethod
-    def user_logout(request: Request) -> bool:
+    async def user_logout(request: Request) -> bool:
         """
         用户注销
 
@@ -200,8 +1043,8 @@ class UserService(metaclass=NoInstantiableMeta):
             bool: 用户是否成功注销
         """
 
-        # 从会话中删除用户信息
-        is_logout = bool(request.session.pop(USER_LOGIN_STATE, ""))
+        # 从会话存储中删除用户信息
+        is_logout = await SessionManager.logout(request)
         if not is_logout:
             raise BusinessException(StatusCode.PARAMS_ERROR, "用户未登录")
 
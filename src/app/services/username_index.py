@@ -0,0 +1,100 @@
+from functools import lru_cache
+
+from src.app.models import Users
+from src.app.utils import NgramIndex
+
+
+class UsernameSearchIndex:
+    """
+    用户名模糊搜索的进程内索引, 供不支持 pg_trgm 的数据库(SQLite 开发/测试环境)使用
+
+    首次使用时从数据库全量构建, 之后随注册、删除增量维护; 索引只用于筛选候选ID,
+    结果仍以数据库中的记录为准
+    """
+
+    def __init__(self, chunk_size: int = 5000) -> None:
+        self._index = NgramIndex()
+        self._built = False
+        self._chunk_size = chunk_size
+
+    @staticmethod
+    def is_supported() -> bool:
+        """当前数据库是否需要使用进程内索引"""
+        return Users._meta.db.capabilities.dialect != "postgres"
+
+    async def build(self) -> None:
+        """从数据库按ID分批全量构建索引"""
+        self._index.clear()
+        last_id = 0
+        while True:
+            rows = await (
+                Users.filter(id__gt=last_id, username__isnull=False)
+                .order_by("id")
+                .limit(self._chunk_size)
+                .values_list("id", "username")
+            )
+            for user_id, username in rows:
+                self._index.add(user_id, username)
+            if len(rows) < self._chunk_size:
+                break
+            last_id = rows[-1][0]
+        self._built = True
+
+    async def ensure_built(self) -> None:
+        """索引未构建时构建索引"""
+        if not self._built:
+            await self.build()
+
+    def add(self, user_id: int, username: str | None) -> None:
+        """
+        同步新增或更新的用户
+
+        Args:
+            user_id (int): 用户ID
+            username (str | None): 用户名
+        """
+
+        if self._built:
+            self._index.add(user_id, username)
+
+    def remove(self, user_id: int) -> None:
+        """
+        同步删除的用户
+
+        Args:
+            user_id (int): 用户ID
+        """
+
+        if self._built:
+            self._index.remove(user_id)
+
+    def search(self, username: str, limit: int) -> list[int]:
+        """
+        搜索用户名
+
+        Args:
+            username (str): 用户名片段
+            limit (int): 返回数量上限
+
+        Returns:
+            list[int]: 按匹配程度排序的用户ID
+        """
+
+        return [user_id for user_id, _ in self._index.search(username, limit)]
+
+    def reset(self) -> None:
+        """清空索引, 下次使用时重新构建"""
+        self._index.clear()
+        self._built = False
+
+
+@lru_cache()
+def get_username_index() -> UsernameSearchIndex:
+    """
+    获取用户名搜索索引(进程内单例)
+
+    Returns:
+        UsernameSearchIndex: 用户名搜索索引
+    """
+
+    return UsernameSearchIndex()
@@ -1,5 +1,22 @@
+from src.app.utils.bloom_filter import CountingBloomFilter
+from src.app.utils.cursor_utils import CursorUtils
+from src.app.utils.jwt_utils import InvalidTokenError, JWTUtils
 from src.app.utils.metaclass_utils import NoInstantiableMeta
 from src.app.utils.module_utils import ModuleUtils
+from src.app.utils.ngram_index import NgramIndex
+from src.app.utils.password_utils import PasswordUtils
 from src.app.utils.string_utils import StringUtils
+from src.app.utils.ttl_lru_cache import TTLLRUCache
 
-__all__ = ["NoInstantiableMeta", "StringUtils", "ModuleUtils"]
+__all__ = [
+    "NoInstantiableMeta",
+    "StringUtils",
+    "ModuleUtils",
+    "TTLLRUCache",
+    "JWTUtils",
+    "InvalidTokenError",
+    "PasswordUtils",
+    "CursorUtils",
+    "NgramIndex",
+    "CountingBloomFilter",
+]
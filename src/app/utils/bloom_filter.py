@@ -0,0 +1,137 @@
+import hashlib
+import math
+import struct
+
+# 快照格式: 魔数 + 计数器数量 + 哈希函数个数 + 元素数量, 之后为计数器数组
+_SNAPSHOT_HEADER = struct.Struct("<4sQIQ")
+_SNAPSHOT_MAGIC = b"CBF1"
+
+_COUNTER_MAX = 0xFF
+
+
+class CountingBloomFilter:
+    """
+    计数布隆过滤器: 每个位置为 8 位计数器, 支持删除元素
+
+    判定"不存在"时一定不存在, 判定"可能存在"时存在一定误判率; 计数器达到上限后不再增减,
+    只会增加误判而不会产生漏判
+    """
+
+    __slots__ = ("_size", "_hash_count", "_counters", "_count")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        Args:
+            capacity (int): 预期元素数量
+            error_rate (float): 元素数量达到预期时的目标误判率
+        """
+
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be in (0, 1)")
+
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._size = size
+        self._hash_count = max(1, round(size / capacity * math.log(2)))
+        self._counters = bytearray(size)
+        self._count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        """双重哈希计算元素对应的计数器位置"""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._size for i in range(self._hash_count)]
+
+    def add(self, item: str) -> None:
+        """
+        添加元素
+
+        Args:
+            item (str): 元素
+        """
+
+        counters = self._counters
+        for position in self._positions(item):
+            if counters[position] < _COUNTER_MAX:
+                counters[position] += 1
+        self._count += 1
+
+    def remove(self, item: str) -> None:
+        """
+        删除元素, 调用方需保证元素此前已添加, 否则会产生漏判
+
+        Args:
+            item (str): 元素
+        """
+
+        counters = self._counters
+        positions = self._positions(item)
+        if not all(counters[position] for position in positions):
+            return
+        for position in positions:
+            if counters[position] < _COUNTER_MAX:
+                counters[position] -= 1
+        self._count = max(0, self._count - 1)
+
+    def __contains__(self, item: str) -> bool:
+        counters = self._counters
+        return all(counters[position] for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """清空过滤器"""
+        self._counters = bytearray(self._size)
+        self._count = 0
+
+    def estimated_false_positive_rate(self) -> float:
+        """
+        按当前元素数量估算的理论误判率
+
+        Returns:
+            float: 误判率
+        """
+
+        return (1 - math.exp(-self._hash_count * self._count / self._size)) ** self._hash_count
+
+    def to_bytes(self) -> bytes:
+        """
+        序列化为快照
+
+        Returns:
+            bytes: 快照数据
+        """
+
+        header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, self._size, self._hash_count, self._count)
+        return header + bytes(self._counters)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CountingBloomFilter":
+        """
+        从快照恢复
+
+        Args:
+            data (bytes): 快照数据
+
+        Returns:
+            CountingBloomFilter: 布隆过滤器
+
+        Raises:
+            ValueError: 快照格式错误
+        """
+
+        if len(data) < _SNAPSHOT_HEADER.size:
+            raise ValueError("invalid snapshot")
+        magic, size, hash_count, count = _SNAPSHOT_HEADER.unpack_from(data)
+        if magic != _SNAPSHOT_MAGIC or len(data) != _SNAPSHOT_HEADER.size + size or not size or not hash_count:
+            raise ValueError("invalid snapshot")
+
+        bloom_filter = cls.__new__(cls)
+        bloom_filter._size = size
+        bloom_filter._hash_count = hash_count
+        bloom_filter._counters = bytearray(data[_SNAPSHOT_HEADER.size:])
+        bloom_filter._count = count
+        return bloom_filter
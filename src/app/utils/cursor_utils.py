@@ -0,0 +1,50 @@
+import base64
+import binascii
+
+from .metaclass_utils import NoInstantiableMeta
+
+
+class CursorUtils(metaclass=NoInstantiableMeta):
+    """
+    分页游标工具类, 游标对调用方不透明
+    """
+
+    @staticmethod
+    def encode(last_id: int) -> str:
+        """
+        将上一页最后一条记录的ID编码为游标
+
+        Args:
+            last_id (int): 上一页最后一条记录的ID
+
+        Returns:
+            str: 游标
+        """
+
+        return base64.urlsafe_b64encode(f"id:{last_id}".encode()).rstrip(b"=").decode()
+
+    @staticmethod
+    def decode(cursor: str) -> int:
+        """
+        解析游标
+
+        Args:
+            cursor (str): 游标
+
+        Returns:
+            int: 上一页最后一条记录的ID
+
+        Raises:
+            ValueError: 游标格式错误
+        """
+
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        except (binascii.Error, UnicodeDecodeError) as e:
+            raise ValueError(f"游标格式错误: {cursor}") from e
+
+        prefix, _, value = raw.partition(":")
+        if prefix != "id" or not value.isdigit():
+            raise ValueError(f"游标格式错误: {cursor}")
+
+        return int(value)
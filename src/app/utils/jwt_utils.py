@@ -0,0 +1,105 @@
+import base64
+import json
+from typing import Any
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+
+from .metaclass_utils import NoInstantiableMeta
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+# ES256 固定头部, 预先编码避免每次签发时重复序列化
+_ES256_HEADER = _b64url_encode(json.dumps({"alg": "ES256", "typ": "JWT"}, separators=(",", ":")).encode())
+_ES256_COORDINATE_SIZE = 32
+
+
+class InvalidTokenError(ValueError):
+    """
+    令牌格式或签名无效
+    """
+
+
+class JWTUtils(metaclass=NoInstantiableMeta):
+    """
+    ES256 (ECDSA P-256 + SHA-256) JWT 工具类
+    """
+
+    @staticmethod
+    def encode_es256(claims: dict[str, Any], private_key: ec.EllipticCurvePrivateKey) -> str:
+        """
+        签发 ES256 令牌
+
+        Args:
+            claims (dict[str, Any]): 令牌声明
+            private_key (ec.EllipticCurvePrivateKey): P-256 私钥
+
+        Returns:
+            str: 令牌
+        """
+
+        payload = _b64url_encode(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = _ES256_HEADER + b"." + payload
+
+        # JWS 要求签名为 r || s 定长拼接, 而非 DER 编码
+        r, s = decode_dss_signature(private_key.sign(signing_input, ec.ECDSA(hashes.SHA256())))
+        signature = r.to_bytes(_ES256_COORDINATE_SIZE, "big") + s.to_bytes(_ES256_COORDINATE_SIZE, "big")
+
+        return (signing_input + b"." + _b64url_encode(signature)).decode()
+
+    @staticmethod
+    def decode_es256(token: str, public_key: ec.EllipticCurvePublicKey) -> dict[str, Any]:
+        """
+        校验 ES256 令牌签名并解析声明(不校验过期时间)
+
+        Args:
+            token (str): 令牌
+            public_key (ec.EllipticCurvePublicKey): P-256 公钥
+
+        Returns:
+            dict[str, Any]: 令牌声明
+
+        Raises:
+            InvalidTokenError: 令牌格式错误 | 算法不匹配 | 签名无效
+        """
+
+        try:
+            header, payload, signature = token.encode().split(b".")
+        except ValueError as e:
+            raise InvalidTokenError("令牌格式错误") from e
+
+        # 只接受固定的 ES256 头部, 杜绝算法混淆
+        if header != _ES256_HEADER:
+            raise InvalidTokenError("令牌算法不匹配")
+
+        try:
+            raw_signature = _b64url_decode(signature)
+        except ValueError as e:
+            raise InvalidTokenError("令牌签名格式错误") from e
+        if len(raw_signature) != 2 * _ES256_COORDINATE_SIZE:
+            raise InvalidTokenError("令牌签名格式错误")
+
+        r = int.from_bytes(raw_signature[:_ES256_COORDINATE_SIZE], "big")
+        s = int.from_bytes(raw_signature[_ES256_COORDINATE_SIZE:], "big")
+        try:
+            public_key.verify(encode_dss_signature(r, s), header + b"." + payload, ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature as e:
+            raise InvalidTokenError("令牌签名无效") from e
+
+        try:
+            claims = json.loads(_b64url_decode(payload))
+        except ValueError as e:
+            raise InvalidTokenError("令牌内容格式错误") from e
+        if not isinstance(claims, dict):
+            raise InvalidTokenError("令牌内容格式错误")
+
+        return claims
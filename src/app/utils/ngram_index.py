@@ -0,0 +1,155 @@
+import re
+from collections import defaultdict
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class NgramIndex:
+    """
+    进程内三元组(trigram)倒排索引, 支持增量维护, 用于子串与模糊匹配
+
+    三元组提取与相似度计算方式与 PostgreSQL pg_trgm 一致: 文本转小写后按单词切分,
+    每个单词前补两个空格、后补一个空格再取三元组, 相似度为两个三元组集合的 Jaccard 系数
+    """
+
+    def __init__(self) -> None:
+        self._texts: dict[int, str] = {}
+        self._trigrams: dict[int, frozenset[str]] = {}
+        self._postings: defaultdict[str, set[int]] = defaultdict(set)
+
+    @staticmethod
+    def word_trigrams(text: str) -> frozenset[str]:
+        """
+        提取 pg_trgm 风格的三元组集合
+
+        Args:
+            text (str): 文本
+
+        Returns:
+            frozenset[str]: 三元组集合
+        """
+
+        trigrams = set()
+        for word in _WORD_PATTERN.findall(text.lower()):
+            padded = f"  {word} "
+            trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return frozenset(trigrams)
+
+    @staticmethod
+    def inner_trigrams(text: str) -> set[str]:
+        """
+        提取不补空格的三元组, 包含某子串的文本必然包含该子串的全部内部三元组
+
+        Args:
+            text (str): 文本
+
+        Returns:
+            set[str]: 三元组集合
+        """
+
+        text = text.lower()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def similarity(left: frozenset[str], right: frozenset[str]) -> float:
+        """
+        计算两个三元组集合的相似度
+
+        Args:
+            left (frozenset[str]): 三元组集合
+            right (frozenset[str]): 三元组集合
+
+        Returns:
+            float: 相似度, 取值 [0, 1]
+        """
+
+        if not left or not right:
+            return 0.0
+        shared = len(left & right)
+        return shared / (len(left) + len(right) - shared)
+
+    def add(self, doc_id: int, text: str | None) -> None:
+        """
+        添加或更新文档
+
+        Args:
+            doc_id (int): 文档ID
+            text (str | None): 文本, 为空时移除该文档
+        """
+
+        self.remove(doc_id)
+        if not text:
+            return
+
+        self._texts[doc_id] = text.lower()
+        self._trigrams[doc_id] = self.word_trigrams(text)
+        for trigram in self._trigrams[doc_id] | self.inner_trigrams(text):
+            self._postings[trigram].add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        """
+        移除文档
+
+        Args:
+            doc_id (int): 文档ID
+        """
+
+        text = self._texts.pop(doc_id, None)
+        if text is None:
+            return
+
+        for trigram in self._trigrams.pop(doc_id) | self.inner_trigrams(text):
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[trigram]
+
+    def search(self, query: str, limit: int, threshold: float = 0.3) -> list[tuple[int, float]]:
+        """
+        搜索包含查询子串或与查询相似度不低于阈值的文档
+
+        Args:
+            query (str): 查询文本
+            limit (int): 返回数量上限
+            threshold (float): 模糊匹配的相似度阈值
+
+        Returns:
+            list[tuple[int, float]]: (文档ID, 相似度) 列表, 子串匹配优先, 其次按相似度降序、ID 升序
+        """
+
+        needle = query.lower()
+        query_trigrams = self.word_trigrams(query)
+
+        # 子串匹配: 取内部三元组倒排表交集后逐一确认; 查询过短时退化为全量扫描
+        inner = self.inner_trigrams(needle)
+        if inner:
+            postings = sorted((self._postings.get(trigram, set()) for trigram in inner), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+        else:
+            candidates = self._texts.keys()
+        substring_ids = {doc_id for doc_id in candidates if needle in self._texts[doc_id]}
+
+        # 模糊匹配: 与查询共享任一三元组的文档
+        fuzzy_candidates: set[int] = set()
+        for trigram in query_trigrams:
+            fuzzy_candidates |= self._postings.get(trigram, set())
+
+        scored = []
+        for doc_id in substring_ids | fuzzy_candidates:
+            score = self.similarity(query_trigrams, self._trigrams[doc_id])
+            is_substring = doc_id in substring_ids
+            if is_substring or score >= threshold:
+                scored.append((not is_substring, -score, doc_id))
+
+        scored.sort()
+        return [(doc_id, -neg_score) for _, neg_score, doc_id in scored[:limit]]
+
+    def clear(self) -> None:
+        """清空索引"""
+        self._texts.clear()
+        self._trigrams.clear()
+        self._postings.clear()
+
+    def __len__(self) -> int:
+        return len(self._texts)
@@ -0,0 +1,173 @@
+import base64
+import hashlib
+import hmac
+import os
+
+from .metaclass_utils import NoInstantiableMeta
+
+# 存储格式: scrypt$<n>$<r>$<p>$<salt>$<hash>, 旧版为 32 位 MD5 十六进制串(无标签)
+SCRYPT_TAG = "scrypt"
+_SALT_SIZE = 16
+_HASH_SIZE = 32
+_LEGACY_MD5_LENGTH = 32
+
+
+class PasswordUtils(metaclass=NoInstantiableMeta):
+    """
+    密码哈希工具类
+
+    所有方法均为纯计算且可被 pickle, 供进程池调用; 不要在事件循环中直接调用 scrypt 相关方法
+    """
+
+    @staticmethod
+    def hash_scrypt(password: str, n: int, r: int, p: int) -> str:
+        """
+        使用 scrypt 计算带算法标签的密码哈希
+
+        Args:
+            password (str): 明文密码
+            n (int): CPU/内存开销参数
+            r (int): 块大小参数
+            p (int): 并行度参数
+
+        Returns:
+            str: 带算法标签的密码哈希
+        """
+
+        salt = os.urandom(_SALT_SIZE)
+        digest = hashlib.scrypt(
+            password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=_HASH_SIZE
+        )
+        return "$".join((
+            SCRYPT_TAG,
+            str(n),
+            str(r),
+            str(p),
+            base64.b64encode(salt).decode(),
+            base64.b64encode(digest).decode(),
+        ))
+
+    @staticmethod
+    def hash_scrypt_many(passwords: list[str], n: int, r: int, p: int) -> list[str]:
+        """
+        批量计算 scrypt 密码哈希, 一次进程间调用处理多个密码
+
+        Args:
+            passwords (list[str]): 明文密码列表
+            n (int): CPU/内存开销参数
+            r (int): 块大小参数
+            p (int): 并行度参数
+
+        Returns:
+            list[str]: 与输入顺序一致的密码哈希列表
+        """
+
+        return [PasswordUtils.hash_scrypt(password, n, r, p) for password in passwords]
+
+    @staticmethod
+    def hash_legacy_md5(password: str, salt: str) -> str:
+        """
+        旧版 MD5 密码哈希, 仅用于校验存量密码
+
+        Args:
+            password (str): 明文密码
+            salt (str): 全局盐值
+
+        Returns:
+            str: MD5 十六进制串
+        """
+
+        return hashlib.md5((salt + password).encode()).hexdigest()
+
+    @staticmethod
+    def is_legacy(stored: str) -> bool:
+        """
+        判断是否为旧版 MD5 密码哈希
+
+        Args:
+            stored (str): 已存储的密码哈希
+
+        Returns:
+            bool: 是否为旧版哈希
+        """
+
+        return len(stored) == _LEGACY_MD5_LENGTH and "$" not in stored
+
+    @staticmethod
+    def verify(password: str, stored: str, legacy_salt: str) -> bool:
+        """
+        校验密码, 按存储哈希的算法标签选择算法
+
+        Args:
+            password (str): 明文密码
+            stored (str): 已存储的密码哈希
+            legacy_salt (str): 旧版 MD5 全局盐值
+
+        Returns:
+            bool: 密码是否正确
+        """
+
+        if PasswordUtils.is_legacy(stored):
+            return hmac.compare_digest(PasswordUtils.hash_legacy_md5(password, legacy_salt), stored)
+
+        try:
+            tag, n, r, p, salt, digest = stored.split("$")
+            if tag != SCRYPT_TAG:
+                return False
+            n, r, p = int(n), int(r), int(p)
+            expected = base64.b64decode(digest)
+            actual = hashlib.scrypt(
+                password.encode(),
+                salt=base64.b64decode(salt),
+                n=n,
+                r=r,
+                p=p,
+                maxmem=256 * n * r * p,
+                dklen=len(expected),
+            )
+        except ValueError:
+            return False
+
+        return hmac.compare_digest(actual, expected)
+
+    @staticmethod
+    def needs_rehash(stored: str, n: int, r: int, p: int) -> bool:
+        """
+        判断已存储的密码哈希是否需要按当前参数重新计算
+
+        Args:
+            stored (str): 已存储的密码哈希
+            n (int): 当前 CPU/内存开销参数
+            r (int): 当前块大小参数
+            p (int): 当前并行度参数
+
+        Returns:
+            bool: 是否需要重新计算
+        """
+
+        return not stored.startswith(f"{SCRYPT_TAG}${n}${r}${p}$")
+
+    @staticmethod
+    def verify_and_upgrade(
+            password: str, stored: str, legacy_salt: str, n: int, r: int, p: int
+    ) -> tuple[bool, str | None]:
+        """
+        校验密码, 校验通过且哈希过时(旧版 MD5 或参数变化)时一并计算新哈希
+
+        Args:
+            password (str): 明文密码
+            stored (str): 已存储的密码哈希
+            legacy_salt (str): 旧版 MD5 全局盐值
+            n (int): 当前 CPU/内存开销参数
+            r (int): 当前块大小参数
+            p (int): 当前并行度参数
+
+        Returns:
+            tuple[bool, str | None]: 密码是否正确, 需要回写的新哈希(无需升级时为 None)
+        """
+
+        if not PasswordUtils.verify(password, stored, legacy_salt):
+            return False, None
+        if PasswordUtils.needs_rehash(stored, n, r, p):
+            return True, PasswordUtils.hash_scrypt(password, n, r, p)
+        return True, None
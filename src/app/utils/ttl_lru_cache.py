@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class TTLLRUCache[K: Hashable, V]:
+    """
+    带过期时间的 LRU 缓存(非线程安全, 仅在事件循环线程中使用)
+
+    Attributes:
+        max_size (int): 最大条目数, 超出时淘汰最久未使用的条目
+        ttl (float | None): 默认过期秒数, None 表示永不过期
+        hits (int): 命中次数
+        misses (int): 未命中次数
+        evictions (int): 因容量淘汰的次数
+        expirations (int): 因过期移除的次数
+    """
+
+    __slots__ = ("max_size", "ttl", "hits", "misses", "evictions", "expirations", "_data")
+
+    def __init__(self, max_size: int, ttl: float | None = None) -> None:
+        if max_size <= 0:
+            raise ValueError(f"max_size 需为正整数, 当前为 {max_size}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """
+        获取缓存值, 命中时刷新其使用顺序
+
+        Args:
+            key (K): 键
+
+        Returns:
+            V | None: 缓存值, 不存在或已过期时返回 None
+        """
+
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expire_at, value = entry
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        写入缓存值
+
+        Args:
+            key (K): 键
+            value (V): 值
+            ttl (float | None): 本条目的过期秒数, 为 None 时使用默认值
+        """
+
+        ttl = self.ttl if ttl is None else ttl
+        expire_at = None if ttl is None else time.monotonic() + ttl
+        self._data[key] = (expire_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        """
+        移除缓存值
+
+        Args:
+            key (K): 键
+
+        Returns:
+            V | None: 被移除的值, 不存在时返回 None
+        """
+
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and (entry[0] is None or entry[0] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,93 @@
+import asyncio
+import fnmatch
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+class FakeRedis:
+    """
+    测试用的进程内 Redis 替身, 实现项目用到的命令子集
+    """
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[float | None, Any]] = {}
+        self._subscribers: dict[str, set["FakePubSub"]] = {}
+
+    def _alive(self, name: str) -> tuple[float | None, Any] | None:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry
+
+    async def get(self, name: str) -> Any:
+        entry = self._alive(name)
+        return None if entry is None else entry[1]
+
+    async def set(self, name: str, value: Any, ex: int | None = None) -> bool:
+        self._data[name] = (None if ex is None else time.monotonic() + ex, value)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(1 for name in names if self._alive(name) is not None and self._data.pop(name))
+
+    async def expire(self, name: str, time_: int) -> bool:
+        entry = self._alive(name)
+        if entry is None:
+            return False
+        self._data[name] = (time.monotonic() + time_, entry[1])
+        return True
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        entry = self._alive(name)
+        expire_at, value = entry if entry is not None else (None, 0)
+        value = int(value) + amount
+        self._data[name] = (expire_at, value)
+        return value
+
+    async def scan_iter(self, match: str | None = None, count: int | None = None) -> AsyncIterator[str]:
+        for name in list(self._data):
+            if self._alive(name) is not None and (match is None or fnmatch.fnmatchcase(name, match)):
+                yield name
+
+    async def publish(self, channel: str, message: Any) -> int:
+        subscribers = self._subscribers.get(channel, set())
+        for subscriber in subscribers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(subscribers)
+
+    def pubsub(self) -> "FakePubSub":
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    """
+    FakeRedis 的 Pub/Sub 订阅对象
+    """
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._channels: set[str] = set()
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._channels.add(channel)
+            self._redis._subscribers.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, *channels: str) -> None:
+        for channel in channels or tuple(self._channels):
+            self._channels.discard(channel)
+            self._redis._subscribers.get(channel, set()).discard(self)
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0) -> dict[str, Any] | None:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    async def aclose(self) -> None:
+        await self.unsubscribe()
@@ -6,7 +6,7 @@ from asgi_lifespan import LifespanManager
 from httpx import ASGITransport, AsyncClient
 import pytest_asyncio
 
-from src.app.main import app
+from src.app.main import create_app
 
 ClientManagerType = AsyncGenerator[AsyncClient, None]
 
@@ -22,5 +22,5 @@ async def client_manager(app, base_url="http://test/api/v1", **kw) -> ClientMana
 
 @pytest_asyncio.fixture
 async def client() -> ClientManagerType:
-    async with client_manager(app) as c:
+    async with client_manager(create_app()) as c:
         yield c
@@ -1,6 +1,9 @@
 import pytest
 from httpx import AsyncClient
-from src.app.common import BaseResponse
+from src.app.auth import get_optional_token_service, get_token_service
+from src.app.common import BaseResponse, StatusCode
+from src.app.core import settings
+from src.app.services import get_audit_log_writer
 
 
 
@@ -18,3 +21,29 @@ async def test_user_register(client: AsyncClient):
     assert response_data.data == 1
     assert response_data.message == "ok"
     assert response_data.description == ""
+
+
+@pytest.mark.asyncio
+async def test_user_token_login_without_token_keys(client: AsyncClient, tmp_path, monkeypatch: pytest.MonkeyPatch):
+    await client.post("/user/register", json={
+        "user_account": "token_user",
+        "user_password": "12345678",
+        "confirm_password": "12345678",
+    })
+    monkeypatch.setattr(settings, "auth_private_key_path", str(tmp_path / "missing.pem"))
+    get_token_service.cache_clear()
+    get_optional_token_service.cache_clear()
+    recorded = get_audit_log_writer().recorded
+    try:
+        # 未配置密钥对时令牌登录与刷新按未登录处理, 不校验密码也不记录登录事件
+        for path, body in (
+                ("/user/token", {"user_account": "token_user", "user_password": "12345678"}),
+                ("/user/token/refresh", {"refresh_token": "anything"}),
+        ):
+            response_data = BaseResponse.model_validate((await client.post(path, json=body)).json())
+            assert response_data.code == StatusCode.NOT_LOGIN.value.code
+            assert response_data.description == "令牌认证未启用"
+        assert get_audit_log_writer().recorded == recorded
+    finally:
+        get_token_service.cache_clear()
+        get_optional_token_service.cache_clear()
@@ -1,8 +1,20 @@
 import pytest
 from tortoise.contrib.test import initializer, finalizer
 
+from src.app.cache import get_user_cache
+from src.app.services import get_account_filter, get_audit_log_writer, get_username_index
+
+
 @pytest.fixture(scope="session", autouse=True)
 def initialize_tests(request):
-    initializer(["src.app.models.users"], db_url="sqlite://:memory:", app_label="models")
+    initializer(["src.app.models.users", "src.app.models.audit_log"], db_url="sqlite://:memory:", app_label="models")
     request.addfinalizer(finalizer)
 
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    # 每个用例的数据在结束时回滚, 进程内缓存与索引需同步清空
+    get_user_cache().clear()
+    get_username_index().reset()
+    get_account_filter().reset()
+    get_audit_log_writer().reset()
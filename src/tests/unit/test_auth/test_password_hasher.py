@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from src.app.auth import PasswordHasher
+from src.app.exceptions import BusinessException
+from src.app.utils import PasswordUtils
+
+
+def make_hasher(workers: int, max_pending: int = 4, timeout: float = 5.0) -> PasswordHasher:
+    return PasswordHasher(workers, max_pending, timeout, n=2 ** 4, r=8, p=1, legacy_salt="salt")
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+async def test_hash_and_verify(workers):
+    hasher = make_hasher(workers)
+    try:
+        stored = await hasher.hash("test1234")
+        assert await hasher.verify("test1234", stored) == (True, None)
+        assert await hasher.verify("wrong1234", stored) == (False, None)
+
+        stored_list = await hasher.hash_many(["a1234567", "b1234567"])
+        assert [PasswordUtils.verify(p, s, "salt") for p, s in zip(["a1234567", "b1234567"], stored_list)] == [
+            True,
+            True,
+        ]
+    finally:
+        hasher.shutdown()
+
+
+async def test_rehash_legacy():
+    hasher = make_hasher(0)
+    legacy = PasswordUtils.hash_legacy_md5("test1234", "salt")
+    is_valid, upgraded = await hasher.verify("test1234", legacy)
+    assert is_valid
+    assert upgraded.startswith("scrypt$")
+
+
+async def test_backpressure():
+    hasher = make_hasher(0, max_pending=1, timeout=0.01)
+
+    # 占满在途名额后, 新请求等待超时即被拒绝
+    semaphore = hasher._get_semaphore()
+    await semaphore.acquire()
+    with pytest.raises(BusinessException) as e:
+        await hasher.hash("test1234")
+    assert e.value.code == 50000
+    assert hasher.rejected == 1
+
+    semaphore.release()
+    assert (await asyncio.gather(hasher.hash("test1234"), hasher.hash("test1234")))[0].startswith("scrypt$")
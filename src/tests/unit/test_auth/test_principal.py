@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.requests import Request
+
+from src.app.auth import Principal, SessionManager, get_principal, require_admin, require_login
+from src.app.constants.user_constants import ADMIN_ROLE, DEFAULT_ROLE, NORMAL
+from src.app.exceptions import BusinessException
+from src.tests.unit.test_auth.test_token_service import make_token_service
+
+
+def test_principal_serialization():
+    principal = Principal(1, ADMIN_ROLE, NORMAL)
+    assert Principal.loads(principal.dumps()) == principal
+    assert principal.is_admin
+    assert not Principal(2, DEFAULT_ROLE, NORMAL).is_admin
+
+    # __slots__ 禁止附加属性
+    with pytest.raises(AttributeError):
+        principal.username = "test"
+
+
+async def test_get_principal():
+    request = Request(scope={"type": "http", "headers": [], "session": {}, "state": {}})
+
+    # 未登录
+    assert await get_principal(request) is None
+    with pytest.raises(BusinessException) as e:
+        await require_login(None)
+    assert e.value.code == 40100
+    with pytest.raises(BusinessException) as e:
+        await require_admin(None)
+    assert e.value.code == 40101
+
+    # 同一请求仅解析一次会话
+    request = Request(scope={"type": "http", "headers": [], "session": {}, "state": {}})
+    await SessionManager.login(request, Principal(1, DEFAULT_ROLE, NORMAL).dumps())
+    principal = await get_principal(request)
+    assert principal == Principal(1, DEFAULT_ROLE, NORMAL)
+    assert request.state.principal is principal
+    await SessionManager.logout(request)
+    assert await get_principal(request) is principal
+
+    assert await require_login(principal) is principal
+    with pytest.raises(BusinessException) as e:
+        await require_admin(principal)
+    assert e.value.description == "用户非管理员"
+
+
+async def test_get_principal_from_bearer_token():
+    token_service = make_token_service()
+    token = token_service.issue_token_pair(Principal(1, ADMIN_ROLE, NORMAL)).access_token
+    request = Request(scope={
+        "type": "http",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "session": {},
+        "state": {},
+    })
+
+    with patch("src.app.auth.dependencies.get_optional_token_service", return_value=token_service):
+        principal = await get_principal(request)
+    assert principal == Principal(1, ADMIN_ROLE, NORMAL)
+    assert await require_admin(principal) is principal
+
+
+async def test_bearer_token_without_token_service():
+    request = Request(scope={
+        "type": "http",
+        "headers": [(b"authorization", b"Bearer anything")],
+        "session": {},
+        "state": {},
+    })
+
+    # 仅使用会话认证的部署未配置密钥对, 令牌请求按未登录处理
+    with patch("src.app.auth.dependencies.get_optional_token_service", return_value=None):
+        with pytest.raises(BusinessException) as e:
+            await get_principal(request)
+    assert e.value.code == 40100
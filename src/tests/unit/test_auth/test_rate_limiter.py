@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from src.app.auth import AuthRateLimiter, MemoryRateLimitBackend, RedisRateLimitBackend
+from src.app.exceptions import BusinessException
+from src.tests.fake_redis import FakeRedis
+
+
+async def test_memory_token_bucket():
+    backend = MemoryRateLimitBackend(max_keys=10)
+    assert [await backend.acquire("a", 3, 0.001) for _ in range(4)] == [True, True, True, False]
+    # 不同键互不影响
+    assert await backend.acquire("b", 3, 0.001)
+
+    # 补充速率足够高时很快恢复(两次调用间隔需超过时钟精度)
+    for _ in range(3):
+        assert await backend.acquire("c", 1, 1e6)
+        await asyncio.sleep(0.001)
+
+
+async def test_redis_fixed_window():
+    backend = RedisRateLimitBackend(FakeRedis())
+    assert [await backend.acquire("a", 3, 0.001) for _ in range(4)] == [True, True, True, False]
+    assert await backend.acquire("b", 3, 0.001)
+
+
+async def test_auth_rate_limiter():
+    limiter = AuthRateLimiter(MemoryRateLimitBackend(max_keys=10), 3, 0.001, 2, 0.001)
+
+    # 同一账号超限
+    await limiter.check("login", "1.1.1.1", "test")
+    await limiter.check("login", "1.1.1.1", "test")
+    with pytest.raises(BusinessException) as e:
+        await limiter.check("login", "1.1.1.1", "test")
+    assert e.value.code == 42900
+    assert limiter.shed == {"ip": 0, "account": 1}
+
+    # 同一IP超限
+    with pytest.raises(BusinessException) as e:
+        await limiter.check("login", "1.1.1.1", "other")
+    assert e.value.code == 42900
+    assert limiter.shed == {"ip": 1, "account": 1}
+
+    # 不同操作分别计数
+    await limiter.check("register", "1.1.1.1", "test")
@@ -0,0 +1,55 @@
+from fastapi.requests import Request
+
+from src.app.auth import MemorySessionStore, RedisSessionStore, SessionManager
+from src.app.constants.user_constants import USER_LOGIN_STATE
+from src.tests.fake_redis import FakeRedis
+
+
+async def test_memory_session_store():
+    store = MemorySessionStore(max_entries=2)
+    await store.set("a", "data_a", ttl=60)
+    await store.set("b", "data_b", ttl=60)
+    assert await store.get("a") == "data_a"
+
+    # 超出容量时淘汰最久未使用的会话
+    await store.set("c", "data_c", ttl=60)
+    assert await store.get("b") is None
+    assert await store.get("a") == "data_a"
+
+    # 过期会话不可读取
+    await store.set("d", "data_d", ttl=0)
+    assert await store.get("d") is None
+
+    assert await store.delete("a")
+    assert not await store.delete("a")
+
+
+async def test_redis_session_store():
+    client = FakeRedis()
+    store = RedisSessionStore(client, key_prefix="test:")
+    await store.set("a", "data_a", ttl=60)
+    assert await client.get("test:a") == "data_a"
+    assert await store.get("a") == "data_a"
+
+    assert await store.delete("a")
+    assert await store.get("a") is None
+    assert not await store.delete("a")
+
+
+async def test_session_manager():
+    request = Request(scope={"type": "http", "session": {}})
+    assert await SessionManager.get(request) is None
+    assert not await SessionManager.logout(request)
+
+    # Cookie 中仅保存会话ID
+    session_id = await SessionManager.login(request, "payload")
+    assert request.session[USER_LOGIN_STATE] == session_id
+    assert await SessionManager.get(request) == "payload"
+
+    # 重新登录时旧会话失效
+    new_session_id = await SessionManager.login(request, "payload2")
+    assert new_session_id != session_id
+    assert await SessionManager.get(request) == "payload2"
+
+    assert await SessionManager.logout(request)
+    assert await SessionManager.get(request) is None
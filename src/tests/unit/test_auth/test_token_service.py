@@ -0,0 +1,108 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from src.app.auth import Principal, TokenService, get_optional_token_service, get_token_service
+from src.app.constants.user_constants import ADMIN_ROLE, NORMAL
+from src.app.core import settings
+from src.app.exceptions import BusinessException
+
+
+def make_token_service(cache_size: int = 16, access_ttl: int = 60) -> TokenService:
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    return TokenService(private_key, private_key.public_key(), access_ttl, 3600, cache_size)
+
+
+def test_issue_and_verify():
+    service = make_token_service()
+    principal = Principal(1, ADMIN_ROLE, NORMAL)
+    token_pair = service.issue_token_pair(principal)
+    assert token_pair.token_type == "Bearer"
+    assert token_pair.expires_in == 60
+
+    assert service.verify(token_pair.access_token) == principal
+    assert service.verify(token_pair.refresh_token, "refresh") == principal
+
+    # 令牌类型不可混用
+    with pytest.raises(BusinessException) as e:
+        service.verify(token_pair.refresh_token)
+    assert e.value.description == "令牌类型不匹配"
+
+
+def test_verified_token_cache():
+    service = make_token_service()
+    token = service.issue_token_pair(Principal(1, 0, 0)).access_token
+
+    service.verify(token)
+    service.verify(token)
+    service.verify(token)
+    stats = service.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["size"] == 1
+
+    # 关闭缓存时每次都验签
+    uncached = make_token_service(cache_size=0)
+    token = uncached.issue_token_pair(Principal(1, 0, 0)).access_token
+    assert uncached.verify(token) == Principal(1, 0, 0)
+    assert uncached.stats()["size"] == 0
+
+
+def test_invalid_tokens():
+    service = make_token_service()
+    token = service.issue_token_pair(Principal(1, 0, 0)).access_token
+    header, payload, signature = token.split(".")
+
+    for bad_token in (
+            "not-a-token",
+            f"{header}.{payload}",
+            f"{header}.{payload}.{signature[:-4]}AAAA",
+            f"{header}.{payload[:-2]}AA.{signature}",
+            f"eyJhbGciOiJub25lIn0.{payload}.{signature}",
+    ):
+        with pytest.raises(BusinessException) as e:
+            service.verify(bad_token)
+        assert e.value.code == 40100
+
+    # 其他密钥签发的令牌无效
+    other_token = make_token_service().issue_token_pair(Principal(1, 0, 0)).access_token
+    with pytest.raises(BusinessException) as e:
+        service.verify(other_token)
+    assert e.value.description == "令牌无效"
+
+    # 过期令牌无效
+    expired = make_token_service(access_ttl=-1)
+    with pytest.raises(BusinessException) as e:
+        expired.verify(expired.issue_token_pair(Principal(1, 0, 0)).access_token)
+    assert e.value.description == "令牌已过期"
+
+
+def test_from_pem_files(tmp_path):
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_path = tmp_path / "private.pem"
+    public_path = tmp_path / "public.pem"
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ))
+
+    service = TokenService.from_pem_files(str(private_path), str(public_path), 60, 3600, 16)
+    assert service.verify(service.issue_token_pair(Principal(1, 0, 0)).access_token) == Principal(1, 0, 0)
+
+    with pytest.raises(RuntimeError):
+        TokenService.from_pem_files(str(tmp_path / "missing.pem"), str(public_path), 60, 3600, 16)
+
+
+def test_optional_token_service_without_keys(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "auth_private_key_path", str(tmp_path / "missing.pem"))
+    get_token_service.cache_clear()
+    get_optional_token_service.cache_clear()
+    try:
+        with pytest.raises(RuntimeError):
+            get_token_service()
+        assert get_optional_token_service() is None
+    finally:
+        get_token_service.cache_clear()
+        get_optional_token_service.cache_clear()
@@ -0,0 +1,80 @@
+import asyncio
+from pathlib import Path
+
+from src.app.cache import InvalidationBus, LocalSocketTransport, RedisPubSubTransport, UserCache
+from src.tests.fake_redis import FakeRedis
+from .test_user_cache import CountingLoader
+
+
+async def wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+async def test_redis_bus():
+    redis = FakeRedis()
+    # 两个缓存模拟两个工作进程
+    caches = [
+        UserCache(max_entries=10, ttl=3600, bus=InvalidationBus(
+            RedisPubSubTransport(redis, "invalidate", poll_timeout=0.01), batch_interval=0.01, max_batch=2,
+        ))
+        for _ in range(2)
+    ]
+    loaders = [CountingLoader(), CountingLoader()]
+    for cache in caches:
+        await cache.start()
+    try:
+        for cache, loader in zip(caches, loaders):
+            for user_id in (1, 2, 3):
+                await cache.get_or_load(user_id, loader)
+
+        # 窗口内的重复失效合并, 超过批量上限时拆分为多条消息
+        await caches[0].invalidate(1)
+        await caches[0].invalidate_many([1, 2, 3])
+        sender, receiver = caches[0].bus, caches[1].bus
+        await wait_until(lambda: receiver.received_ids == 3)
+        assert sender.stats()["coalesced"] == 1
+        assert sender.published_messages == 2
+        # 自身发出的消息不处理
+        assert sender.received_messages == 0
+
+        await caches[1].get_or_load(1, loaders[1])
+        assert loaders[1].calls == 4
+
+        # 全部失效
+        await caches[1].invalidate_all()
+        await wait_until(lambda: sender.received_messages == 1)
+        assert caches[0].stats()["local_size"] == 0
+    finally:
+        for cache in caches:
+            await cache.stop()
+    assert not redis._subscribers["invalidate"]
+
+
+async def test_local_socket_bus(tmp_path: Path):
+    caches = [
+        UserCache(max_entries=10, ttl=3600, bus=InvalidationBus(LocalSocketTransport(str(tmp_path)), batch_interval=0))
+        for _ in range(3)
+    ]
+    loader = CountingLoader()
+    for cache in caches:
+        await cache.start()
+    try:
+        for cache in caches:
+            await cache.get_or_load(1, loader)
+
+        await caches[0].invalidate(1)
+        await wait_until(lambda: all(cache.stats()["local_size"] == 0 for cache in caches))
+
+        # 已停止的进程遗留的套接字在发送时清理
+        await caches[2].bus.stop()
+        (tmp_path / "0-stale.sock").touch()
+        await caches[0].invalidate(1)
+        await wait_until(lambda: caches[1].bus.received_messages == 2)
+        assert len(list(tmp_path.iterdir())) == 2
+    finally:
+        for cache in caches:
+            await cache.stop()
+    assert not list(tmp_path.iterdir())
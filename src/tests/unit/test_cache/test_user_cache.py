@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.app.cache import UserCache
+from src.app.common import StatusCode
+from src.app.exceptions import BusinessException
+from src.app.schemas import SafetyUser
+from src.tests.fake_redis import FakeRedis
+
+
+def make_user(user_id: int, username: str = "test") -> SafetyUser:
+    return SafetyUser(
+        id=user_id,
+        username=username,
+        user_account=f"user{user_id}",
+        avatar_url=None,
+        gender=None,
+        user_role=0,
+        phone=None,
+        email=None,
+        user_status=0,
+        create_time=datetime(2025, 1, 1),
+    )
+
+
+class CountingLoader:
+    def __init__(self, delay: float = 0) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.username = "test"
+
+    async def __call__(self, user_id: int) -> SafetyUser:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if user_id <= 0:
+            raise BusinessException(StatusCode.PARAMS_ERROR, "用户不存在")
+        return make_user(user_id, self.username)
+
+
+async def test_read_through():
+    cache = UserCache(max_entries=2, ttl=60)
+    loader = CountingLoader()
+
+    assert (await cache.get_or_load(1, loader)).id == 1
+    assert (await cache.get_or_load(1, loader)).id == 1
+    assert loader.calls == 1
+
+    # 容量淘汰
+    await cache.get_or_load(2, loader)
+    await cache.get_or_load(3, loader)
+    await cache.get_or_load(1, loader)
+    assert loader.calls == 4
+    stats = cache.stats()
+    assert stats["local_hits"] == 1
+    assert stats["local_evictions"] == 2
+    assert stats["loads"] == 4
+
+    # 加载失败不缓存
+    with pytest.raises(BusinessException):
+        await cache.get_or_load(0, loader)
+    with pytest.raises(BusinessException):
+        await cache.get_or_load(0, loader)
+    assert loader.calls == 6
+
+
+async def test_single_flight():
+    cache = UserCache(max_entries=10, ttl=60)
+    loader = CountingLoader(delay=0.01)
+
+    users = await asyncio.gather(*(cache.get_or_load(1, loader) for _ in range(10)))
+    assert {user.id for user in users} == {1}
+    assert loader.calls == 1
+
+    with pytest.raises(BusinessException):
+        await asyncio.gather(*(cache.get_or_load(0, loader) for _ in range(3)))
+
+
+async def test_invalidate():
+    cache = UserCache(max_entries=10, ttl=60)
+    loader = CountingLoader(delay=0.01)
+
+    await cache.get_or_load(1, loader)
+    await cache.invalidate(1)
+    loader.username = "new"
+    assert (await cache.get_or_load(1, loader)).username == "new"
+
+    # 加载期间发生失效时不回填旧数据
+    await cache.invalidate(1)
+    loading = asyncio.create_task(cache.get_or_load(1, loader))
+    await asyncio.sleep(0)
+    await cache.invalidate(1)
+    await loading
+    calls = loader.calls
+    await cache.get_or_load(1, loader)
+    assert loader.calls == calls + 1
+
+
+async def test_redis_tier():
+    redis = FakeRedis()
+    first = UserCache(max_entries=10, ttl=60, redis_client=redis)
+    second = UserCache(max_entries=10, ttl=60, redis_client=redis)
+    loader = CountingLoader()
+
+    await first.get_or_load(1, loader)
+    # 其他进程从二级缓存命中
+    assert (await second.get_or_load(1, loader)).id == 1
+    assert loader.calls == 1
+    assert second.stats()["redis_hits"] == 1
+
+    await first.invalidate(1)
+    assert await redis.get("user_center:user:1") is None
+
+
+async def test_invalidate_all_clears_redis():
+    redis = FakeRedis()
+    await redis.set("other:1", "kept")
+    cache = UserCache(max_entries=10, ttl=60, redis_client=redis)
+    loader = CountingLoader()
+    for user_id in (1, 2, 3):
+        await cache.get_or_load(user_id, loader)
+
+    await cache.invalidate_all()
+    assert cache.stats()["local_size"] == 0
+    assert [key async for key in redis.scan_iter(match="user_center:user:*")] == []
+    assert await redis.get("other:1") == "kept"
+
+    await cache.get_or_load(1, loader)
+    assert loader.calls == 4
@@ -0,0 +1,79 @@
+import json
+
+from fastapi import APIRouter, FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from src.app.common import BaseResponse, HTTPResponseUtils, ModelResponseRoute, ResultUtils, StatusCode
+from src.app.common.http_response_utils import _cached_error_body
+from src.app.exceptions import BusinessException, mount_exception_handler
+
+
+def test_error_body():
+    response = HTTPResponseUtils.error(
+        StatusCode.NOT_LOGIN.value.code, StatusCode.NOT_LOGIN.value.message, "用户未登录", cache=True
+    )
+
+    # 紧凑 JSON, 字段顺序与 BaseResponse 一致
+    assert response.body == '{"code":40100,"data":null,"message":"未登录","description":"用户未登录"}'.encode()
+    assert response.headers["content-type"] == "application/json"
+
+    # 相同错误复用同一份编码结果
+    again = HTTPResponseUtils.error(
+        StatusCode.NOT_LOGIN.value.code, StatusCode.NOT_LOGIN.value.message, "用户未登录", cache=True
+    )
+    assert again.body is response.body
+
+    # 默认不缓存(异常消息等任意文本)
+    cache_size = _cached_error_body.cache_info().currsize
+    first = HTTPResponseUtils.error(StatusCode.SYSTEM_ERROR.value.code, "系统出错", "unexpected: 1")
+    second = HTTPResponseUtils.error(StatusCode.SYSTEM_ERROR.value.code, "系统出错", "unexpected: 1")
+    assert first.body == second.body and first.body is not second.body
+    assert _cached_error_body.cache_info().currsize == cache_size
+
+    # 非字符串描述每次编码
+    response = HTTPResponseUtils.error(StatusCode.SYSTEM_ERROR.value.code, "请求参数类型出错", [{"loc": ["body"]}])
+    assert json.loads(response.body)["description"] == [{"loc": ["body"]}]
+
+
+async def test_model_response_route():
+    router = APIRouter(route_class=ModelResponseRoute)
+
+    @router.get("/value")
+    async def get_value() -> BaseResponse[dict[str, int]]:
+        return ResultUtils.success({"a": 1})
+
+    @router.get("/created", status_code=201)
+    async def get_created() -> BaseResponse[int]:
+        return ResultUtils.success(1)
+
+    @router.get("/header")
+    async def get_header(response: Response) -> BaseResponse[int]:
+        response.headers["X-Test"] = "1"
+        return ResultUtils.success(1)
+
+    @router.get("/error")
+    async def get_error() -> BaseResponse[int]:
+        raise BusinessException(StatusCode.NO_AUTH, "用户非管理员")
+
+    app = FastAPI()
+    mount_exception_handler(app)
+    app.include_router(router)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/value")
+        assert response.content == b'{"code":0,"data":{"a":1},"message":"ok","description":""}'
+
+        response = await client.get("/created")
+        assert response.status_code == 201
+
+        # 通过 Response 参数设置的响应头保留
+        response = await client.get("/header")
+        assert response.headers["X-Test"] == "1"
+        assert response.json()["data"] == 1
+
+        response = await client.get("/error")
+        assert response.json()["description"] == "用户非管理员"
+
+    # 返回值注解仍用于生成文档
+    schema = app.openapi()["paths"]["/value"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["$ref"].endswith("BaseResponse_dict_str__int__")
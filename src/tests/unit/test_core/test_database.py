@@ -0,0 +1,116 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+
+from src.app.core import database, get_pool_saturation, get_pool_stats
+from src.app.core.config import Settings
+
+
+def test_build_credentials():
+    config = Settings(
+        database_pool_min_size=2,
+        database_pool_max_size=20,
+        database_statement_cache_size=0,
+        database_statement_timeout_ms=5000,
+        database_plan_cache_mode="force_custom_plan",
+    )
+    credentials = database.build_credentials(config)
+
+    assert credentials["minsize"] == 2
+    assert credentials["maxsize"] == 20
+    assert credentials["statement_cache_size"] == 0
+    assert credentials["server_settings"] == {
+        "application_name": config.database_application_name,
+        "plan_cache_mode": "force_custom_plan",
+        "statement_timeout": "5000",
+    }
+
+    # statement_timeout 为 0 时不下发
+    assert "statement_timeout" not in database.build_credentials(Settings())["server_settings"]
+
+
+class FakePool:
+
+    def __init__(self, size: int, idle: int, max_size: int) -> None:
+        self._size = size
+        self._idle = idle
+        self._max_size = max_size
+        self._queue = asyncio.LifoQueue()
+
+    def get_size(self) -> int:
+        return self._size
+
+    def get_idle_size(self) -> int:
+        return self._idle
+
+    def get_min_size(self) -> int:
+        return 1
+
+    def get_max_size(self) -> int:
+        return self._max_size
+
+
+class FakeClient:
+
+    def __init__(self, connection_name: str, pool: FakePool | None) -> None:
+        self.connection_name = connection_name
+        self._pool = pool
+
+
+async def test_pool_stats(monkeypatch: pytest.MonkeyPatch):
+    pool = FakePool(size=4, idle=0, max_size=4)
+    monkeypatch.setattr(database.connections, "all", lambda: [FakeClient("primary", pool), FakeClient("sqlite", None)])
+
+    # 连接池耗尽后等待获取连接的协程计入 waiters
+    waiters = [asyncio.create_task(pool._queue.get()) for _ in range(2)]
+    await asyncio.sleep(0)
+    try:
+        assert get_pool_stats() == {
+            "primary": {"size": 4, "idle": 0, "in_use": 4, "waiters": 2, "min_size": 1, "max_size": 4},
+        }
+        assert get_pool_saturation("primary") == 1.5
+        assert get_pool_saturation("sqlite") == 0.0
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+async def test_register_postgres_uses_config(monkeypatch: pytest.MonkeyPatch):
+    calls = []
+
+    @asynccontextmanager
+    async def fake_register_tortoise(app, config, generate_schemas):
+        calls.append((config, generate_schemas))
+        yield
+
+    monkeypatch.setattr(database, "RegisterTortoise", fake_register_tortoise)
+    async with database.register_postgres(FastAPI(), Settings(database_host="db.internal")):
+        pass
+
+    tortoise_config, generate_schemas = calls[0]
+    assert tortoise_config["connections"]["user_center_conn"]["credentials"]["host"] == "db.internal"
+    # 默认不生成数据表, 表结构由迁移管理
+    assert generate_schemas is False
+
+
+async def test_create_app_uses_config(monkeypatch: pytest.MonkeyPatch):
+    from src.app import main
+
+    config = Settings(metrics_enabled=False, query_timing_enabled=False, database_generate_schemas=True)
+    app = main.create_app(config)
+    assert app.state.config is config
+    assert "/metrics" not in {route.path for route in app.routes}
+
+    used = []
+
+    @asynccontextmanager
+    async def fake_register_postgres(web_app, config):
+        used.append(config)
+        yield
+
+    monkeypatch.setattr(main, "register_postgres", fake_register_postgres)
+    async with main.register_database(app, app.state.config):
+        pass
+    assert used == [config]
@@ -0,0 +1,94 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from fastapi.requests import Request
+from tortoise import Tortoise, connections
+from tortoise.contrib.test import _restore_default
+from tortoise.router import router
+from tortoise.transactions import in_transaction
+from tortoise.utils import get_schema_sql
+
+from src.app.auth import get_password_hasher
+from src.app.core import get_replica_routing, replica_read, set_consistency_key
+from src.app.models import Users
+from src.app.services import UserService
+
+
+@pytest_asyncio.fixture
+async def replica_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[None, None]:
+    # 两个 SQLite 文件分别作为主库与副本, 副本不同步写入, 相当于复制延迟无限大
+    # 已初始化时 Tortoise.init 会关闭全部连接, 包括测试共用的内存数据库, 用例结束后恢复默认连接即可
+    monkeypatch.setattr(Tortoise, "_inited", False)
+    await Tortoise.init(
+        config={
+            "connections": {
+                "primary": f"sqlite://{tmp_path / 'primary.db'}",
+                "replica": f"sqlite://{tmp_path / 'replica.db'}",
+            },
+            "apps": {"models": {"models": ["src.app.models.users"], "default_connection": "primary"}},
+            "routers": ["src.app.core.db_router.ReplicaRouter"],
+        },
+        _create_db=True,
+    )
+    schema_sql = get_schema_sql(connections.get("primary"), safe=False)
+    for name in ("primary", "replica"):
+        await connections.get(name).execute_script(schema_sql)
+    monkeypatch.setattr(get_replica_routing(), "replicas", ["replica"])
+    set_consistency_key(None)
+
+    try:
+        yield
+    finally:
+        for name in ("primary", "replica"):
+            await connections.get(name).close()
+            connections.discard(name)
+        router.init_routers([])
+        _restore_default()
+
+
+async def test_replica_routing(replica_db: None):
+    await Users.create(user_account="primary_user", user_password="x", username="primary")
+
+    @replica_read
+    async def count_users() -> int:
+        return await Users.all().count()
+
+    @replica_read
+    async def iter_counts():
+        for _ in range(2):
+            yield await Users.all().count()
+
+    # 只读方法读取副本, 其他读取与写入使用主库
+    assert await count_users() == 0
+    assert [count async for count in iter_counts()] == [0, 0]
+    assert (await UserService.search_users_by_username("")).items == []
+    assert await Users.all().count() == 1
+
+    # 事务内的读取使用事务连接
+    async with in_transaction("primary"):
+        assert await count_users() == 1
+
+    # 一致性键写入后的窗口期内读取主库, 其他键不受影响
+    set_consistency_key("user:1")
+    await Users.filter(user_account="primary_user").update(username="renamed")
+    assert await count_users() == 1
+    set_consistency_key("user:2")
+    assert await count_users() == 0
+
+    stats = get_replica_routing().stats()
+    assert stats["replicas"] == 1
+    assert stats["replica_reads"] >= 5
+    assert stats["primary_reads"] >= 2
+
+
+async def test_login_falls_back_to_primary(replica_db: None):
+    password_hash = await get_password_hasher().hash("12345678")
+    await Users.create(user_account="lagging", user_password=password_hash)
+
+    # 副本尚未同步刚注册的账号时回退主库
+    assert not await UserService.user_account_exists("lagging")
+    request = Request(scope={"type": "http", "session": {}})
+    safety_user = await UserService.user_login("lagging", "12345678", request)
+    assert safety_user.user_account == "lagging"
@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from tortoise.contrib import test
+
+from src.app.common import BaseResponse, ResultUtils, StatusCode
+from src.app.core import settings
+from src.app.exceptions import BusinessException, mount_exception_handler
+from src.app.metrics import (
+    AppMetrics,
+    MetricsMiddleware,
+    add_query_observer,
+    get_app_metrics,
+    instrument_tortoise,
+    remove_query_observer,
+)
+from src.app.models import Users
+from src.app.routers import metrics_router
+from src.app.routers.metrics_router import CONTENT_TYPE, allowed_networks
+
+
+async def test_metrics_middleware():
+    router = APIRouter()
+
+    @router.get("/users/{user_id}")
+    async def get_user(user_id: int) -> BaseResponse[int]:
+        return ResultUtils.success(user_id)
+
+    @router.get("/error")
+    async def get_error() -> BaseResponse[int]:
+        raise BusinessException(StatusCode.NO_AUTH, "用户非管理员")
+
+    @router.get("/crash")
+    async def get_crash() -> BaseResponse[int]:
+        raise RuntimeError("crash")
+
+    metrics = AppMetrics()
+    app = FastAPI()
+    mount_exception_handler(app)
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    async with AsyncClient(transport=ASGITransport(app=app, raise_app_exceptions=False), base_url="http://test") as client:
+        for user_id in (1, 2):
+            assert (await client.get(f"/users/{user_id}")).status_code == 200
+        await client.get("/error")
+        await client.get("/crash")
+        await client.get("/missing/path")
+
+    # 按路由模板聚合, 未处理的异常按 500 记录
+    assert metrics.http_requests.get(("GET", "/users/{user_id}", "200")) == 2
+    assert metrics.http_requests.get(("GET", "/crash", "500")) == 1
+    assert metrics.http_requests.get(("", "unmatched", "200")) == 1
+    assert metrics.http_request_duration.get(("GET", "/users/{user_id}"))[0] == 2
+    assert metrics.http_requests_in_progress.get() == 0
+
+    # 业务异常记录在进程内单例上
+    assert get_app_metrics().business_errors.get(("/error", str(StatusCode.NO_AUTH.value.code))) >= 1
+
+
+class TestMetricsEndpoint(test.TestCase):
+
+    async def test_query_metrics(self) -> None:
+        metrics = AppMetrics()
+        instrument_tortoise()
+        add_query_observer(metrics.observe_query)
+        try:
+            await Users.create(user_account="metrics", user_password="x")
+            await Users.filter(user_account="metrics").first()
+            await Users.filter(user_account="metrics").update(username="metrics")
+        finally:
+            remove_query_observer(metrics.observe_query)
+        await Users.filter(user_account="metrics").first()
+
+        # 每条语句按操作类型计数一次, 移除观察函数后不再记录
+        assert metrics.db_queries.get(("INSERT",)) == 1
+        assert metrics.db_queries.get(("SELECT",)) == 1
+        assert metrics.db_queries.get(("UPDATE",)) == 1
+        assert metrics.db_query_duration.get(("SELECT",))[0] == 1
+
+    async def test_metrics_endpoint(self) -> None:
+        app = FastAPI()
+        app.include_router(metrics_router)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+        assert "# TYPE user_center_http_request_duration_seconds histogram" in response.text
+        assert 'user_center_component_stats{component="user_cache",stat="loads"} 0' in response.text
+
+    async def test_metrics_access(self) -> None:
+        app = FastAPI()
+        mount_exception_handler(app)
+        app.include_router(metrics_router)
+        transport = ASGITransport(app=app, client=("203.0.113.7", 50000))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            # 不在允许网段内的来源无权访问
+            response = await client.get("/metrics")
+            assert response.json()["code"] == StatusCode.NO_AUTH.value.code
+
+            with patch.object(settings, "metrics_token", "scrape-secret"):
+                response = await client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+                assert response.json()["code"] == StatusCode.NO_AUTH.value.code
+                response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+                assert response.headers["content-type"] == CONTENT_TYPE
+
+            with patch.object(settings, "metrics_allowed_ips", ["203.0.113.0/24"]):
+                allowed_networks.cache_clear()
+                try:
+                    assert (await client.get("/metrics")).headers["content-type"] == CONTENT_TYPE
+                finally:
+                    allowed_networks.cache_clear()
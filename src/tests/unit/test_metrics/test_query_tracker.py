@@ -0,0 +1,72 @@
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from tortoise.contrib import test
+
+from src.app.common import BaseResponse, ResultUtils
+from src.app.metrics import (
+    AppMetrics,
+    QueryTimingMiddleware,
+    add_query_observer,
+    instrument_tortoise,
+    observe_request_query,
+    remove_query_observer,
+)
+from src.app.models import Users
+
+
+def build_app(metrics: AppMetrics, **kwargs) -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/single")
+    async def get_single() -> BaseResponse[int]:
+        return ResultUtils.success(await Users.all().count())
+
+    @router.get("/loop")
+    async def get_loop() -> BaseResponse[int]:
+        # 循环内逐条查询
+        for user_id in range(6):
+            await Users.filter(id=user_id).first()
+        return ResultUtils.success(6)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(QueryTimingMiddleware, metrics=metrics, repeat_threshold=5, **kwargs)
+    return app
+
+
+class TestQueryTimingMiddleware(test.TestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        instrument_tortoise()
+        add_query_observer(observe_request_query)
+
+    async def asyncTearDown(self) -> None:
+        remove_query_observer(observe_request_query)
+        await super().asyncTearDown()
+
+    async def test_server_timing(self) -> None:
+        metrics = AppMetrics()
+        app = build_app(metrics)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            single = await client.get("/single")
+            loop = await client.get("/loop")
+
+        assert single.headers["server-timing"].startswith("db;dur=")
+        assert single.headers["server-timing"].endswith(';desc="1 queries"')
+
+        # 同一语句执行达到阈值时标记为重复
+        assert loop.headers["server-timing"].endswith('desc="6 queries", db-repeated;desc="1 statements x6"')
+        assert metrics.db_repeated_query_requests.get(("/loop",)) == 1
+        assert metrics.db_repeated_query_requests.get(("/single",)) == 0
+        assert metrics.db_queries_per_request.get(("/loop",)) == (1, 6)
+
+    async def test_debug_logs(self) -> None:
+        app = build_app(AppMetrics(), debug=True, slow_threshold=0)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            with self.assertLogs("src.app.metrics.query_tracker", "WARNING") as logs:
+                await client.get("/loop")
+
+        # 每条语句均超过阈值 0, 另有一条重复语句日志
+        assert sum("慢查询" in message for message in logs.output) == 6
+        assert sum("重复执行 6 次" in message for message in logs.output) == 1
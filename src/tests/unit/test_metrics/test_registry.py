@@ -0,0 +1,55 @@
+import pytest
+
+from src.app.metrics import MetricsRegistry
+
+
+def test_counter_and_gauge():
+    registry = MetricsRegistry("app")
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    in_progress = registry.gauge("in_progress", "In progress.")
+
+    requests.inc(("/a",))
+    requests.inc(("/a",), 2)
+    requests.inc(('/"b"\n',))
+    in_progress.inc()
+    in_progress.inc(amount=-1)
+    in_progress.set(3)
+
+    assert requests.get(("/a",)) == 3
+    assert in_progress.get() == 3
+    assert registry.render().splitlines() == [
+        "# HELP app_requests_total Requests.",
+        "# TYPE app_requests_total counter",
+        'app_requests_total{route="/a"} 3',
+        'app_requests_total{route="/\\"b\\"\\n"} 1',
+        "# HELP app_in_progress In progress.",
+        "# TYPE app_in_progress gauge",
+        "app_in_progress 3",
+    ]
+
+    # 同名同定义的指标复用, 定义不同时报错
+    assert registry.counter("requests_total", "Requests.", ("route",)) is requests
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests.", ("route",))
+
+
+def test_histogram():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 0.5))
+
+    # 等于上界的值计入该桶
+    for value in (0.05, 0.1, 0.3, 2.0):
+        latency.observe(value, ("/a",))
+
+    assert latency.get(("/a",)) == (4, pytest.approx(2.45))
+    assert latency.get(("/b",)) == (0, 0.0)
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="0.5"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.45',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+    registry.clear()
+    assert registry.render().splitlines() == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
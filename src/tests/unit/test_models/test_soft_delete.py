@@ -0,0 +1,45 @@
+from tortoise.contrib import test
+
+from src.app.models import Users
+
+
+class TestSoftDeleteQuerySet(test.TestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await Users.bulk_create([Users(user_account=f"user{i}", user_password="x") for i in range(5)])
+        self.user_ids = await Users.all().values_list("id", flat=True)
+
+    async def test_soft_delete(self) -> None:
+        query = Users.filter(id__in=self.user_ids[:3])
+
+        # 一条 UPDATE 语句, 只更新未删除的记录
+        sql = query.soft_delete().sql()
+        assert sql.startswith('UPDATE "users"')
+        assert '"id" IN' in sql and '"is_deleted"=' in sql
+
+        assert await query.soft_delete() == 3
+        assert await query.soft_delete() == 0
+        assert await Users.all().count() == 2
+        assert await Users.all().only_deleted().count() == 3
+        assert await Users.all().include_deleted().count() == 5
+        assert await Users.get_or_none(id=self.user_ids[0]) is None
+
+        # delete 同样为软删除
+        assert await Users.filter(id=self.user_ids[3]).delete() == 1
+        assert await Users.all().include_deleted().count() == 5
+
+    async def test_restore(self) -> None:
+        await Users.filter(id__in=self.user_ids[:3]).soft_delete()
+
+        # 默认范围为未删除记录, restore 切换为已删除记录
+        assert await Users.filter(id__in=self.user_ids).restore() == 3
+        assert await Users.all().count() == 5
+        user = await Users.get(id=self.user_ids[0])
+        assert not user.is_deleted and user.delete_time is None
+
+    async def test_hard_delete(self) -> None:
+        await Users.filter(id=self.user_ids[0]).soft_delete()
+
+        assert await Users.filter(id__in=self.user_ids[:2]).hard_delete() == 2
+        assert await Users.all().include_deleted().count() == 3
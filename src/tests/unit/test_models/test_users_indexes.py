@@ -0,0 +1,46 @@
+from tortoise.contrib import test
+from tortoise.exceptions import IntegrityError
+
+from src.app.models import Users
+
+
+async def explain(queryset) -> str:
+    """
+    返回查询集在 SQLite 上的执行计划
+    """
+
+    queryset._choose_db_if_not_chosen()
+    queryset._make_query()
+    sql, params = queryset.query.get_parameterized_sql()
+    rows = await Users._meta.db.execute_query_dict(f"EXPLAIN QUERY PLAN {sql}", params)
+    return " | ".join(row["detail"] for row in rows)
+
+
+class TestUsersIndexes(test.TestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await Users.bulk_create(
+            [Users(user_account=f"user{i}", user_password="x", is_deleted=i % 3 == 0) for i in range(300)]
+        )
+        await Users._meta.db.execute_query("ANALYZE")
+
+    async def test_login_lookup_uses_account_index(self) -> None:
+        plan = await explain(Users.filter(user_account="user1").first())
+        assert "USING INDEX uidx_users_user_account_active" in plan
+
+    async def test_register_exists_uses_account_index(self) -> None:
+        plan = await explain(Users.filter(user_account="user1").exists())
+        assert "USING INDEX uidx_users_user_account_active" in plan
+
+    async def test_keyset_listing_uses_active_id_index(self) -> None:
+        plan = await explain(Users.filter(id__gt=100).limit(20))
+        assert "USING INDEX idx_users_active_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_account_unique_among_active_users(self) -> None:
+        # 已删除账号可被重新注册
+        await Users.create(user_account="user0", user_password="x")
+
+        with self.assertRaises(IntegrityError):
+            await Users.create(user_account="user1", user_password="x")
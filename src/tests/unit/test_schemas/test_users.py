@@ -0,0 +1,33 @@
+import warnings
+
+from tortoise.contrib import test
+
+from src.app.models import Users
+from src.app.schemas import SAFETY_USER_FIELDS, SafetyUser
+
+
+class TestSafetyUser(test.TestCase):
+
+    async def test_from_row(self) -> None:
+        await Users.create(
+            user_account="alice",
+            username="Alice",
+            user_password="x",
+            avatar_url="https://example.com/a.png",
+            email="alice@example.com",
+        )
+        await Users.create(user_account="bob", user_password="x")
+
+        users = await Users.all()
+        rows = await Users.all().values_list(*SAFETY_USER_FIELDS)
+
+        # 与完整校验的结果一致, 序列化时无类型告警
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for user, row in zip(users, rows):
+                expected = SafetyUser.model_validate(user)
+                assert SafetyUser.from_row(row) == expected
+                assert SafetyUser.from_model(user) == expected
+                assert SafetyUser.from_row(row).model_dump_json() == expected.model_dump_json()
+
+        assert "user_password" not in SAFETY_USER_FIELDS
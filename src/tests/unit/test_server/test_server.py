@@ -0,0 +1,75 @@
+import socket
+
+import pytest
+
+from src.app.core.config import Settings
+from src.app.server import (
+    CONFIG_ERROR,
+    WORKER_BOOT_ERROR,
+    WorkerSupervisor,
+    build_uvicorn_config,
+    check_shared_state,
+    run,
+)
+
+
+async def failing_app(scope, receive, send):
+    # lifespan 启动失败, 模拟工作进程无法连接数据库
+    if scope["type"] == "lifespan":
+        await receive()
+        await send({"type": "lifespan.startup.failed", "message": "database unavailable"})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_build_uvicorn_config():
+    config = build_uvicorn_config("src.app.main:create_app", Settings(
+        server_loop="asyncio",
+        server_backlog=128,
+        server_keep_alive_seconds=30,
+        server_limit_concurrency=500,
+        server_limit_max_requests=10_000,
+    ))
+
+    assert config.factory
+    assert config.loop == "asyncio"
+    assert config.http == "httptools"
+    assert config.backlog == 128
+    assert config.timeout_keep_alive == 30
+    assert config.limit_concurrency == 500
+    assert config.limit_max_requests == 10_000
+    assert not config.access_log
+
+
+# 测试进程中存在 SQLite 连接线程, 生产环境预加载后 fork 时只有主线程
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+def test_supervisor_stops_on_boot_error():
+    config = build_uvicorn_config(failing_app, Settings(
+        server_host="127.0.0.1",
+        server_port=free_port(),
+        server_loop="asyncio",
+        server_http="h11",
+    ))
+    config.lifespan = "on"
+    config.load()
+
+    # 启动失败的工作进程不重启, 主进程以启动失败退出码结束
+    supervisor = WorkerSupervisor(config, workers=2)
+    assert supervisor.run() == WORKER_BOOT_ERROR
+    assert supervisor.restarts == 0
+    assert not supervisor.children
+
+
+def test_check_shared_state():
+    problems = check_shared_state(Settings(session_backend="memory", rate_limit_backend="memory"))
+    assert [problem.split(":")[0] for problem in problems] == ["session_backend=memory", "rate_limit_backend=memory"]
+    assert check_shared_state(Settings(session_backend="redis", rate_limit_backend="redis")) == []
+    # 未启用限流时不检查限流后端
+    assert check_shared_state(Settings(session_backend="redis", rate_limit_enabled=False)) == []
+
+    # 多工作进程使用内存后端时拒绝启动, 不创建应用
+    assert run("src.app.main:create_app", Settings(server_workers=2, session_backend="memory")) == CONFIG_ERROR
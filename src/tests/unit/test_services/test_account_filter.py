@@ -0,0 +1,81 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from tortoise.contrib import test
+
+from src.app.models import Users
+from src.app.services import AccountExistenceFilter, UserService, get_account_filter
+
+
+class TestAccountExistenceFilter(test.TestCase):
+
+    async def test_register_and_delete(self) -> None:
+        await Users.create(user_account="existing", user_password="x")
+        account_filter = get_account_filter()
+
+        # 未构建时视为可能存在
+        assert account_filter.might_contain("nobody")
+        assert await UserService.user_account_exists("existing")
+
+        await account_filter.build()
+        assert not await UserService.user_account_exists("nobody")
+        assert await UserService.user_account_exists("existing")
+
+        # 注册与删除同步过滤器
+        user_id = await UserService.user_register("newuser", "test1234", "test1234")
+        assert account_filter.might_contain("newuser")
+        await UserService.delete_user_by_id(user_id)
+        assert not await UserService.user_account_exists("newuser")
+
+        stats = account_filter.stats()
+        assert stats["entries"] == 1
+        assert stats["negatives"] >= 2
+        assert stats["false_positive_rate"] == 0.0
+
+    async def test_false_positive(self) -> None:
+        # 容量极小的过滤器必然误判, 误判由数据库查询纠正
+        account_filter = AccountExistenceFilter(capacity=1, error_rate=0.5)
+        for i in range(50):
+            await Users.create(user_account=f"user{i}", user_password="x")
+        await account_filter.build()
+
+        for i in range(50):
+            if account_filter.might_contain(f"other{i}"):
+                account_filter.record_false_positive()
+
+        stats = account_filter.stats()
+        assert stats["false_positives"] > 0
+        assert stats["false_positive_rate"] == stats["false_positives"] / 50
+
+    async def test_snapshot(self) -> None:
+        await Users.create(user_account="existing", user_password="x")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot_path = str(Path(tmp_dir) / "accounts.bin")
+            account_filter = AccountExistenceFilter(capacity=100, error_rate=0.01, snapshot_path=snapshot_path)
+            await account_filter.start()
+            await account_filter.stop()
+
+            restored = AccountExistenceFilter(capacity=100, error_rate=0.01, snapshot_path=snapshot_path)
+            assert await restored.load_snapshot()
+            assert restored.is_built
+            assert restored.might_contain("existing")
+            assert not restored.might_contain("nobody")
+            # 临时文件按进程区分, 替换后不残留
+            assert [path.name for path in Path(tmp_dir).iterdir()] == ["accounts.bin"]
+
+    async def test_untrusted_negatives(self) -> None:
+        account_filter = get_account_filter()
+        await account_filter.build()
+        monkeypatch = pytest.MonkeyPatch()
+        monkeypatch.setattr(account_filter, "_trust_negatives", False)
+        try:
+            # 其他工作进程注册的账号不在本进程的过滤器中, 可用性检查查询数据库确认并补入过滤器
+            await Users.create(user_account="elsewhere", user_password="x")
+            assert not account_filter.might_contain("elsewhere")
+            assert await UserService.user_account_exists("elsewhere")
+            assert account_filter.stats()["stale_negatives"] == 1
+            assert account_filter.might_contain("elsewhere")
+            assert not await UserService.user_account_exists("nobody")
+        finally:
+            monkeypatch.undo()
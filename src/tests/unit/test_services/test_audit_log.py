@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from fastapi.requests import Request
+from tortoise.contrib import test
+
+from src.app.exceptions import BusinessException
+from src.app.models import AuditEvent, AuditLog
+from src.app.services import AuditLogWriter, UserService, get_audit_log_writer
+
+
+class TestAuditLogWriter(test.TestCase):
+
+    async def test_batch_write(self) -> None:
+        writer = AuditLogWriter(max_queue=100, batch_size=3, flush_interval=60)
+        await writer.start()
+        try:
+            for i in range(7):
+                writer.record(AuditEvent.LOGIN_SUCCESS, user_id=i, ip="127.0.0.1")
+            # 达到批量大小时立即写入, 不等待刷新间隔
+            for _ in range(50):
+                if writer.written >= 6:
+                    break
+                await asyncio.sleep(0.01)
+            assert writer.written >= 6
+        finally:
+            await writer.stop()
+
+        # 停止时写入剩余事件
+        assert writer.stats() == {
+            "recorded": 7, "dropped": 0, "written": 7, "batches": 3, "failed": 0, "pending": 0,
+        }
+        logs = await AuditLog.all().order_by("user_id")
+        assert [log.user_id for log in logs] == list(range(7))
+        assert all(log.create_time is not None for log in logs)
+
+    async def test_overflow(self) -> None:
+        drop_newest = AuditLogWriter(max_queue=2, batch_size=10, flush_interval=60)
+        drop_oldest = AuditLogWriter(max_queue=2, batch_size=10, flush_interval=60, overflow="drop_oldest")
+        for writer in (drop_newest, drop_oldest):
+            for i in range(5):
+                writer.record(AuditEvent.REGISTER, user_id=i)
+            assert writer.dropped == 3
+            assert writer.pending == 2
+
+        await drop_newest.flush()
+        assert sorted(await AuditLog.all().values_list("user_id", flat=True)) == [0, 1]
+        await AuditLog.all().delete()
+        await drop_oldest.flush()
+        assert sorted(await AuditLog.all().values_list("user_id", flat=True)) == [3, 4]
+
+    async def test_oversized_fields(self) -> None:
+        writer = AuditLogWriter(max_queue=10, batch_size=10, flush_interval=60)
+        writer.record(AuditEvent.LOGIN_FAILURE, user_account="a" * 1000, ip="1" * 100, detail="d" * 1000)
+        await writer.flush()
+
+        log = await AuditLog.get(event=AuditEvent.LOGIN_FAILURE)
+        assert (len(log.user_account), len(log.ip), len(log.detail)) == (256, 64, 256)
+
+    async def test_failed_batch_retries_each(self) -> None:
+        writer = AuditLogWriter(max_queue=10, batch_size=3, flush_interval=60)
+        writer.record(AuditEvent.LOGIN_SUCCESS, user_id=1)
+        # 绕过截断放入无法写入的事件, 整批写入失败
+        writer._queue.append(AuditLog(event=AuditEvent.LOGIN_FAILURE, ip="1" * 100))
+        writer.record(AuditEvent.LOGIN_SUCCESS, user_id=2)
+        await writer.flush()
+
+        assert (writer.written, writer.failed, writer.pending) == (2, 1, 0)
+        assert sorted(await AuditLog.all().values_list("user_id", flat=True)) == [1, 2]
+
+    async def test_disabled(self) -> None:
+        writer = AuditLogWriter(max_queue=10, batch_size=10, flush_interval=60, enabled=False)
+        writer.record(AuditEvent.LOGOUT, user_id=1)
+        assert writer.pending == 0
+        assert writer.recorded == 0
+
+    async def test_auth_events(self) -> None:
+        writer = get_audit_log_writer()
+        user_id = await UserService.user_register("audituser", "test1234", "test1234", "10.0.0.1")
+        request = Request(scope={"type": "http", "session": {}, "client": ("10.0.0.2", 50000)})
+        await UserService.user_login("audituser", "test1234", request)
+        for user_account, user_password in (("audituser", "wrong1234"), ("nobody", "test1234")):
+            with pytest.raises(BusinessException):
+                await UserService.user_login(user_account, user_password, request)
+        await writer.flush()
+
+        logs = await AuditLog.all().order_by("id")
+        assert [(log.event, log.user_id, log.detail) for log in logs] == [
+            (AuditEvent.REGISTER, user_id, None),
+            (AuditEvent.LOGIN_SUCCESS, user_id, "session"),
+            (AuditEvent.LOGIN_FAILURE, user_id, "密码错误"),
+            (AuditEvent.LOGIN_FAILURE, None, "账号不存在"),
+        ]
+        assert logs[0].ip == "10.0.0.1"
+        assert logs[-1].ip == "10.0.0.2"
+        assert logs[-1].user_account == "nobody"
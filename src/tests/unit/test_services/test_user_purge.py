@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from tortoise.contrib import test
+
+from src.app.models import Users
+from src.app.services import UserPurgeJob
+
+
+class TestUserPurgeJob(test.TestCase):
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        expired = datetime.now() - timedelta(days=31)
+        recent = datetime.now() - timedelta(days=1)
+        await Users.bulk_create(
+            [Users(user_account=f"expired{i}", user_password="x", is_deleted=True, delete_time=expired) for i in range(5)]
+            + [Users(user_account="recent", user_password="x", is_deleted=True, delete_time=recent)]
+            + [Users(user_account="active", user_password="x")]
+        )
+
+    async def test_purge(self) -> None:
+        job = UserPurgeJob(retention_days=30, chunk_size=2, chunk_sleep=0, interval=0)
+
+        # 分批删除超过保留期的用户, 保留期内与未删除的用户不受影响
+        assert await job.purge() == 5
+        assert await Users.all().include_deleted().values_list("user_account", flat=True) == ["recent", "active"]
+
+        stats = job.stats()
+        assert stats["chunks"] == 3
+        assert stats["purged"] == stats["last_purged"] == 5
+        assert stats["runs"] == 1
+        assert stats["running"] == 0
+
+        assert await job.purge() == 0
+        assert job.stats()["purged"] == 5
+
+    async def test_trigger(self) -> None:
+        job = UserPurgeJob(retention_days=30, chunk_size=1, chunk_sleep=0.01, interval=0)
+
+        # 同一时间只运行一次清理
+        assert job.trigger()
+        assert not job.trigger()
+        assert job.is_running
+        while job.is_running:
+            await asyncio.sleep(0.01)
+        assert job.stats()["last_purged"] == 5
+
+        assert job.trigger()
+        await job.stop()
+        assert not job.is_running
@@ -1,7 +1,11 @@
+from unittest.mock import patch
+
 import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
 from fastapi.requests import Request
 from tortoise.contrib import test
 
+from src.app.auth import TokenService
 from src.app.constants.user_constants import USER_LOGIN_STATE
 from src.app.exceptions import BusinessException
 from src.app.schemas import SafetyUser
@@ -45,6 +49,12 @@ class TestUserService(test.TestCase):
         assert e.value.message == "请求参数错误"
         assert e.value.description == "用户账号过短"
 
+        # 账户至多256位
+        with pytest.raises(BusinessException) as e:
+            await UserService.user_register("t" * 257, "test1234", "test1234")
+        assert e.value.code == 40000
+        assert e.value.description == "用户账号过长"
+
         # 密码至少8位
         with pytest.raises(BusinessException) as e:
             # 密码过短
@@ -152,6 +162,32 @@ class TestUserService(test.TestCase):
         assert result.user_account == "validuser"
         assert request.session.get(USER_LOGIN_STATE) is not None
 
+    async def test_user_login_upgrades_legacy_password(self) -> None:
+        # 初始化数据: 旧版 MD5 密码
+        from src.app.core import settings
+        from src.app.models import Users
+        from src.app.utils import PasswordUtils
+
+        request = Request(scope={"type": "http", "session": {}})
+        legacy = PasswordUtils.hash_legacy_md5("test1234", settings.salt)
+        user = await Users.create(user_account="legacy", user_password=legacy)
+
+        # 密码错误时不升级
+        with pytest.raises(BusinessException):
+            await UserService.user_login("legacy", "test12345", request)
+        assert (await Users.get(id=user.id)).user_password == legacy
+
+        # 登录成功后升级为 scrypt
+        result = await UserService.user_login("legacy", "test1234", request)
+        assert result.id == user.id
+        upgraded = (await Users.get(id=user.id)).user_password
+        assert upgraded.startswith("scrypt$")
+
+        # 升级后仍可登录
+        result = await UserService.user_login("legacy", "test1234", request)
+        assert result.id == user.id
+        assert (await Users.get(id=user.id)).user_password == upgraded
+
     async def test_get_user_by_id(self) -> None:
         # 用户不存在
         with pytest.raises(BusinessException) as e:
@@ -172,6 +208,12 @@ class TestUserService(test.TestCase):
         assert isinstance(safety_user, SafetyUser)
         assert safety_user.user_account == "validuser"
 
+        # 删除后缓存失效
+        await UserService.delete_user_by_id(user_id)
+        with pytest.raises(BusinessException) as e:
+            await UserService.get_user_by_id(user_id)
+        assert e.value.description == "用户不存在"
+
     async def test_search_users_by_username(self) -> None:
         # 初始化数据
         from src.app.models import Users
@@ -188,16 +230,191 @@ class TestUserService(test.TestCase):
 
         # 无搜索条件, 获取所有用户信息
         result = await UserService.search_users_by_username("")
-        name_list = [user.username for user in result]
+        name_list = [user.username for user in result.items]
         assert "test1" in name_list
         assert "test2" in name_list
+        assert result.next_cursor is None
 
         # 存在搜索条件, 获取相关用户信息
         result = await UserService.search_users_by_username("test1")
-        name_list = [user.username for user in result]
+        name_list = [user.username for user in result.items]
         assert "test1" in name_list
         assert "test2" not in name_list
 
+    async def test_search_users_by_username_pagination(self) -> None:
+        # 初始化数据
+        from src.app.models import Users
+
+        await Users.bulk_create(
+            [Users(user_account=f"user{i}", username=f"name{i}", user_password="x") for i in range(5)]
+        )
+
+        # 按游标逐页获取, 不重复不遗漏
+        ids, cursor = [], None
+        while True:
+            result = await UserService.search_users_by_username("name", cursor, limit=2)
+            assert len(result.items) <= 2
+            ids.extend(user.id for user in result.items)
+            cursor = result.next_cursor
+            if cursor is None:
+                break
+        assert ids == sorted(ids)
+        assert len(ids) == 5
+
+        # 每页数量超过上限时按上限返回
+        from src.app.core import settings
+        result = await UserService.search_users_by_username("", limit=settings.search_max_limit + 1)
+        assert len(result.items) == 5
+
+        # 参数错误
+        with pytest.raises(BusinessException) as e:
+            await UserService.search_users_by_username("", limit=0)
+        assert e.value.description == "每页数量不为正整数"
+
+        with pytest.raises(BusinessException) as e:
+            await UserService.search_users_by_username("", cursor="!!!")
+        assert e.value.description == "游标无效"
+
+    async def test_fuzzy_search_users_by_username(self) -> None:
+        # 初始化数据
+        from src.app.models import Users
+        from src.app.services import get_username_index
+
+        get_username_index().reset()
+        for account, username in [("user1", "alice"), ("user2", "alicia"), ("user3", "bob"), ("user4", "malice")]:
+            await Users.create(user_account=account, username=username, user_password="x")
+
+        # 子串匹配优先, 按相似度排序
+        result = await UserService.fuzzy_search_users_by_username("alic")
+        assert [user.username for user in result.items] == ["alice", "alicia", "malice"]
+        assert result.next_cursor is None
+
+        # 拼写错误时模糊匹配
+        result = await UserService.fuzzy_search_users_by_username("alise")
+        assert [user.username for user in result.items] == ["alice", "alicia"]
+
+        # 注册与删除时增量维护索引
+        user_id = await UserService.user_register("user5", "test1234", "test1234")
+        await Users.filter(id=user_id).update(username="alicorn")
+        get_username_index().add(user_id, "alicorn")
+        result = await UserService.fuzzy_search_users_by_username("alic", limit=10)
+        assert "alicorn" in [user.username for user in result.items]
+
+        await UserService.delete_user_by_id(user_id)
+        result = await UserService.fuzzy_search_users_by_username("alic", limit=10)
+        assert "alicorn" not in [user.username for user in result.items]
+
+        # 参数错误
+        with pytest.raises(BusinessException) as e:
+            await UserService.fuzzy_search_users_by_username(" ")
+        assert e.value.description == "搜索用户名为空"
+
+    async def test_export_users(self) -> None:
+        # 初始化数据
+        import csv
+        import json
+
+        from src.app.models import Users
+
+        await Users.bulk_create([Users(user_account=f"user{i}", user_password="x") for i in range(5)])
+        await Users.filter(user_account="user2").update(is_deleted=True)
+
+        # 分批遍历, 不包含已删除用户
+        chunks = [chunk async for chunk in UserService.iter_users(chunk_size=2)]
+        assert [len(chunk) for chunk in chunks] == [2, 2]
+
+        # NDJSON 每行一个用户
+        lines = "".join([part async for part in UserService.export_users("ndjson", chunk_size=2)]).splitlines()
+        accounts = [json.loads(line)["user_account"] for line in lines]
+        assert accounts == ["user0", "user1", "user3", "user4"]
+        assert "user_password" not in json.loads(lines[0])
+
+        # CSV 首行为表头
+        content = "".join([part async for part in UserService.export_users("csv", chunk_size=3)])
+        rows = list(csv.reader(content.splitlines()))
+        assert rows[0] == list(SafetyUser.model_fields)
+        assert [row[rows[0].index("user_account")] for row in rows[1:]] == accounts
+
+    async def test_import_users(self) -> None:
+        # 初始化数据
+        import json
+
+        from src.app.models import Users
+
+        await UserService.user_register("existing", "test1234", "test1234")
+
+        async def stream(content: str, size: int = 7):
+            data = content.encode()
+            for i in range(0, len(data), size):
+                yield data[i:i + size]
+
+        rows = [
+            {"user_account": "alice", "user_password": "alice1234", "username": "Alice"},
+            {"user_account": "bob", "user_password": "bob12345"},
+            {"user_account": "carol", "user_password": "short"},
+            {"user_account": "existing", "user_password": "test1234"},
+            {"user_account": "alice", "user_password": "alice1234"},
+            {"user_account": "dave", "user_password": "dave1234"},
+        ]
+        content = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n\n"
+
+        # 出错的行不影响其他行, 分批写入
+        result = await UserService.import_users(stream(content), "ndjson", batch_size=1)
+        assert (result.total, result.created, result.failed) == (7, 2, 5)
+        assert [(error.line, error.description) for error in result.errors] == [
+            (2, "用户账号过短"),
+            (3, "用户密码过短"),
+            (4, "账号重复"),
+            (5, "账号重复"),
+            (7, "数据格式错误"),
+        ]
+        assert await Users.filter(user_account="alice", username="Alice").exists()
+
+        # 导入的账号可以正常登录
+        request = Request(scope={"type": "http", "session": {}, "headers": []})
+        safety_user = await UserService.user_login("dave", "dave1234", request)
+        assert safety_user.user_account == "dave"
+
+        # CSV 首行为表头, 兼容 BOM 与 CRLF
+        content = "\ufeffuser_account,user_password\r\nerin,erin1234\r\nfrank,frank1234,extra\r\n"
+        result = await UserService.import_users(stream(content), "csv")
+        assert (result.total, result.created, result.failed) == (2, 1, 1)
+        assert result.errors[0].line == 3
+        assert await Users.filter(user_account="erin").exists()
+
+    async def test_batch_delete_and_restore_users(self) -> None:
+        # 初始化数据
+        from src.app.models import Users
+        from src.app.schemas import UserBatchRequest
+
+        user_ids = [await UserService.user_register(f"user{i}", "test1234", "test1234") for i in range(4)]
+        await Users.filter(id=user_ids[3]).update(username="moderated")
+
+        # 条件不能为空
+        with pytest.raises(BusinessException) as e:
+            await UserService.delete_users(UserBatchRequest())
+        assert e.value.description == "批量条件为空"
+        with pytest.raises(BusinessException) as e:
+            await UserService.delete_users(UserBatchRequest(user_ids=[0]))
+        assert e.value.description == "用户ID不为正整数"
+
+        # 按ID列表与按条件删除
+        result = await UserService.delete_users(UserBatchRequest(user_ids=user_ids[:2] + [9999]))
+        assert result.user_ids == user_ids[:2]
+        assert not result.has_more
+        result = await UserService.delete_users(UserBatchRequest(username="moder"))
+        assert result.user_ids == [user_ids[3]]
+        assert await Users.all().count() == 1
+        with pytest.raises(BusinessException):
+            await UserService.get_user_by_id(user_ids[0])
+
+        # 账号已被重新注册的记录不恢复
+        await UserService.user_register("user0", "test1234", "test1234")
+        result = await UserService.restore_users(UserBatchRequest(user_ids=user_ids))
+        assert result.user_ids == [user_ids[1], user_ids[3]]
+        assert result.skipped == [user_ids[0]]
+        assert (await UserService.get_user_by_id(user_ids[1])).user_account == "user1"
+
     async def test_delete_user_by_id(self) -> None:
         # 初始化数据
         request = Request(scope={"type": "http", "session": {}})
@@ -245,15 +462,46 @@ class TestUserService(test.TestCase):
         assert request.session.get(USER_LOGIN_STATE) is not None
 
         # 成功注销
-        is_logout = UserService.user_logout(request)
+        is_logout = await UserService.user_logout(request)
         assert is_logout
         assert request.session.get(USER_LOGIN_STATE) is None
 
         # 用户未登录而注销失败
         with pytest.raises(BusinessException) as e:
-            UserService.user_logout(request)
+            await UserService.user_logout(request)
         assert e.value.code == 40000
         assert e.value.message == "请求参数错误"
         assert e.value.description == "用户未登录"
 
+    async def test_user_token_login(self) -> None:
+        # 初始化数据
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        token_service = TokenService(private_key, private_key.public_key(), 60, 3600, 16)
 
+        user_id = await UserService.user_register("test", "test1234", "test1234")
+        assert user_id > 0
+
+        with patch("src.app.services.user_service.get_optional_token_service", return_value=token_service):
+            # 账号密码错误
+            with pytest.raises(BusinessException) as e:
+                await UserService.user_token_login("test", "test12345")
+            assert e.value.description == "账号和密码不匹配"
+
+            # 正常登录
+            token_pair = await UserService.user_token_login("test", "test1234")
+            assert token_service.verify(token_pair.access_token).id == user_id
+
+            # 刷新令牌
+            new_token_pair = await UserService.refresh_token(token_pair.refresh_token)
+            assert token_service.verify(new_token_pair.access_token).id == user_id
+
+            # 访问令牌不能用于刷新
+            with pytest.raises(BusinessException) as e:
+                await UserService.refresh_token(token_pair.access_token)
+            assert e.value.description == "令牌类型不匹配"
+
+            # 用户被删除后不能刷新
+            await UserService.delete_user_by_id(user_id)
+            with pytest.raises(BusinessException) as e:
+                await UserService.refresh_token(token_pair.refresh_token)
+            assert e.value.description == "用户不存在"
@@ -0,0 +1,45 @@
+import pytest
+
+from src.app.utils import CountingBloomFilter
+
+
+def test_add_remove():
+    bloom_filter = CountingBloomFilter(1000, 0.01)
+    accounts = [f"user{i}" for i in range(1000)]
+    for account in accounts:
+        bloom_filter.add(account)
+
+    # 不存在漏判
+    assert all(account in bloom_filter for account in accounts)
+    assert len(bloom_filter) == 1000
+
+    # 误判率接近目标值
+    false_positives = sum(f"other{i}" in bloom_filter for i in range(10000))
+    assert false_positives < 300
+    assert bloom_filter.estimated_false_positive_rate() == pytest.approx(0.01, rel=0.2)
+
+    # 删除后其余元素仍然存在
+    for account in accounts[:500]:
+        bloom_filter.remove(account)
+    assert all(account in bloom_filter for account in accounts[500:])
+    assert sum(account in bloom_filter for account in accounts[:500]) < 50
+    assert len(bloom_filter) == 500
+
+    bloom_filter.clear()
+    assert "user999" not in bloom_filter
+    assert len(bloom_filter) == 0
+
+
+def test_snapshot():
+    bloom_filter = CountingBloomFilter(100, 0.01)
+    bloom_filter.add("alice")
+
+    restored = CountingBloomFilter.from_bytes(bloom_filter.to_bytes())
+    assert "alice" in restored
+    assert "bob" not in restored
+    assert len(restored) == 1
+
+    with pytest.raises(ValueError):
+        CountingBloomFilter.from_bytes(b"broken")
+    with pytest.raises(ValueError):
+        CountingBloomFilter.from_bytes(bloom_filter.to_bytes()[:-1])
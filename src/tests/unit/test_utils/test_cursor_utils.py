@@ -0,0 +1,14 @@
+import pytest
+
+from src.app.utils import CursorUtils
+
+
+def test_cursor_round_trip():
+    for last_id in (0, 1, 42, 2 ** 40):
+        assert CursorUtils.decode(CursorUtils.encode(last_id)) == last_id
+
+
+def test_decode_invalid_cursor():
+    for cursor in ("", "!!!", CursorUtils.encode(1)[:-1] + "*", "aWQ6LTE", "Zm9vOjE"):
+        with pytest.raises(ValueError):
+            CursorUtils.decode(cursor)
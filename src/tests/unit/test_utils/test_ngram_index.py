@@ -0,0 +1,46 @@
+from src.app.utils import NgramIndex
+
+
+def test_word_trigrams():
+    # 与 pg_trgm 的 show_trgm('cat') 一致
+    assert NgramIndex.word_trigrams("Cat") == {"  c", " ca", "cat", "at "}
+    assert NgramIndex.word_trigrams("") == frozenset()
+    assert NgramIndex.similarity(NgramIndex.word_trigrams("word"), NgramIndex.word_trigrams("word")) == 1.0
+
+
+def test_search():
+    index = NgramIndex()
+    for doc_id, text in enumerate(["alice", "Alicia", "bob", "Bobby Tables", "malice", "xx"]):
+        index.add(doc_id, text)
+
+    # 子串匹配优先, 按相似度排序
+    assert [doc_id for doc_id, _ in index.search("alic", 10)] == [0, 1, 4]
+    assert [doc_id for doc_id, _ in index.search("ALIC", 1)] == [0]
+
+    # 拼写错误时按相似度模糊匹配
+    assert [doc_id for doc_id, _ in index.search("alise", 10)] == [0, 1]
+
+    # 短查询退化为全量子串扫描
+    assert [doc_id for doc_id, _ in index.search("x", 10)] == [5]
+
+    assert index.search("nothing", 10) == []
+
+
+def test_incremental_maintenance():
+    index = NgramIndex()
+    index.add(1, "alice")
+    index.add(2, "alicia")
+    assert len(index) == 2
+
+    index.remove(1)
+    assert [doc_id for doc_id, _ in index.search("alic", 10)] == [2]
+
+    # 更新文本会替换旧文本
+    index.add(2, "bob")
+    assert index.search("alic", 10) == []
+    assert [doc_id for doc_id, _ in index.search("bob", 10)] == [2]
+
+    # 空文本视为移除
+    index.add(2, None)
+    assert len(index) == 0
+    index.remove(3)
@@ -0,0 +1,41 @@
+from src.app.utils import PasswordUtils
+
+# 测试使用较小的 scrypt 参数
+N, R, P = 2 ** 4, 8, 1
+
+
+def test_hash_scrypt():
+    stored = PasswordUtils.hash_scrypt("test1234", N, R, P)
+    assert stored.startswith(f"scrypt${N}${R}${P}$")
+    # 每次使用随机盐值
+    assert stored != PasswordUtils.hash_scrypt("test1234", N, R, P)
+
+    assert PasswordUtils.verify("test1234", stored, "salt")
+    assert not PasswordUtils.verify("test12345", stored, "salt")
+    assert not PasswordUtils.needs_rehash(stored, N, R, P)
+    assert PasswordUtils.needs_rehash(stored, N * 2, R, P)
+
+
+def test_legacy_md5():
+    stored = PasswordUtils.hash_legacy_md5("test1234", "salt")
+    assert PasswordUtils.is_legacy(stored)
+    assert PasswordUtils.verify("test1234", stored, "salt")
+    assert not PasswordUtils.verify("test1234", stored, "other salt")
+    assert PasswordUtils.needs_rehash(stored, N, R, P)
+
+
+def test_verify_malformed():
+    assert not PasswordUtils.verify("test1234", "", "salt")
+    assert not PasswordUtils.verify("test1234", "bcrypt$xx", "salt")
+    assert not PasswordUtils.verify("test1234", "scrypt$a$b$c$d$e", "salt")
+
+
+def test_verify_and_upgrade():
+    legacy = PasswordUtils.hash_legacy_md5("test1234", "salt")
+    assert PasswordUtils.verify_and_upgrade("wrong123", legacy, "salt", N, R, P) == (False, None)
+
+    is_valid, upgraded = PasswordUtils.verify_and_upgrade("test1234", legacy, "salt", N, R, P)
+    assert is_valid
+    assert PasswordUtils.verify("test1234", upgraded, "salt")
+
+    assert PasswordUtils.verify_and_upgrade("test1234", upgraded, "salt", N, R, P) == (True, None)
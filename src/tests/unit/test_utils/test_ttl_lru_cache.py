@@ -0,0 +1,30 @@
+import pytest
+
+from src.app.utils import TTLLRUCache
+
+
+def test_ttl_lru_cache():
+    cache: TTLLRUCache[int, str] = TTLLRUCache(max_size=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+
+    # 淘汰最久未使用的条目
+    cache.set(3, "c")
+    assert cache.get(2) is None
+    assert 1 in cache and 3 in cache
+    assert cache.evictions == 1
+
+    # 过期条目视为未命中
+    cache.set(4, "d", ttl=0)
+    assert cache.get(4) is None
+    assert cache.expirations == 1
+    assert cache.evictions == 2
+
+    assert cache.pop(3) == "c"
+    assert cache.pop(3) is None
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+    with pytest.raises(ValueError):
+        TTLLRUCache(max_size=0)